@@ -1,20 +1,53 @@
 import frappe
 from frappe import _
-from frappe.utils import now, now_datetime
+from frappe.utils import cint, getdate, now, now_datetime
+
+from .applicant_import import create_import, get_import_status, resume_import
+from .cache import bump_generation, get_cached_list, invalidate_doctype, is_not_modified
+from .duplicates import (
+    PROFILE_FIELDS,
+    enqueue_duplicate_scan,
+    find_duplicates,
+    get_cached_clusters,
+    index_applications as index_profiles,
+)
+from .export import export_response
+from .listing import (
+    JOB_APPLICATION_FIELD_MAP,
+    LIST_FIELDS,
+    format_job_application,
+    get_job_application_db_fields,
+    get_list_fields,
+    get_page,
+)
+from .permissions import get_job_application_filters, has_permission
+from .rollups import (
+    append_project_tasks,
+    apply_task_delta,
+    get_project_status,
+    get_task_rollups,
+    propagate_task_update,
+)
+from .search import INDEXED_FIELDS, SEARCH_FIELDS, index_documents, index_rows, search as search_index
+from .skills import index_applications, match_candidates as match_skills
 
 # ---- Task API Endpoints ----
 
 @frappe.whitelist()
-def get_tasks(status=None, project=None):
+def get_tasks(status=None, project=None, limit=None, cursor=None, fields=None):
     """
     Get tasks based on filters or all tasks if no filter provided
     
     Args:
         status (str, optional): Filter tasks by status
         project (str, optional): Filter tasks by project
+        limit (int, optional): Page size, enables cursor pagination
+        cursor (str, optional): `next_cursor` returned with the previous page
+        fields (str or list, optional): Fields to return, description and
+            details are only included when asked for
     """
     # Check if user has permission to view tasks
-    if not frappe.has_permission("Task", "read"):
+    if not has_permission("Task", "read"):
         frappe.throw(_("Not permitted to view tasks"), frappe.PermissionError)
     
     filters = {}
@@ -23,21 +56,35 @@ def get_tasks(status=None, project=None):
     if project:
         filters['project'] = project
 
-    tasks = frappe.get_all(
+    fields = get_list_fields('Task', fields)
+    params = {"filters": filters, "fields": fields, "limit": limit, "cursor": cursor}
+
+    tasks = get_cached_list(
         'Task',
-        filters=filters,
-        fields=['name', 'title', 'status', 'priority', 'start_date', 'end_date', 'description', 'details', 'project']
+        params,
+        lambda: get_page('Task', filters=filters, fields=fields, limit=limit, cursor=cursor)
     )
 
     return tasks
 
+@frappe.whitelist()
+def get_task(name):
+    """
+    Get a single task with all of its fields
+    """
+    # Check if user has permission to view tasks
+    if not has_permission("Task", "read", name):
+        frappe.throw(_("Not permitted to view this task"), frappe.PermissionError)
+
+    return frappe.get_doc("Task", name).as_dict()
+
 @frappe.whitelist()
 def create_task(title, description=None, status="Open", priority="Medium", start_date=None, end_date=None, details=None, project=None):
     """
     Create a new task
     """
     # Check if user has permission to create tasks
-    if not frappe.has_permission("Task", "create"):
+    if not has_permission("Task", "create"):
         frappe.throw(_("Not permitted to create tasks"), frappe.PermissionError)
     
     task = frappe.new_doc("Task")
@@ -52,7 +99,7 @@ def create_task(title, description=None, status="Open", priority="Medium", start
     if project:
         # Verify the project exists and user has permission to read it
         if frappe.db.exists("Project", project):
-            if frappe.has_permission("Project", "read", project):
+            if has_permission("Project", "read", project):
                 task.project = project
             else:
                 frappe.throw(_("Not permitted to access this project"), frappe.PermissionError)
@@ -74,13 +121,252 @@ def create_task(title, description=None, status="Open", priority="Medium", start
         }
     }
 
+# Rows written per INSERT statement by create_tasks
+TASK_INSERT_BATCH_SIZE = 1000
+
+@frappe.whitelist()
+def create_tasks(tasks):
+    """
+    Create many tasks in one call and one transaction
+
+    Args:
+        tasks (str or list): JSON list of task payloads with the same fields
+            as create_task
+
+    All payloads are validated before anything is written. Valid tasks are
+    inserted in batches and linked to their projects in bulk, invalid ones are
+    reported in the per-item results.
+    """
+    # Check if user has permission to create tasks
+    if not has_permission("Task", "create"):
+        frappe.throw(_("Not permitted to create tasks"), frappe.PermissionError)
+    
+    tasks = frappe.parse_json(tasks) if isinstance(tasks, str) else tasks
+    if not isinstance(tasks, list):
+        frappe.throw(_("Tasks must be a list"), frappe.ValidationError)
+    
+    meta = frappe.get_meta("Task")
+    status_options = meta.get_options("status").split("\n")
+    priority_options = meta.get_options("priority").split("\n")
+    
+    # Check each referenced project once, not once per row
+    project_errors = {}
+    projects = {task.get("project") for task in tasks if isinstance(task, dict) and task.get("project")}
+    if projects:
+        existing_projects = set(frappe.get_all("Project", filters={"name": ["in", list(projects)]}, pluck="name"))
+        for project in projects:
+            if project not in existing_projects:
+                project_errors[project] = _("Project does not exist")
+            elif not has_permission("Project", "read", project):
+                project_errors[project] = _("Not permitted to access this project")
+    
+    results = []
+    valid_tasks = []
+    for index, payload in enumerate(tasks):
+        error = _validate_task_payload(payload, status_options, priority_options, project_errors)
+        if error:
+            results.append({"index": index, "status": "error", "message": error})
+            continue
+        
+        task = {
+            "name": frappe.generate_hash(length=10),
+            "title": payload.get("title"),
+            "description": payload.get("description"),
+            "status": payload.get("status") or "Open",
+            "priority": payload.get("priority") or "Medium",
+            "start_date": getdate(payload["start_date"]) if payload.get("start_date") else None,
+            "end_date": getdate(payload["end_date"]) if payload.get("end_date") else None,
+            "details": payload.get("details"),
+            "project": payload.get("project")
+        }
+        valid_tasks.append(task)
+        results.append({"index": index, "status": "success", "name": task["name"]})
+    
+    timestamp = now()
+    user = frappe.session.user
+    fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus",
+              "title", "description", "status", "priority", "start_date", "end_date", "details", "project"]
+    for start in range(0, len(valid_tasks), TASK_INSERT_BATCH_SIZE):
+        batch = valid_tasks[start:start + TASK_INSERT_BATCH_SIZE]
+        frappe.db.bulk_insert(
+            "Task",
+            fields=fields,
+            values=[
+                (task["name"], timestamp, timestamp, user, user, 0,
+                 task["title"], task["description"], task["status"], task["priority"],
+                 task["start_date"], task["end_date"], task["details"], task["project"])
+                for task in batch
+            ]
+        )
+    
+    # Link the new tasks to their projects with one bulk insert per project,
+    # Task.on_update does not run for bulk inserted rows
+    tasks_by_project = {}
+    for task in valid_tasks:
+        if task["project"]:
+            tasks_by_project.setdefault(task["project"], []).append(task)
+    for project, project_tasks in tasks_by_project.items():
+        append_project_tasks(project, project_tasks)
+    
+    if valid_tasks:
+        # No doc_events for bulk inserted rows, index them here
+        index_rows("Task", valid_tasks)
+        bump_generation("Task")
+    
+    frappe.db.commit()
+    
+    return {
+        "status": "success" if len(valid_tasks) == len(tasks) else "partial",
+        "message": _("{0} of {1} tasks created").format(len(valid_tasks), len(tasks)),
+        "results": results
+    }
+
+def _validate_task_payload(payload, status_options, priority_options, project_errors):
+    """Return the validation error of a create_tasks payload, if any"""
+    if not isinstance(payload, dict):
+        return _("Task payload must be an object")
+    if not payload.get("title"):
+        return _("Title is required")
+    if payload.get("status") and payload["status"] not in status_options:
+        return _("Invalid status {0}").format(payload["status"])
+    if payload.get("priority") and payload["priority"] not in priority_options:
+        return _("Invalid priority {0}").format(payload["priority"])
+    
+    try:
+        start_date = getdate(payload["start_date"]) if payload.get("start_date") else None
+        end_date = getdate(payload["end_date"]) if payload.get("end_date") else None
+    except Exception:
+        return _("Invalid date")
+    if start_date and end_date and start_date > end_date:
+        return _("End Date cannot be before Start Date")
+    
+    if payload.get("project") in project_errors:
+        return project_errors[payload["project"]]
+
+# Fields update_tasks_bulk may change
+BULK_PATCH_FIELDS = ("status", "priority")
+
+@frappe.whitelist()
+def update_tasks_bulk(patch, names=None, filters=None):
+    """
+    Apply the same status/priority change to many tasks in one call
+
+    Args:
+        patch (str or dict): Fields to set, only status and priority
+        names (str or list, optional): Task names to update
+        filters (str or dict, optional): Filters selecting the tasks to update
+
+    Rows are updated with set-based statements and each affected project's
+    counters are moved once at the end instead of re-saving it per task.
+    """
+    # Check if user has permission to update tasks
+    if not has_permission("Task", "write"):
+        frappe.throw(_("Not permitted to update tasks"), frappe.PermissionError)
+    
+    patch = frappe.parse_json(patch) if isinstance(patch, str) else (patch or {})
+    names = frappe.parse_json(names) if isinstance(names, str) else names
+    filters = frappe.parse_json(filters) if isinstance(filters, str) else filters
+    
+    if not patch:
+        frappe.throw(_("Nothing to update"), frappe.ValidationError)
+    invalid = [field for field in patch if field not in BULK_PATCH_FIELDS]
+    if invalid:
+        frappe.throw(_("Fields cannot be updated in bulk: {0}").format(", ".join(invalid)), frappe.ValidationError)
+    if not names and not filters:
+        frappe.throw(_("Either names or filters is required"), frappe.ValidationError)
+    
+    # Validate the patch once for every task, like Task.validate would per row
+    meta = frappe.get_meta("Task")
+    for field, value in patch.items():
+        if value not in meta.get_options(field).split("\n"):
+            frappe.throw(_("Invalid {0} {1}").format(field, value), frappe.ValidationError)
+    
+    task_filters = filters or {}
+    if names:
+        # Dict values may be operator lists, e.g. {"status": ["in", [...]]}
+        task_filters = [["name", "in", names]] + (
+            [
+                [field, *value] if isinstance(value, (list, tuple)) else [field, "=", value]
+                for field, value in task_filters.items()
+            ]
+            if isinstance(task_filters, dict) else list(task_filters)
+        )
+    
+    tasks = frappe.get_list("Task", filters=task_filters, fields=["name", "status"], limit_page_length=0)
+    if not tasks:
+        return {
+            "status": "info",
+            "message": _("No tasks matched"),
+            "updated": 0
+        }
+    
+    task_names = [task.name for task in tasks]
+    old_status = {task.name: task.status for task in tasks}
+    
+    new_status = patch.get("status")
+    if new_status in ("Open", "In Progress"):
+        reopened = sum(1 for status in old_status.values() if status == "Completed")
+        if reopened:
+            frappe.msgprint(_("Note: You are reopening {0} completed tasks.").format(reopened))
+    
+    # Project Task rows of the affected tasks, to sync them and move the
+    # counters of each project once
+    task_links = frappe.db.sql(
+        """
+        SELECT parent, task FROM `tabProject Task`
+        WHERE parenttype = 'Project' AND task IN %(tasks)s
+        """,
+        {"tasks": task_names},
+        as_dict=True
+    )
+    
+    assignments = ", ".join(f"`{field}` = %({field})s" for field in patch)
+    values = dict(patch, modified=now(), modified_by=frappe.session.user, tasks=task_names)
+    frappe.db.sql(
+        f"""
+        UPDATE `tabTask`
+        SET {assignments}, modified = %(modified)s, modified_by = %(modified_by)s
+        WHERE name IN %(tasks)s
+        """,
+        values
+    )
+    frappe.db.sql(
+        f"""
+        UPDATE `tabProject Task`
+        SET {assignments}
+        WHERE parenttype = 'Project' AND task IN %(tasks)s
+        """,
+        values
+    )
+    
+    if new_status:
+        completed_deltas = {}
+        for link in task_links:
+            was_completed = old_status[link.task] == "Completed"
+            is_completed = new_status == "Completed"
+            if was_completed != is_completed:
+                completed_deltas[link.parent] = completed_deltas.get(link.parent, 0) + (1 if is_completed else -1)
+        for project, delta in completed_deltas.items():
+            apply_task_delta(project, completed_delta=delta)
+    
+    bump_generation("Task")
+    bump_generation("Project")
+    
+    frappe.db.commit()
+    
+    return {
+        "status": "success",
+        "message": _("{0} tasks updated").format(len(task_names)),
+        "updated": len(task_names)
+    }
+
 @frappe.whitelist()
 def update_task(name, title=None, description=None, status=None, priority=None, start_date=None, end_date=None, details=None, project=None):
     """
     Update an existing task
     """
     # Check if user has permission to update tasks
-    if not frappe.has_permission("Task", "write"):
+    if not has_permission("Task", "write"):
         frappe.throw(_("Not permitted to update tasks"), frappe.PermissionError)
     
     task = frappe.get_doc("Task", name)
@@ -107,7 +393,7 @@ def update_task(name, title=None, description=None, status=None, priority=None,
     if project:
         # Verify the project exists and user has permission
         if frappe.db.exists("Project", project):
-            if frappe.has_permission("Project", "read", project):
+            if has_permission("Project", "read", project):
                 task.project = project
             else:
                 frappe.throw(_("Not permitted to access this project"), frappe.PermissionError)
@@ -128,13 +414,141 @@ def update_task(name, title=None, description=None, status=None, priority=None,
         }
     }
 
+# Fields each PATCH endpoint may change
+PATCH_FIELDS = {
+    "Task": ["title", "description", "status", "priority", "start_date", "end_date", "details", "project"],
+    "Project": ["title", "description", "status", "priority", "start_date", "end_date"]
+}
+
+def _load_patch_target(doctype, name, patch, allowed_fields, modified=None):
+    """
+    Lock the current values of the patched fields and diff the patch against them
+
+    Only the columns named in the patch are read. When `modified` is given the
+    row must not have changed since the client read it.
+
+    Returns:
+        tuple: (current values, dict of fields whose value actually changes)
+    """
+    patch = frappe.parse_json(patch) if isinstance(patch, str) else (patch or {})
+    invalid = [field for field in patch if field not in allowed_fields]
+    if invalid:
+        frappe.throw(_("Fields cannot be updated: {0}").format(", ".join(invalid)), frappe.ValidationError)
+    
+    current = frappe.db.get_value(
+        doctype,
+        name,
+        list(dict.fromkeys(list(patch) + ["modified"])),
+        as_dict=True,
+        for_update=True
+    )
+    if not current:
+        frappe.throw(_("{0} {1} does not exist").format(doctype, name), frappe.DoesNotExistError)
+    
+    # Optimistic concurrency: refuse to overwrite a newer version
+    if modified and str(current.modified) != str(modified):
+        frappe.throw(
+            _("{0} {1} has been modified after you opened it, please reload").format(doctype, name),
+            frappe.TimestampMismatchError
+        )
+    
+    meta = frappe.get_meta(doctype)
+    changed = {}
+    for field, value in patch.items():
+        df = meta.get_field(field)
+        if df and df.fieldtype == "Date" and value:
+            value = getdate(value)
+        if value != current.get(field):
+            changed[field] = value
+    
+    return current, changed
+
+def _validate_select_values(doctype, values):
+    """Check patched Select fields against their options"""
+    meta = frappe.get_meta(doctype)
+    for field, value in values.items():
+        df = meta.get_field(field)
+        if df and df.fieldtype == "Select" and value and value not in (df.options or "").split("\n"):
+            frappe.throw(_("Invalid {0} {1}").format(df.label or field, value), frappe.ValidationError)
+
+@frappe.whitelist()
+def patch_task(name, patch, modified=None):
+    """
+    Update only the given fields of a task
+
+    Args:
+        name (str): Task name
+        patch (str or dict): Fields to change
+        modified (str, optional): `modified` of the version the client edited,
+            the update is refused if the task changed since
+
+    Only the patched columns are read and written, and only the validations
+    those fields need are run.
+    """
+    # Check if user has permission to update this task
+    if not has_permission("Task", "write", name):
+        frappe.throw(_("Not permitted to modify this task"), frappe.PermissionError)
+    
+    current, changed = _load_patch_target("Task", name, patch, PATCH_FIELDS["Task"], modified)
+    if not changed:
+        return {
+            "status": "info",
+            "message": _("Nothing to update"),
+            "task": {"name": name, "modified": current.modified}
+        }
+    
+    _validate_select_values("Task", changed)
+    
+    # Task.validate_dates, only when a date changes
+    if "start_date" in changed or "end_date" in changed:
+        dates = frappe.db.get_value("Task", name, ["start_date", "end_date"], as_dict=True)
+        dates.update({field: changed[field] for field in ("start_date", "end_date") if field in changed})
+        if dates.start_date and dates.end_date and dates.start_date > dates.end_date:
+            frappe.throw(_("End Date cannot be before Start Date"))
+    
+    # Task.validate_status, only when the status changes
+    if changed.get("status") in ("Open", "In Progress") and current.status == "Completed":
+        frappe.msgprint(_("Note: You are reopening a completed task."))
+    
+    if changed.get("project"):
+        if not frappe.db.exists("Project", changed["project"]):
+            frappe.throw(_("Project does not exist"), frappe.DoesNotExistError)
+        if not has_permission("Project", "read", changed["project"]):
+            frappe.throw(_("Not permitted to access this project"), frappe.PermissionError)
+    
+    frappe.db.set_value("Task", name, changed)
+    
+    # Same propagation as Task.on_update, from the narrow rows
+    fields = ["name", "project", "title", "status", "priority", "start_date", "end_date"]
+    task = frappe.db.get_value("Task", name, fields + ["modified"], as_dict=True)
+    before = frappe._dict(task)
+    before.update({field: current[field] for field in changed})
+    propagate_task_update(task, before)
+    if any(field in changed for field in INDEXED_FIELDS["Task"]):
+        index_documents("Task", [name])
+    invalidate_doctype("Task")
+    
+    frappe.db.commit()
+    
+    return {
+        "status": "success",
+        "message": _("Task updated successfully"),
+        "task": {
+            "name": task.name,
+            "title": task.title,
+            "status": task.status,
+            "project": task.project,
+            "modified": task.modified
+        }
+    }
+
 @frappe.whitelist()
 def delete_task(name):
     """
     Delete a task
     """
     # Check if user has permission to delete tasks
-    if not frappe.has_permission("Task", "delete"):
+    if not has_permission("Task", "delete"):
         frappe.throw(_("Not permitted to delete tasks"), frappe.PermissionError)
     
     task = frappe.get_doc("Task", name)
@@ -151,48 +565,88 @@ def delete_task(name):
         "message": _("Task deleted successfully")
     }
 
+@frappe.whitelist()
+def search(query, doctype=None, status=None, project=None, limit=20):
+    """
+    Full-text search over task and project titles and descriptions
+
+    Every word must match, as a prefix, and results are ranked with title
+    matches first. Without a doctype tasks and projects are both searched.
+
+    Args:
+        query (str): Words to search for
+        doctype (str, optional): Task or Project
+        status (str, optional): Filter by status
+        project (str, optional): Filter tasks by project
+        limit (int, optional): Maximum number of results per doctype
+    """
+    doctypes = [doctype] if doctype else list(SEARCH_FIELDS)
+    invalid = [value for value in doctypes if value not in SEARCH_FIELDS]
+    if invalid:
+        frappe.throw(_("Cannot search {0}").format(", ".join(invalid)), frappe.ValidationError)
+    
+    results = []
+    for search_doctype in doctypes:
+        if not has_permission(search_doctype, "read"):
+            continue
+        results.extend(search_index(query, search_doctype, status=status, project=project, limit=limit))
+    
+    results.sort(key=lambda result: result.score, reverse=True)
+    return results
+
 # ---- Project API Endpoints ----
 
 @frappe.whitelist()
-def get_projects(status=None):
+def get_projects(status=None, limit=None, cursor=None, fields=None):
     """
     Get projects based on status filter or all projects if no filter provided
+
+    Args:
+        status (str, optional): Filter projects by status
+        limit (int, optional): Page size, enables cursor pagination
+        cursor (str, optional): `next_cursor` returned with the previous page
+        fields (str or list, optional): Fields to return, description is only
+            included when asked for
     """
     # Check if user has permission to view projects
-    if not frappe.has_permission("Project", "read"):
+    if not has_permission("Project", "read"):
         frappe.throw(_("Not permitted to view projects"), frappe.PermissionError)
     
     filters = {}
     if status:
         filters['status'] = status
 
-    projects = frappe.get_all(
+    # Task count and progress are stored on the project and kept up to date by
+    # Project.validate and the Task counter deltas
+    fields = get_list_fields('Project', fields)
+    params = {"filters": filters, "fields": fields, "limit": limit, "cursor": cursor}
+
+    projects = get_cached_list(
         'Project',
-        filters=filters,
-        fields=['name', 'title', 'status', 'start_date', 'end_date', 'description']
+        params,
+        lambda: get_page('Project', filters=filters, fields=fields, limit=limit, cursor=cursor)
     )
 
-    # Add task count to projects
-    for project in projects:
-        project_doc = frappe.get_doc("Project", project.name)
-        project['task_count'] = len(project_doc.tasks) if project_doc.tasks else 0
-        
-        # Calculate progress percentage
-        if project_doc.tasks:
-            completed = sum(1 for task in project_doc.tasks if frappe.get_value("Task", task.task, "status") == "Completed")
-            project['progress'] = (completed / len(project_doc.tasks)) * 100
-        else:
-            project['progress'] = 0
-
     return projects
 
+@frappe.whitelist()
+def get_project(name):
+    """
+    Get a single project with all of its fields and task rows
+    """
+    # Check if user has permission to view projects
+    if not has_permission("Project", "read", name):
+        frappe.throw(_("Not permitted to view this project"), frappe.PermissionError)
+
+    return frappe.get_doc("Project", name).as_dict()
+
 @frappe.whitelist()
 def create_project(title, description=None, status="Planning", start_date=None, end_date=None, tasks=None):
     """
     Create a new project
     """
     # Check if user has permission to create projects
-    if not frappe.has_permission("Project", "create"):
+    if not has_permission("Project", "create"):
         frappe.throw(_("Not permitted to create projects"), frappe.PermissionError)
     
     project = frappe.new_doc("Project")
@@ -235,7 +689,7 @@ def update_project(name, title=None, description=None, status=None, start_date=N
     Update an existing project
     """
     # Check if user has permission to update projects
-    if not frappe.has_permission("Project", "write"):
+    if not has_permission("Project", "write"):
         frappe.throw(_("Not permitted to update projects"), frappe.PermissionError)
     
     project = frappe.get_doc("Project", name)
@@ -268,13 +722,61 @@ def update_project(name, title=None, description=None, status=None, start_date=N
         }
     }
 
+@frappe.whitelist()
+def patch_project(name, patch, modified=None):
+    """
+    Update only the given fields of a project
+
+    Args:
+        name (str): Project name
+        patch (str or dict): Fields to change
+        modified (str, optional): `modified` of the version the client edited,
+            the update is refused if the project changed since
+    """
+    # Check if user has permission to update this project
+    if not has_permission("Project", "write", name):
+        frappe.throw(_("Not permitted to modify this project"), frappe.PermissionError)
+    
+    current, changed = _load_patch_target("Project", name, patch, PATCH_FIELDS["Project"], modified)
+    if "status" in changed:
+        # The tasks decide the status as in Project.validate, a patch cannot override them
+        rollup = get_task_rollups([name]).get(name)
+        if rollup:
+            changed["status"] = get_project_status(
+                changed["status"], rollup["task_count"], rollup["completed_count"]
+            )
+            if changed["status"] == current.status:
+                del changed["status"]
+    if not changed:
+        return {
+            "status": "info",
+            "message": _("Nothing to update"),
+            "project": {"name": name, "modified": current.modified}
+        }
+    
+    _validate_select_values("Project", changed)
+    
+    frappe.db.set_value("Project", name, changed)
+    if any(field in changed for field in INDEXED_FIELDS["Project"]):
+        index_documents("Project", [name])
+    invalidate_doctype("Project")
+    
+    frappe.db.commit()
+    
+    project = frappe.db.get_value("Project", name, ["name", "title", "status", "modified"], as_dict=True)
+    return {
+        "status": "success",
+        "message": _("Project updated successfully"),
+        "project": project
+    }
+
 @frappe.whitelist()
 def delete_project(name):
     """
     Delete a project
     """
     # Check if user has permission to delete projects
-    if not frappe.has_permission("Project", "delete"):
+    if not has_permission("Project", "delete"):
         frappe.throw(_("Not permitted to delete projects"), frappe.PermissionError)
     
     project = frappe.get_doc("Project", name)
@@ -297,10 +799,10 @@ def add_task_to_project(project, task):
     Add a task to a project
     """
     # Check permissions
-    if not frappe.has_permission("Project", "write"):
+    if not has_permission("Project", "write"):
         frappe.throw(_("Not permitted to modify projects"), frappe.PermissionError)
     
-    if not frappe.has_permission("Task", "read"):
+    if not has_permission("Task", "read"):
         frappe.throw(_("Not permitted to read tasks"), frappe.PermissionError)
     
     # Get the project and task
@@ -349,7 +851,7 @@ def remove_task_from_project(project, task):
     Remove a task from a project
     """
     # Check permissions
-    if not frappe.has_permission("Project", "write"):
+    if not has_permission("Project", "write"):
         frappe.throw(_("Not permitted to modify projects"), frappe.PermissionError)
     
     # Get the project and task
@@ -378,6 +880,144 @@ def remove_task_from_project(project, task):
         "message": _("Task is not part of the project")
     }
 
+@frappe.whitelist()
+def add_tasks_to_project(project, tasks):
+    """
+    Add many tasks to a project with a single project save
+
+    Args:
+        project (str): Project name
+        tasks (str or list): JSON list of task names
+    """
+    # Check permissions
+    if not has_permission("Project", "write"):
+        frappe.throw(_("Not permitted to modify projects"), frappe.PermissionError)
+    
+    if not has_permission("Task", "read"):
+        frappe.throw(_("Not permitted to read tasks"), frappe.PermissionError)
+    
+    tasks = frappe.parse_json(tasks) if isinstance(tasks, str) else (tasks or [])
+    project_doc = frappe.get_doc("Project", project)
+    
+    # Deduplicate against the request itself and the existing rows
+    existing = {task_link.task for task_link in project_doc.tasks}
+    requested = list(dict.fromkeys(tasks))
+    new_tasks = [task for task in requested if task not in existing]
+    
+    added = _append_task_rows(project_doc, new_tasks)
+    missing = [task for task in new_tasks if task not in added]
+    
+    if added:
+        project_doc.save()
+        _set_task_project(added, project)
+        frappe.db.commit()
+    
+    return {
+        "status": "success" if added else "info",
+        "message": _("{0} tasks added to project").format(len(added)),
+        "added": added,
+        "already_linked": [task for task in requested if task in existing],
+        "missing": missing
+    }
+
+@frappe.whitelist()
+def set_project_tasks(project, tasks):
+    """
+    Replace the tasks of a project with a single project save
+
+    Args:
+        project (str): Project name
+        tasks (str or list): JSON list of task names the project should contain
+    """
+    # Check permissions
+    if not has_permission("Project", "write"):
+        frappe.throw(_("Not permitted to modify projects"), frappe.PermissionError)
+    
+    if not has_permission("Task", "read"):
+        frappe.throw(_("Not permitted to read tasks"), frappe.PermissionError)
+    
+    tasks = frappe.parse_json(tasks) if isinstance(tasks, str) else (tasks or [])
+    project_doc = frappe.get_doc("Project", project)
+    
+    requested = list(dict.fromkeys(tasks))
+    requested_set = set(requested)
+    existing = {task_link.task for task_link in project_doc.tasks}
+    
+    # Keep the rows that stay, append the new ones
+    removed = [task for task in existing if task not in requested_set]
+    project_doc.set("tasks", [task_link for task_link in project_doc.tasks if task_link.task in requested_set])
+    new_tasks = [task for task in requested if task not in existing]
+    added = _append_task_rows(project_doc, new_tasks)
+    missing = [task for task in new_tasks if task not in added]
+    
+    if added or removed:
+        project_doc.save()
+        _set_task_project(added, project)
+        if removed:
+            frappe.db.sql(
+                """
+                UPDATE `tabTask`
+                SET project = NULL, modified = %(modified)s, modified_by = %(user)s
+                WHERE name IN %(tasks)s AND project = %(project)s
+                """,
+                {"tasks": removed, "project": project, "modified": now(), "user": frappe.session.user}
+            )
+            bump_generation("Task")
+        frappe.db.commit()
+    
+    return {
+        "status": "success",
+        "message": _("Project tasks updated"),
+        "added": added,
+        "removed": removed,
+        "missing": missing
+    }
+
+def _append_task_rows(project_doc, task_names):
+    """Append Project Task rows for existing tasks, return the names appended"""
+    if not task_names:
+        return []
+    
+    tasks = frappe.get_all(
+        "Task",
+        filters={"name": ["in", task_names]},
+        fields=["name", "title", "status", "priority", "start_date", "end_date"]
+    )
+    tasks_by_name = {task.name: task for task in tasks}
+    
+    added = []
+    for task_name in task_names:
+        task = tasks_by_name.get(task_name)
+        if not task:
+            continue
+        project_doc.append("tasks", {
+            "task": task.name,
+            "task_title": task.title,
+            "status": task.status,
+            "priority": task.priority,
+            "start_date": task.start_date,
+            "end_date": task.end_date
+        })
+        added.append(task.name)
+    
+    return added
+
+def _set_task_project(task_names, project):
+    """Point the project link of many tasks at a project with one UPDATE"""
+    if not task_names:
+        return
+    
+    # Direct update so Task.on_update does not save the project once per task
+    frappe.db.sql(
+        """
+        UPDATE `tabTask`
+        SET project = %(project)s, modified = %(modified)s, modified_by = %(user)s
+        WHERE name IN %(tasks)s
+        """,
+        {"tasks": task_names, "project": project, "modified": now(), "user": frappe.session.user}
+    )
+    bump_generation("Task")
+
 # ---- Direct API Endpoints ----
 
 @frappe.whitelist(allow_guest=True)
@@ -526,50 +1166,98 @@ def api_project_tasks(project_id=None):
         return remove_task_from_project(project=project_id, task=task_id)
 
 @frappe.whitelist()
-def get_job_applications(status=None):
+def get_job_applications(status=None, limit=None, cursor=None, fields=None):
     """
     Get list of job applications with optional status filter
+
+    Args:
+        status (str, optional): Filter applications by status
+        limit (int, optional): Page size, enables cursor pagination
+        cursor (str, optional): `next_cursor` returned with the previous page
+        fields (str or list, optional): Fields to return, experience is only
+            included when asked for
     """
     try:
-        filters = {}
+        # Nothing changed since the client's copy, answer 304 without rows
+        if is_not_modified("Job Application"):
+            return
+        
+        fields = get_list_fields("Job Application", fields)
+        filters = get_job_application_filters()
         if status:
             filters['status'] = status
             
-        job_applications = frappe.get_all(
-            "Job Application",
-            filters=filters,
-            fields=["name", "job_title", "applicant_name", "email_id", "status", 
-                   "department", "application_date", "resume_attachment", "skills"]
-        )
+        def fetch():
+            # Job Applications are read without role permissions, as before;
+            # the row restriction is part of the filters
+            job_applications = get_page(
+                "Job Application",
+                filters=filters,
+                fields=get_job_application_db_fields(fields),
+                limit=limit,
+                cursor=cursor,
+                ignore_permissions=True
+            )
+            
+            # Format data to match frontend expectations
+            formatted_applications = []
+            for app in job_applications:
+                formatted_applications.append(format_job_application(app, fields))
+            
+            return formatted_applications
         
-        # Format data to match frontend expectations
-        formatted_applications = []
-        for app in job_applications:
-            formatted_applications.append({
-                "name": app.name,
-                "title": app.job_title,
-                "applicant_name": app.applicant_name,
-                "email": app.email_id,
-                "status": app.status,
-                "position": app.job_title,
-                "department": app.department,
-                "apply_date": app.application_date,
-                "resume_link": app.resume_attachment,
-                "skills": app.skills or ""
-            })
-        
-        return formatted_applications
+        params = {"filters": filters, "fields": fields, "limit": limit, "cursor": cursor}
+        return get_cached_list("Job Application", params, fetch)
     except Exception as e:
         frappe.log_error(title="Error in get_job_applications", message=str(e))
         return {"error": str(e)}
 
+def _check_job_application_access(name):
+    """Apply the Job Application row restriction to a single application"""
+    restriction = get_job_application_filters()
+    if restriction and not frappe.db.exists("Job Application", dict(restriction, name=name)):
+        frappe.throw(_("Not permitted to access this job application"), frappe.PermissionError)
+
+@frappe.whitelist()
+def get_job_application(name):
+    """
+    Get a single job application with all of its listed fields
+    """
+    try:
+        _check_job_application_access(name)
+        
+        fields = list(LIST_FIELDS["Job Application"]["allowed"])
+        app = frappe.db.get_value(
+            "Job Application",
+            name,
+            get_job_application_db_fields(fields),
+            as_dict=True
+        )
+        if not app:
+            frappe.throw(_("Job Application {0} does not exist").format(name), frappe.DoesNotExistError)
+
+        return format_job_application(app, fields)
+    except Exception as e:
+        frappe.log_error(title="Error in get_job_application", message=str(e))
+        return {"error": str(e)}
+
 @frappe.whitelist()
 def create_job_application(title, applicant_name, email, status, position, department, 
-                       apply_date=None, resume_link=None, experience=None, skills=None):
+                       apply_date=None, resume_link=None, experience=None, skills=None, allow_duplicate=False):
     """
     Create a new job application
+
+    An application with the same normalized email as an existing one is
+    refused with a DuplicateEntryError by duplicates.check_duplicate_email
+    unless allow_duplicate is set. Near duplicate profiles (similar name and
+    skills) are created and returned as possible_duplicates, limited to the
+    applications the user can read.
     """
     try:
+        duplicates = find_duplicates(
+            applicant_name=applicant_name, email=email, skills=skills, filters=get_job_application_filters()
+        )
+        
         doc = frappe.new_doc("Job Application")
         doc.job_title = title
         doc.applicant_name = applicant_name
@@ -584,7 +1272,8 @@ def create_job_application(title, applicant_name, email, status, position, depar
             doc.custom_experience = experience
         if skills:
             doc.skills = skills
-            
+        
+        doc.flags.allow_duplicate = cint(allow_duplicate)
         doc.insert(ignore_permissions=True)
         
         return {
@@ -595,8 +1284,12 @@ def create_job_application(title, applicant_name, email, status, position, depar
                 "title": doc.job_title,
                 "applicant_name": doc.applicant_name,
                 "status": doc.status
-            }
+            },
+            "possible_duplicates": duplicates["exact"] + [match["name"] for match in duplicates["similar"]]
         }
+    except frappe.DuplicateEntryError:
+        # Answered with HTTP 409, the form offers to insert it anyway
+        raise
     except Exception as e:
         frappe.log_error(title="Error in create_job_application", message=str(e))
         return {"error": str(e)}
@@ -608,6 +1301,8 @@ def update_job_application(name, title, applicant_name, email, status, position=
     Update an existing job application
     """
     try:
+        _check_job_application_access(name)
+        
         doc = frappe.get_doc("Job Application", name)
         doc.job_title = title
         doc.applicant_name = applicant_name
@@ -641,12 +1336,75 @@ def update_job_application(name, title, applicant_name, email, status, position=
         frappe.log_error(title="Error in update_job_application", message=str(e))
         return {"error": str(e)}
 
+@frappe.whitelist()
+def patch_job_application(name, patch, modified=None):
+    """
+    Update only the given fields of a job application
+
+    Args:
+        name (str): Job Application name
+        patch (str or dict): Fields to change, under the names used by the
+            list endpoint (title, email, apply_date, ...)
+        modified (str, optional): `modified` of the version the client edited,
+            the update is refused if the application changed since
+    """
+    try:
+        _check_job_application_access(name)
+        
+        patch = frappe.parse_json(patch) if isinstance(patch, str) else (patch or {})
+        invalid = [field for field in patch if field not in JOB_APPLICATION_FIELD_MAP or field == "name"]
+        if invalid:
+            frappe.throw(_("Fields cannot be updated: {0}").format(", ".join(invalid)), frappe.ValidationError)
+        
+        # position is an alias of title, both are stored in job_title
+        db_patch = {JOB_APPLICATION_FIELD_MAP[field]: value for field, value in patch.items()}
+        current, changed = _load_patch_target(
+            "Job Application", name, db_patch, list(db_patch), modified
+        )
+        if not changed:
+            return {
+                "status": "info",
+                "message": "Nothing to update",
+                "application": {"name": name, "modified": current.modified}
+            }
+        
+        _validate_select_values("Job Application", changed)
+        
+        frappe.db.set_value("Job Application", name, changed)
+        if "skills" in changed:
+            index_applications([(name, changed["skills"])])
+        if any(field in changed for field in ("applicant_name", "email_id", "skills")):
+            index_profiles([frappe.db.get_value("Job Application", name, PROFILE_FIELDS, as_dict=True)])
+        invalidate_doctype("Job Application")
+        
+        frappe.db.commit()
+        
+        doc = frappe.db.get_value(
+            "Job Application", name, ["name", "job_title", "applicant_name", "status", "modified"], as_dict=True
+        )
+        return {
+            "status": "success",
+            "message": "Job application updated successfully",
+            "application": {
+                "name": doc.name,
+                "title": doc.job_title,
+                "applicant_name": doc.applicant_name,
+                "status": doc.status,
+                "modified": doc.modified
+            }
+        }
+    except Exception as e:
+        frappe.log_error(title="Error in patch_job_application", message=str(e))
+        return {"error": str(e)}
+
 @frappe.whitelist()
 def delete_job_application(name):
     """
     Delete a job application
     """
     try:
+        _check_job_application_access(name)
+        
         frappe.delete_doc("Job Application", name, ignore_permissions=True)
         
         return {
@@ -656,4 +1414,175 @@ def delete_job_application(name):
     except Exception as e:
         frappe.log_error(title="Error in delete_job_application", message=str(e))
         return {"error": str(e)}
- 
\ No newline at end of file
+ 
+@frappe.whitelist()
+def match_candidates(skills, department=None, status=None, require_all=False, limit=20, fields=None):
+    """
+    Find job applications by skills, ranked by weighted overlap
+
+    Skills are normalized like the stored ones (case, separators, synonyms)
+    and rare skills weigh more than common ones. Only the skill index entries
+    of the requested skills are read.
+
+    Args:
+        skills (str or list): Comma separated or list of skills
+        department (str, optional): Filter by department
+        status (str, optional): Filter by status
+        require_all (bool, optional): Only applications having every skill
+        limit (int, optional): Maximum number of results
+        fields (str or list, optional): Fields to return, as in get_job_applications
+    """
+    try:
+        skills = frappe.parse_json(skills) if isinstance(skills, str) and skills.strip().startswith("[") else skills
+        fields = get_list_fields("Job Application", fields)
+        filters = get_job_application_filters()
+        if department:
+            filters["department"] = department
+        if status:
+            filters["status"] = status
+        
+        ranked = match_skills(skills, filters=filters, require_all=cint(require_all), limit=limit)
+        if not ranked:
+            return []
+        
+        # One query for the details of every ranked application
+        rows = frappe.get_all(
+            "Job Application",
+            filters={"name": ["in", [match.name for match in ranked]]},
+            fields=list(dict.fromkeys(["name"] + get_job_application_db_fields(fields)))
+        )
+        rows_by_name = {row.name: row for row in rows}
+        
+        candidates = []
+        for match in ranked:
+            row = rows_by_name.get(match.name)
+            if not row:
+                continue
+            candidate = format_job_application(row, fields)
+            candidate["score"] = match.score
+            candidate["matched_skills"] = match.matched_skills
+            candidates.append(candidate)
+        
+        return candidates
+    except Exception as e:
+        frappe.log_error(title="Error in match_candidates", message=str(e))
+        return {"error": str(e)}
+
+@frappe.whitelist()
+def import_job_applications(file_url=None, file_format=None):
+    """
+    Import job applications from a CSV or NDJSON file in the background
+
+    The file is either uploaded as the `file` part of a multipart request or
+    an existing File given by `file_url`. Headers use the field names of
+    get_job_applications or the Job Application columns. Rows are validated,
+    inserted and committed in chunks by a background job.
+
+    Returns:
+        dict: the name of the import, to follow with get_job_application_import_status
+    """
+    frappe.only_for(("System Manager", "HR Manager"))
+    
+    import_name = create_import(file_url=file_url, file_format=file_format)
+    frappe.db.commit()
+    
+    return {
+        "status": "success",
+        "message": _("Import queued"),
+        "import": import_name
+    }
+
+@frappe.whitelist()
+def get_job_application_import_status(name, errors_start=0, errors_limit=100):
+    """
+    Get progress, counters and a page of row errors of a job application import
+    """
+    frappe.only_for(("System Manager", "HR Manager"))
+    
+    return get_import_status(name, errors_start=errors_start, errors_limit=errors_limit)
+
+@frappe.whitelist()
+def resume_job_application_import(name):
+    """
+    Queue a failed or interrupted import again, it continues after its last
+    committed chunk
+    """
+    frappe.only_for(("System Manager", "HR Manager"))
+    
+    resume_import(name)
+    frappe.db.commit()
+    
+    return {
+        "status": "success",
+        "message": _("Import resumed"),
+        "import": name
+    }
+
+@frappe.whitelist()
+def find_duplicate_applicants(applicant_name=None, email=None, skills=None, exclude=None):
+    """
+    Find the job applications an applicant would duplicate
+
+    Args:
+        applicant_name (str, optional): Name of the applicant
+        email (str, optional): Email, compared after normalization
+        skills (str, optional): Skills, compared like the skill index
+        exclude (str, optional): Job Application to leave out, e.g. the one
+            being edited
+
+    Returns:
+        dict: "exact" names sharing the email, "similar" names and
+            similarities of near duplicate profiles
+    """
+    frappe.only_for(("System Manager", "HR Manager"))
+    
+    return find_duplicates(applicant_name=applicant_name, email=email, skills=skills, exclude=exclude)
+
+@frappe.whitelist()
+def scan_duplicate_applicants():
+    """
+    Queue the batch job clustering every duplicate job application, read
+    the clusters with get_duplicate_applicant_clusters
+    """
+    frappe.only_for(("System Manager", "HR Manager"))
+    
+    enqueue_duplicate_scan()
+    return {
+        "status": "success",
+        "message": _("Duplicate scan queued")
+    }
+
+@frappe.whitelist()
+def get_duplicate_applicant_clusters():
+    """
+    Get the clusters of duplicate job applications found by the last scan
+    """
+    frappe.only_for(("System Manager", "HR Manager"))
+    
+    return get_cached_clusters() or {"generated": None, "clusters": []}
+
+# ---- Export Endpoints ----
+
+@frappe.whitelist()
+def export_records(doctype, format="ndjson", fields=None, status=None, project=None):
+    """
+    Stream every Task, Project or Job Application as NDJSON or CSV
+
+    Rows are read from a server-side cursor and sent in chunks, so memory
+    stays flat whatever the row count. Fields and Job Application names
+    are the same as in the list endpoints.
+
+    Args:
+        doctype (str): Task, Project or Job Application
+        format (str, optional): ndjson (default) or csv
+        fields (str or list, optional): Fields to export
+        status (str, optional): Filter by status
+        project (str, optional): Filter tasks by project
+    """
+    filters = {}
+    if status:
+        filters["status"] = status
+    if project and doctype == "Task":
+        filters["project"] = project
+    
+    return export_response(doctype, export_format=format, fields=fields, filters=filters)
@@ -0,0 +1,475 @@
+import csv
+import json
+import os
+import shutil
+import traceback
+
+import frappe
+from frappe import _
+from frappe.model import default_fields
+from frappe.model.naming import parse_naming_series, set_new_name
+from frappe.utils import cint, getdate, now, nowdate, validate_email_address
+from frappe.utils.background_jobs import is_job_enqueued
+from werkzeug.utils import secure_filename
+
+from .cache import invalidate_doctype
+from .duplicates import find_email_duplicates, hash_email, index_applications as index_profiles
+from .listing import JOB_APPLICATION_FIELD_MAP
+from .skills import index_applications
+
+IMPORT_DOCTYPE = "Job Application Import"
+
+# Rows validated, inserted and committed together. A crashed import resumes
+# after the last committed chunk.
+IMPORT_CHUNK_SIZE = 1000
+
+IMPORT_QUEUE = "long"
+IMPORT_TIMEOUT = 4 * 60 * 60
+
+# Row errors kept on the import document, the count covers all of them
+MAX_STORED_ERRORS = 1000
+
+# Uploads are copied to disk in blocks of this size
+UPLOAD_BLOCK_BYTES = 1024 * 1024
+
+REQUIRED_COLUMNS = ("applicant_name", "email_id")
+
+# Set by the import itself, so files cannot supply them. Exported files carry
+# name, which would otherwise be listed twice in the INSERT.
+IGNORED_COLUMNS = set(default_fields) | {"naming_series"}
+
+
+def get_file_path(file_url):
+    return frappe.get_doc("File", {"file_url": file_url}).get_full_path()
+
+
+def iter_records(path, file_format, start=0):
+    """
+    Read the rows of an import file one at a time
+
+    Args:
+        path (str): Path of the file
+        file_format (str): CSV or NDJSON
+        start (int, optional): Skip the rows up to this row number
+
+    Yields:
+        tuple: (row number starting at 1, dict of the row or an error message)
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if file_format == "NDJSON":
+            row_number = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                row_number += 1
+                if row_number <= start:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = _("Invalid JSON")
+                if not isinstance(record, (dict, str)):
+                    record = _("Row must be an object")
+                yield row_number, record
+        else:
+            for row_number, record in enumerate(csv.DictReader(f), start=1):
+                if row_number > start:
+                    yield row_number, record
+
+
+def count_rows(path, file_format):
+    return sum(1 for record in iter_records(path, file_format))
+
+
+def _chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def get_column_map():
+    """
+    Map accepted file headers to Job Application columns
+
+    Files may use the names of the list endpoints (email, apply_date, ...) or
+    the column names themselves. Columns missing from the table and the
+    standard columns (name, owner, ...) are dropped.
+    """
+    columns = {}
+    for exposed, column in JOB_APPLICATION_FIELD_MAP.items():
+        columns[exposed] = column
+        columns[column] = column
+    return {
+        header: column for header, column in columns.items()
+        if column not in IGNORED_COLUMNS and frappe.db.has_column("Job Application", column)
+    }
+
+
+class ValidationContext:
+    """Per import lookups, computed once instead of once per row"""
+
+    def __init__(self):
+        meta = frappe.get_meta("Job Application")
+        self.column_map = get_column_map()
+        self.status_options = [option for option in (meta.get_options("status") or "").split("\n") if option]
+        self.links = {
+            field.fieldname: field.options
+            for field in meta.get_link_fields()
+            if field.fieldname in self.column_map.values()
+        }
+        self.has_naming_series = frappe.db.has_column("Job Application", "naming_series")
+        self.name_series = get_name_series(meta)
+
+
+def _map_row(record, column_map):
+    values = {}
+    for header, value in record.items():
+        column = column_map.get((header or "").strip())
+        if column and value not in (None, ""):
+            values[column] = value.strip() if isinstance(value, str) else value
+    return values
+
+
+def validate_rows(chunk, context):
+    """
+    Validate a chunk of rows
+
+    Link values are checked with one query per link field for the whole
+    chunk and emails against existing applications with one more query.
+    The other checks need no query.
+
+    Returns:
+        tuple: (list of (row number, values) to insert,
+            list of {"row": row number, "errors": [messages]})
+    """
+    mapped, errors = [], []
+    for row_number, record in chunk:
+        if isinstance(record, str):
+            errors.append({"row": row_number, "errors": [record]})
+            continue
+
+        values = _map_row(record, context.column_map)
+        row_errors = [_("{0} is required").format(column) for column in REQUIRED_COLUMNS if not values.get(column)]
+
+        if values.get("email_id") and not validate_email_address(values["email_id"]):
+            row_errors.append(_("Invalid email {0}").format(values["email_id"]))
+
+        values.setdefault("status", "Open")
+        if context.status_options and values["status"] not in context.status_options:
+            row_errors.append(_("Invalid status {0}").format(values["status"]))
+
+        try:
+            values["application_date"] = getdate(values.get("application_date") or nowdate())
+        except Exception:
+            row_errors.append(_("Invalid date {0}").format(values.get("application_date")))
+
+        mapped.append((row_number, values, row_errors))
+
+    for fieldname, link_doctype in context.links.items():
+        linked = {values[fieldname] for row_number, values, row_errors in mapped if values.get(fieldname)}
+        if not linked:
+            continue
+        existing = set(frappe.get_all(link_doctype, filters={"name": ["in", list(linked)]}, pluck="name"))
+        for row_number, values, row_errors in mapped:
+            if values.get(fieldname) and values[fieldname] not in existing:
+                row_errors.append(_("{0} {1} does not exist").format(link_doctype, values[fieldname]))
+
+    # Earlier chunks are already indexed, so one lookup covers the whole file
+    existing = find_email_duplicates([values.get("email_id") for row_number, values, row_errors in mapped])
+    seen = {}
+    for row_number, values, row_errors in mapped:
+        email_hash = hash_email(values.get("email_id"))
+        if not email_hash:
+            continue
+        if existing.get(email_hash):
+            row_errors.append(_("Duplicate of {0}").format(", ".join(existing[email_hash])))
+        elif email_hash in seen:
+            row_errors.append(_("Duplicate of row {0}").format(seen[email_hash]))
+        elif not row_errors:
+            seen[email_hash] = row_number
+
+    valid = []
+    for row_number, values, row_errors in mapped:
+        if row_errors:
+            errors.append({"row": row_number, "errors": row_errors})
+        else:
+            valid.append((row_number, values))
+
+    errors.sort(key=lambda error: error["row"])
+    return valid, errors
+
+
+def get_name_series(meta=None):
+    """
+    The counter series Job Application names are made from
+
+    Read from the doctype's autoname, either a plain series such as
+    "HR-APP-.YYYY.-.#####" or "naming_series:" with the default of the
+    naming_series field.
+
+    Returns:
+        dict: prefix and digits of the counter and the naming_series value
+            rows are stored with, or None when names are made some other way
+            (hash, format:, field:, ...)
+    """
+    meta = meta or frappe.get_meta("Job Application")
+    autoname = (meta.autoname or "").strip()
+    naming_series = None
+
+    if autoname.startswith("naming_series:"):
+        field = meta.get_field("naming_series")
+        series = field and (field.default or (field.options or "").split("\n")[0].strip())
+        if not series:
+            return None
+        naming_series = series
+        if "#" not in series:
+            # Same default counter as frappe's set_name_by_naming_series
+            series = f"{series}.#####"
+    elif "#" in autoname and ":" not in autoname:
+        series = autoname
+    else:
+        return None
+
+    # Only a counter at the very end can be reserved as a block
+    parts = series.split(".")
+    counter = parts[-1]
+    if not counter or set(counter) != {"#"} or any("#" in part for part in parts[:-1]):
+        return None
+
+    return {
+        "naming_series": naming_series,
+        "prefix": parse_naming_series(parts[:-1]),
+        "digits": len(counter)
+    }
+
+
+def reserve_names(count, name_series):
+    """
+    Reserve a block of Job Application names at once
+
+    Same series and format as make_autoname, but the counter moves once per
+    chunk instead of once per row. The reservation is part of the chunk's
+    transaction, so a failed chunk gives the names back.
+    """
+    prefix = name_series["prefix"]
+    current = frappe.db.sql("SELECT `current` FROM `tabSeries` WHERE `name` = %s FOR UPDATE", prefix)
+    if current and current[0][0] is not None:
+        start = cint(current[0][0])
+        frappe.db.sql("UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name` = %s", (count, prefix))
+    else:
+        start = 0
+        frappe.db.sql("INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (prefix, count))
+
+    return [f"{prefix}{str(start + offset).zfill(name_series['digits'])}" for offset in range(1, count + 1)]
+
+
+def make_names(rows, context):
+    """
+    Names of the rows to insert
+
+    A counter series is reserved as one block. Any other naming rule is
+    applied row by row by frappe, exactly as doc.insert would.
+    """
+    if context.name_series:
+        return reserve_names(len(rows), context.name_series)
+
+    names = []
+    for row_number, row in rows:
+        doc = frappe.get_doc(dict(row, doctype="Job Application"))
+        set_new_name(doc)
+        names.append(doc.name)
+    return names
+
+
+def insert_rows(rows, context):
+    """
+    Bulk insert validated rows
+
+    Returns:
+        list: names of the inserted Job Applications
+    """
+    if not rows:
+        return []
+
+    columns = sorted({column for row_number, row in rows for column in row})
+    names = make_names(rows, context)
+    timestamp = now()
+    user = frappe.session.user
+
+    fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus"] + columns
+    values = []
+    for name, (row_number, row) in zip(names, rows):
+        values.append([name, timestamp, timestamp, user, user, 0] + [row.get(column) for column in columns])
+
+    if context.has_naming_series and context.name_series and context.name_series["naming_series"]:
+        fields.append("naming_series")
+        for row in values:
+            row.append(context.name_series["naming_series"])
+
+    frappe.db.bulk_insert("Job Application", fields=fields, values=values)
+    # No doc_events for bulk inserted rows, index their skills and profiles here
+    index_applications([(name, row.get("skills")) for name, (row_number, row) in zip(names, rows)])
+    index_profiles([dict(row, name=name) for name, (row_number, row) in zip(names, rows)])
+    return names
+
+
+def _store_errors(import_doc, errors):
+    stored = json.loads(import_doc.row_errors or "[]")
+    room = MAX_STORED_ERRORS - len(stored)
+    if room > 0 and errors:
+        stored.extend(errors[:room])
+    return json.dumps(stored)
+
+
+def run_import(import_name, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Background job: import a file chunk by chunk
+
+    Every chunk is validated, inserted and committed together with the
+    checkpoint and counters of the import document, so a restarted import
+    continues right after the last committed chunk.
+    """
+    import_doc = frappe.get_doc(IMPORT_DOCTYPE, import_name)
+    if import_doc.status in ("Completed", "Partially Completed"):
+        return
+
+    file_format = import_doc.file_format or "CSV"
+    path = get_file_path(import_doc.import_file)
+    frappe.set_user(import_doc.owner)
+
+    updates = {"status": "In Progress", "error_message": None}
+    if not import_doc.total_rows:
+        updates["total_rows"] = count_rows(path, file_format)
+    import_doc.db_set(updates, commit=True)
+
+    try:
+        context = ValidationContext()
+        for chunk in _chunks(iter_records(path, file_format, start=cint(import_doc.last_committed_row)), chunk_size):
+            valid, errors = validate_rows(chunk, context)
+            insert_rows(valid, context)
+
+            import_doc.db_set({
+                "last_committed_row": chunk[-1][0],
+                "imported_rows": cint(import_doc.imported_rows) + len(valid),
+                "failed_rows": cint(import_doc.failed_rows) + len(errors),
+                "row_errors": _store_errors(import_doc, errors)
+            }, update_modified=False)
+            invalidate_doctype("Job Application")
+            frappe.db.commit()
+
+            frappe.publish_realtime(
+                "job_application_import_progress",
+                get_import_status(import_name),
+                user=import_doc.owner
+            )
+
+        import_doc.db_set("status", "Partially Completed" if cint(import_doc.failed_rows) else "Completed")
+        frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+        import_doc.reload()
+        import_doc.db_set({"status": "Failed", "error_message": traceback.format_exc()[-2000:]}, commit=True)
+        raise
+
+
+def get_job_id(import_name):
+    return f"job_application_import::{import_name}"
+
+
+def enqueue_import(import_name):
+    """Queue an import, or a resume of it, unless it is already queued or running"""
+    if is_job_enqueued(get_job_id(import_name)):
+        frappe.throw(_("Import {0} is already queued or running").format(import_name), frappe.ValidationError)
+
+    frappe.db.set_value(IMPORT_DOCTYPE, import_name, "status", "Queued")
+    frappe.enqueue(
+        "custom_app.applicant_import.run_import",
+        queue=IMPORT_QUEUE,
+        timeout=IMPORT_TIMEOUT,
+        job_id=get_job_id(import_name),
+        deduplicate=True,
+        import_name=import_name,
+        enqueue_after_commit=True,
+        now=frappe.flags.in_test
+    )
+
+
+def save_upload(upload):
+    """
+    Copy an uploaded file to the private files block by block and register it
+
+    Large uploads are spooled to a temporary file by werkzeug, so the file is
+    never held in memory as a whole.
+    """
+    file_name = f"{frappe.generate_hash(length=8)}-{secure_filename(upload.filename) or 'import'}"
+    path = frappe.get_site_path("private", "files", file_name)
+    with open(path, "wb") as f:
+        shutil.copyfileobj(upload.stream, f, UPLOAD_BLOCK_BYTES)
+
+    return frappe.get_doc({
+        "doctype": "File",
+        "file_name": upload.filename,
+        "file_url": f"/private/files/{file_name}",
+        "file_size": os.path.getsize(path),
+        "is_private": 1
+    }).insert(ignore_permissions=True)
+
+
+def create_import(file_url=None, file_format=None):
+    """
+    Create an import from an uploaded file or an existing File and queue it
+
+    The upload is the `file` part of a multipart request.
+    """
+    import_doc = frappe.new_doc(IMPORT_DOCTYPE)
+    import_doc.file_format = (file_format or "CSV").upper()
+
+    upload = frappe.request.files.get("file") if frappe.request and frappe.request.files else None
+    file_doc = None
+    if upload:
+        file_doc = save_upload(upload)
+        file_url = file_doc.file_url
+    if not file_url:
+        frappe.throw(_("Upload a file or give a file_url"), frappe.ValidationError)
+
+    import_doc.import_file = file_url
+    import_doc.insert()
+    if file_doc:
+        file_doc.db_set({"attached_to_doctype": IMPORT_DOCTYPE, "attached_to_name": import_doc.name})
+
+    enqueue_import(import_doc.name)
+    return import_doc.name
+
+
+def resume_import(import_name):
+    """Queue a failed or interrupted import again, it continues after its last committed chunk"""
+    status = frappe.db.get_value(IMPORT_DOCTYPE, import_name, "status")
+    if status in ("Completed", "Partially Completed"):
+        frappe.throw(_("Import {0} is already finished").format(import_name), frappe.ValidationError)
+    enqueue_import(import_name)
+
+
+def get_import_status(import_name, errors_start=0, errors_limit=100):
+    """Progress of an import and a page of its row errors"""
+    import_doc = frappe.db.get_value(
+        IMPORT_DOCTYPE,
+        import_name,
+        ["name", "status", "total_rows", "last_committed_row", "imported_rows", "failed_rows",
+         "error_message", "row_errors"],
+        as_dict=True
+    )
+    if not import_doc:
+        frappe.throw(_("Import {0} not found").format(import_name), frappe.DoesNotExistError)
+
+    errors = json.loads(import_doc.pop("row_errors") or "[]")
+    errors_start, errors_limit = cint(errors_start), cint(errors_limit) or 100
+    import_doc["progress"] = (
+        round(100.0 * cint(import_doc.last_committed_row) / import_doc.total_rows, 2) if import_doc.total_rows else 0
+    )
+    import_doc["errors"] = errors[errors_start:errors_start + errors_limit]
+    return import_doc
@@ -0,0 +1,189 @@
+import random
+from datetime import date, timedelta
+
+import frappe
+from frappe.utils import now
+
+from custom_app import duplicates, search, skills
+from custom_app.cache import invalidate_doctype
+from custom_app.rollups import calculate_progress
+
+# Every generated document is named with this prefix, so benchmark data can
+# be told apart from real data and removed again
+NAME_PREFIX = "BENCH-"
+
+BATCH_SIZE = 10000
+
+TASK_STATUSES = ("Open", "In Progress", "Completed", "Cancelled")
+PROJECT_STATUSES = ("Planning", "Active", "Completed", "Not Started")
+PRIORITIES = ("Low", "Medium", "High")
+JOB_APPLICATION_STATUSES = ("Open", "Replied", "Rejected", "Hold", "Accepted")
+DEPARTMENTS = ("Engineering", "Design", "Sales", "Marketing", "Support", "Finance")
+SKILLS = ("python", "javascript", "sql", "react", "vue", "docker", "kubernetes", "aws",
+          "figma", "excel", "negotiation", "seo", "go", "rust", "java", "communication")
+WORDS = ("migrate", "review", "design", "deploy", "audit", "refactor", "document", "test",
+         "billing", "search", "onboarding", "reporting", "api", "dashboard", "import", "export")
+
+START_DATE = date(2025, 1, 1)
+
+
+def benchmark_name(kind, number):
+    return f"{NAME_PREFIX}{kind}-{number:07d}"
+
+
+def _sentence(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def _invalidate_lists():
+    for doctype in ("Task", "Project", "Job Application"):
+        invalidate_doctype(doctype)
+
+
+def clear_benchmark_data():
+    """Delete every generated document and its index entries"""
+    for doctype in ("Project Task", "Task", "Project", "Job Application"):
+        if frappe.db.table_exists(doctype):
+            frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE name LIKE %s", f"{NAME_PREFIX}%")
+
+    frappe.db.sql(
+        f"DELETE FROM `{search.SEARCH_TABLE}` WHERE `doctype` IN ('Task', 'Project') AND `name` LIKE %s",
+        f"{NAME_PREFIX}%"
+    )
+    for table in (skills.SKILL_INDEX_TABLE, duplicates.EMAIL_INDEX_TABLE, duplicates.LSH_INDEX_TABLE):
+        frappe.db.sql(f"DELETE FROM `{table}` WHERE `application` LIKE %s", f"{NAME_PREFIX}%")
+
+    _invalidate_lists()
+    frappe.db.commit()
+
+
+def _insert(doctype, fields, rows):
+    """Bulk insert the rows in batches, keeping only the columns the table has"""
+    columns = [field for field in fields if frappe.db.has_column(doctype, field)]
+    indexes = [fields.index(column) for column in columns]
+    batch = []
+    for row in rows:
+        batch.append(tuple(row[index] for index in indexes))
+        if len(batch) >= BATCH_SIZE:
+            frappe.db.bulk_insert(doctype, fields=columns, values=batch)
+            batch = []
+    if batch:
+        frappe.db.bulk_insert(doctype, fields=columns, values=batch)
+
+
+def _index(projects, tasks, applications):
+    """
+    Add the generated rows to the search, skill and duplicate indexes
+
+    Bulk inserts fire no doc_events, so the rows are indexed here the way the
+    hooks would, in batches.
+    """
+    search.index_rows("Project", projects)
+    search.index_rows("Task", tasks)
+    for start in range(0, len(applications), BATCH_SIZE):
+        batch = applications[start:start + BATCH_SIZE]
+        skills.index_applications([(row["name"], row["skills"]) for row in batch])
+        duplicates.index_applications(batch)
+
+
+def generate_benchmark_data(projects, tasks_per_project, job_applications, seed=42):
+    """
+    Generate a deterministic data set with bulk inserts
+
+    The same arguments and seed always produce the same rows, names and
+    values, so runs against different builds compare like for like. Existing
+    benchmark data is removed first.
+
+    Args:
+        projects (int): Number of projects
+        tasks_per_project (int): Tasks linked to each project
+        job_applications (int): Number of job applications
+        seed (int, optional): Seed of the value generator
+
+    Returns:
+        dict: number of generated rows per doctype
+    """
+    rng = random.Random(seed)
+    timestamp = now()
+    user = "Administrator"
+
+    def standard(name):
+        return [name, timestamp, timestamp, user, user, 0]
+
+    clear_benchmark_data()
+
+    project_rows, task_rows, project_task_rows = [], [], []
+    for p in range(1, projects + 1):
+        project = benchmark_name("PROJ", p)
+        start = START_DATE + timedelta(days=rng.randrange(365))
+        completed = 0
+        latest_end = start
+
+        for t in range(1, tasks_per_project + 1):
+            task = benchmark_name("TASK", (p - 1) * tasks_per_project + t)
+            status = rng.choice(TASK_STATUSES)
+            priority = rng.choice(PRIORITIES)
+            task_start = start + timedelta(days=rng.randrange(60))
+            task_end = task_start + timedelta(days=rng.randrange(1, 30))
+            title = _sentence(rng, 4).capitalize()
+            completed += status == "Completed"
+            latest_end = max(latest_end, task_end)
+
+            task_rows.append(standard(task) + [
+                title, f"<p>{_sentence(rng, 30)}</p>", status, project, priority, task_start, task_end
+            ])
+            project_task_rows.append(standard(benchmark_name("PT", (p - 1) * tasks_per_project + t)) + [
+                project, "Project", "tasks", t, task, title, status, priority, task_start, task_end
+            ])
+
+        project_rows.append(standard(project) + [
+            _sentence(rng, 3).capitalize(), f"<p>{_sentence(rng, 40)}</p>", rng.choice(PROJECT_STATUSES),
+            rng.choice(PRIORITIES), start, latest_end, tasks_per_project, completed,
+            calculate_progress(tasks_per_project, completed)
+        ])
+
+    standard_fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus"]
+    project_fields = standard_fields + [
+        "title", "description", "status", "priority", "start_date", "end_date",
+        "task_count", "completed_count", "progress"
+    ]
+    task_fields = standard_fields + [
+        "title", "description", "status", "project", "priority", "start_date", "end_date"
+    ]
+    _insert("Project", project_fields, project_rows)
+    _insert("Task", task_fields, task_rows)
+    _insert("Project Task", standard_fields + [
+        "parent", "parenttype", "parentfield", "idx",
+        "task", "task_title", "status", "priority", "start_date", "end_date"
+    ], project_task_rows)
+
+    application_rows = []
+    if frappe.db.table_exists("Job Application"):
+        for a in range(1, job_applications + 1):
+            first, last = _sentence(rng, 1).capitalize(), _sentence(rng, 1).capitalize()
+            application_rows.append(standard(benchmark_name("JA", a)) + [
+                f"{rng.choice(DEPARTMENTS)} {_sentence(rng, 1)}", f"{first} {last}",
+                f"{first}.{last}.{a}@example.com".lower(), rng.choice(JOB_APPLICATION_STATUSES),
+                rng.choice(DEPARTMENTS), START_DATE + timedelta(days=rng.randrange(365)),
+                ", ".join(rng.sample(SKILLS, rng.randint(2, 6))), str(rng.randrange(0, 20))
+            ])
+        application_fields = standard_fields + [
+            "job_title", "applicant_name", "email_id", "status", "department",
+            "application_date", "skills", "custom_experience"
+        ]
+        _insert("Job Application", application_fields, application_rows)
+
+    _index(
+        [dict(zip(project_fields, row)) for row in project_rows],
+        [dict(zip(task_fields, row)) for row in task_rows],
+        [dict(zip(application_fields, row)) for row in application_rows] if application_rows else []
+    )
+    _invalidate_lists()
+    frappe.db.commit()
+
+    return {
+        "Project": len(project_rows),
+        "Task": len(task_rows),
+        "Project Task": len(project_task_rows),
+        "Job Application": len(application_rows)
+    }
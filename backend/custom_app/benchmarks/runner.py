@@ -0,0 +1,376 @@
+import json
+import resource
+import time
+from contextlib import contextmanager, nullcontext
+
+import frappe
+from frappe.utils import now
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+
+from custom_app import api, routes
+from custom_app.export import build_export_query, iter_chunks
+from custom_app.instrumentation import instrument_db
+from custom_app.utils import percentile
+
+from .data import benchmark_name, clear_benchmark_data, generate_benchmark_data
+
+# Number of tasks of each scale; projects hold TASKS_PER_PROJECT tasks each
+# and there are as many job applications as tasks
+SCALES = (1000, 10000, 100000)
+TASKS_PER_PROJECT = 10
+
+DEFAULT_RUNS = 20
+WARMUP_RUNS = 2
+PAGE_LENGTH = 100
+
+# Metrics compared against a baseline, a higher value is worse for all of them.
+# peak_rss_kb is the high-water mark of the whole process, which only grows
+# from case to case, so it is reported but not compared.
+COMPARED_METRICS = ("p50_ms", "p95_ms", "queries")
+DEFAULT_TOLERANCE = 0.2
+
+
+class Case:
+    """
+    One benchmarked call
+
+    Args:
+        name (str): Label of the case in the results
+        endpoint (str): Dotted path of the api.py function or routes.py dispatcher
+        call (callable): Issues the call
+        http_method (str, optional): Request method seen by the endpoint
+        args (dict, optional): Query string and form_dict of the request
+        body (optional): JSON body of the request
+        write (bool, optional): Writes are rolled back after each run
+    """
+
+    def __init__(self, name, endpoint, call, http_method="GET", args=None, body=None, write=False):
+        self.name = name
+        self.endpoint = endpoint
+        self.call = call
+        self.http_method = http_method
+        self.args = args or {}
+        self.body = body
+        self.write = write
+
+
+def read_export(doctype, export_format="ndjson", **filters):
+    """
+    Read the whole body of an export_records call
+
+    The streamed response reads its rows from a connection of its own, opened
+    after the request and destroyed with frappe.destroy, which would tear down
+    the benchmark's. The same query and chunks are read on this connection.
+
+    Returns:
+        int: size of the body in bytes
+    """
+    query, fields = build_export_query(doctype, None, filters)
+    return sum(len(chunk) for chunk in iter_chunks(doctype, query, fields, export_format))
+
+
+def get_cases():
+    """The benchmarked calls, against the generated data set"""
+    project, other_project = benchmark_name("PROJ", 1), benchmark_name("PROJ", 2)
+    task, other_task = benchmark_name("TASK", 1), benchmark_name("TASK", 2)
+    application, other_application = benchmark_name("JA", 1), benchmark_name("JA", 2)
+    new_tasks = [{"title": f"Benchmark task {i}", "priority": "Low"} for i in range(100)]
+    new_application = {
+        "title": "Engineering review", "applicant_name": "Benchmark Applicant",
+        "email": "benchmark.applicant@example.com", "status": "Open", "position": "Engineering review",
+        "department": "Engineering", "skills": "python, sql"
+    }
+
+    def route(dispatcher, **kwargs):
+        return lambda: dispatcher(**kwargs)
+
+    return [
+        Case("get_tasks", "custom_app.api.get_tasks", lambda: api.get_tasks(limit=PAGE_LENGTH)),
+        Case("get_tasks(status)", "custom_app.api.get_tasks",
+             lambda: api.get_tasks(status="Open", limit=PAGE_LENGTH)),
+        Case("get_tasks(project)", "custom_app.api.get_tasks", lambda: api.get_tasks(project=project)),
+        Case("get_task", "custom_app.api.get_task", lambda: api.get_task(task)),
+        Case("get_projects", "custom_app.api.get_projects", lambda: api.get_projects(limit=PAGE_LENGTH)),
+        Case("get_project", "custom_app.api.get_project", lambda: api.get_project(project)),
+        Case("get_job_applications", "custom_app.api.get_job_applications",
+             lambda: api.get_job_applications(limit=PAGE_LENGTH)),
+        Case("get_job_applications(status)", "custom_app.api.get_job_applications",
+             lambda: api.get_job_applications(status="Open", limit=PAGE_LENGTH)),
+        Case("get_job_application", "custom_app.api.get_job_application",
+             lambda: api.get_job_application(application)),
+        Case("search", "custom_app.api.search", lambda: api.search("migrate review", doctype="Task")),
+        Case("match_candidates", "custom_app.api.match_candidates",
+             lambda: api.match_candidates("python, sql", limit=20)),
+        Case("find_duplicate_applicants", "custom_app.api.find_duplicate_applicants",
+             lambda: api.find_duplicate_applicants(
+                 applicant_name="Audit Review", email="audit.review@example.com", skills="python, sql"
+             )),
+        Case("export_records", "custom_app.api.export_records",
+             lambda: read_export("Task", status="Open")),
+        Case("api_tasks GET", "custom_app.api.api_tasks", api.api_tasks, args={"status": "Open"}),
+        Case("api_projects GET", "custom_app.api.api_projects", api.api_projects, args={"status": "Active"}),
+        Case("api_project_tasks GET", "custom_app.api.api_project_tasks",
+             route(api.api_project_tasks, project_id=project)),
+        Case("routes.tasks GET", "custom_app.routes.tasks", route(routes.tasks),
+             args={"status": "Open", "limit": PAGE_LENGTH}),
+        Case("routes.projects GET", "custom_app.routes.projects", route(routes.projects),
+             args={"limit": PAGE_LENGTH}),
+        Case("routes.project_tasks GET", "custom_app.routes.project_tasks",
+             route(routes.project_tasks, project_id=project)),
+        Case("create_task", "custom_app.api.create_task",
+             lambda: api.create_task("Benchmark task", project=project), write=True),
+        Case("create_tasks(100)", "custom_app.api.create_tasks", lambda: api.create_tasks(new_tasks), write=True),
+        Case("update_task", "custom_app.api.update_task",
+             lambda: api.update_task(task, status="Completed"), write=True),
+        Case("patch_task", "custom_app.api.patch_task",
+             lambda: api.patch_task(task, {"status": "Completed"}), write=True),
+        Case("update_tasks_bulk", "custom_app.api.update_tasks_bulk",
+             lambda: api.update_tasks_bulk({"priority": "High"}, filters={"project": project}), write=True),
+        Case("delete_task", "custom_app.api.delete_task", lambda: api.delete_task(other_task), write=True),
+        Case("delete_project", "custom_app.api.delete_project",
+             lambda: api.delete_project(other_project), write=True),
+        Case("create_project", "custom_app.api.create_project",
+             lambda: api.create_project("Benchmark project", tasks=[task]), write=True),
+        Case("update_project", "custom_app.api.update_project",
+             lambda: api.update_project(project, status="Active"), write=True),
+        Case("patch_project", "custom_app.api.patch_project",
+             lambda: api.patch_project(project, {"priority": "High"}), write=True),
+        Case("add_task_to_project", "custom_app.api.add_task_to_project",
+             lambda: api.add_task_to_project(other_project, task), write=True),
+        Case("remove_task_from_project", "custom_app.api.remove_task_from_project",
+             lambda: api.remove_task_from_project(project, task), write=True),
+        Case("add_tasks_to_project", "custom_app.api.add_tasks_to_project",
+             lambda: api.add_tasks_to_project(other_project, [task]), write=True),
+        Case("set_project_tasks", "custom_app.api.set_project_tasks",
+             lambda: api.set_project_tasks(other_project, [task, other_task]), write=True),
+        Case("create_job_application", "custom_app.api.create_job_application",
+             lambda: api.create_job_application(**new_application), write=True),
+        Case("update_job_application", "custom_app.api.update_job_application",
+             lambda: api.update_job_application(
+                 application, "Engineering review", "Benchmark Applicant", "benchmark.applicant@example.com", "Hold"
+             ), write=True),
+        Case("patch_job_application", "custom_app.api.patch_job_application",
+             lambda: api.patch_job_application(application, {"status": "Hold"}), write=True),
+        Case("delete_job_application", "custom_app.api.delete_job_application",
+             lambda: api.delete_job_application(other_application), write=True),
+        Case("routes.tasks POST", "custom_app.routes.tasks", route(routes.tasks), http_method="POST",
+             body={"title": "Benchmark task", "project": project}, write=True),
+        Case("routes.tasks PUT", "custom_app.routes.tasks", route(routes.tasks), http_method="PUT",
+             body={"name": task, "status": "Completed"}, write=True),
+        Case("routes.tasks PATCH", "custom_app.routes.tasks", route(routes.tasks), http_method="PATCH",
+             body={"name": task, "priority": "High"}, write=True),
+        Case("routes.tasks DELETE", "custom_app.routes.tasks", route(routes.tasks), http_method="DELETE",
+             body={"name": other_task}, write=True),
+        Case("routes.projects POST", "custom_app.routes.projects", route(routes.projects), http_method="POST",
+             body={"title": "Benchmark project", "tasks": [task]}, write=True),
+        Case("routes.projects PUT", "custom_app.routes.projects", route(routes.projects), http_method="PUT",
+             body={"name": project, "status": "Active"}, write=True),
+        Case("routes.projects PATCH", "custom_app.routes.projects", route(routes.projects), http_method="PATCH",
+             body={"name": project, "priority": "High"}, write=True),
+        Case("routes.projects DELETE", "custom_app.routes.projects", route(routes.projects),
+             http_method="DELETE", body={"name": other_project}, write=True),
+        Case("api_tasks POST", "custom_app.api.api_tasks", api.api_tasks, http_method="POST",
+             body={"title": "Benchmark task", "project": project}, write=True),
+        Case("api_tasks PUT", "custom_app.api.api_tasks", api.api_tasks, http_method="PUT",
+             body={"name": task, "status": "Completed"}, write=True),
+        Case("api_tasks DELETE", "custom_app.api.api_tasks", api.api_tasks, http_method="DELETE",
+             body={"name": other_task}, write=True),
+        Case("api_projects POST", "custom_app.api.api_projects", api.api_projects, http_method="POST",
+             body={"title": "Benchmark project", "tasks": [task]}, write=True),
+        Case("api_projects PUT", "custom_app.api.api_projects", api.api_projects, http_method="PUT",
+             body={"name": project, "status": "Active"}, write=True),
+        Case("api_projects DELETE", "custom_app.api.api_projects", api.api_projects, http_method="DELETE",
+             body={"name": other_project}, write=True),
+        Case("api_project_tasks POST", "custom_app.api.api_project_tasks",
+             route(api.api_project_tasks, project_id=other_project), http_method="POST",
+             body={"task": task}, write=True),
+        Case("api_project_tasks DELETE", "custom_app.api.api_project_tasks",
+             route(api.api_project_tasks, project_id=project), http_method="DELETE",
+             body={"task": task}, write=True),
+        Case("routes.project_tasks POST", "custom_app.routes.project_tasks",
+             route(routes.project_tasks, project_id=other_project), http_method="POST",
+             body={"tasks": [task]}, write=True)
+    ]
+
+
+@contextmanager
+def request_context(case):
+    """Give the endpoint the request, form_dict and per-request state of a real call"""
+    path = f"/api/method/{case.endpoint}"
+    if case.http_method == "GET":
+        environ = EnvironBuilder(method="GET", path=path, query_string=case.args).get_environ()
+    else:
+        environ = EnvironBuilder(method=case.http_method, path=path, json=case.body).get_environ()
+
+    frappe.local.request = Request(environ)
+    frappe.local.form_dict = frappe._dict(case.args)
+    frappe.local.response = frappe._dict()
+    frappe.local.custom_app_permissions = {}
+    frappe.flags.custom_app_etag = None
+    frappe.flags.custom_app_not_modified = None
+    try:
+        yield
+    finally:
+        frappe.local.request = None
+
+
+@contextmanager
+def rolled_back():
+    """Run a write without persisting it: commits are skipped, then everything is rolled back"""
+    commit = frappe.db.commit
+    frappe.db.commit = lambda *args, **kwargs: None
+    try:
+        yield
+    finally:
+        frappe.db.commit = commit
+        frappe.db.rollback()
+
+
+def _peak_rss_kb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_case(case, runs=DEFAULT_RUNS):
+    """
+    Time a case
+
+    Returns:
+        dict: latency percentiles in milliseconds, queries per call, peak RSS
+            of the whole process so far (not of the case alone) and the
+            number of calls that returned or raised an error
+    """
+    stats = instrument_db()
+    timings, queries, errors = [], [], 0
+
+    for run in range(WARMUP_RUNS + runs):
+        failed = False
+        with request_context(case), (rolled_back() if case.write else nullcontext()):
+            count_before = stats.count
+            start = time.perf_counter()
+            try:
+                result = case.call()
+                failed = isinstance(result, dict) and bool(result.get("error"))
+            except Exception:
+                failed = True
+            elapsed = time.perf_counter() - start
+            count = stats.count - count_before
+
+        if run < WARMUP_RUNS:
+            continue
+        timings.append(elapsed * 1000)
+        queries.append(count)
+        errors += failed
+
+    return {
+        "endpoint": case.endpoint,
+        "runs": runs,
+        "p50_ms": round(percentile(timings, 0.5), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "p99_ms": round(percentile(timings, 0.99), 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "queries": max(queries),
+        "peak_rss_kb": _peak_rss_kb(),
+        "errors": errors
+    }
+
+
+def run_benchmarks(scales=SCALES, runs=DEFAULT_RUNS, seed=42, cases=None, keep_data=False, echo=print):
+    """
+    Generate the data set of each scale and time every case against it
+
+    The list response cache is bypassed so that every call reaches the
+    database. Benchmark data is removed at the end unless keep_data is set.
+
+    Args:
+        scales (tuple): Task counts to benchmark
+        runs (int): Timed calls per case, after warm-up calls
+        seed (int): Seed of the data generator
+        cases (list, optional): Names of the cases to run, all by default
+        keep_data (bool): Leave the data of the last scale in place
+        echo (callable): Progress output
+
+    Returns:
+        dict: the results, in the baseline file format
+    """
+    frappe.set_user("Administrator")
+    frappe.flags.custom_app_bypass_cache = True
+
+    results = {
+        "created": now(),
+        "site": frappe.local.site,
+        "runs": runs,
+        "seed": seed,
+        "scales": {}
+    }
+    try:
+        for scale in scales:
+            counts = generate_benchmark_data(
+                projects=max(1, scale // TASKS_PER_PROJECT),
+                tasks_per_project=TASKS_PER_PROJECT,
+                job_applications=scale,
+                seed=seed
+            )
+            echo(f"Scale {scale}: " + ", ".join(f"{count} {doctype}" for doctype, count in counts.items()))
+
+            results["scales"][str(scale)] = {}
+            for case in get_cases():
+                if cases and case.name not in cases:
+                    continue
+                result = run_case(case, runs)
+                results["scales"][str(scale)][case.name] = result
+                echo(
+                    f"  {case.name}: p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+                    f"{result['queries']} queries" + (f", {result['errors']} errors" if result["errors"] else "")
+                )
+    finally:
+        frappe.flags.custom_app_bypass_cache = False
+        if not keep_data:
+            clear_benchmark_data()
+
+    return results
+
+
+def save_results(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    """
+    Flag the metrics that got worse than the baseline beyond the tolerance
+
+    Query counts are deterministic and flagged on any increase; latency is
+    flagged when it exceeds the baseline by more than the tolerance, a
+    fraction of the baseline value.
+
+    Returns:
+        list: dicts with scale, case, metric, baseline and current values
+    """
+    regressions = []
+    for scale, cases in current["scales"].items():
+        for name, result in cases.items():
+            reference = baseline.get("scales", {}).get(scale, {}).get(name)
+            if not reference:
+                continue
+            for metric in COMPARED_METRICS:
+                before, after = reference.get(metric), result.get(metric)
+                if before is None or after is None:
+                    continue
+                allowed = before if metric == "queries" else before * (1 + tolerance)
+                if after > allowed:
+                    regressions.append({
+                        "scale": scale,
+                        "case": name,
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after
+                    })
+
+    return regressions
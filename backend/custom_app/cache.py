@@ -0,0 +1,217 @@
+import hashlib
+import json
+import time
+
+import frappe
+
+from .permissions import get_permission_query_conditions
+
+# Cached list responses expire on their own after this many seconds
+CACHE_TTL = 300
+
+# Cached lists whose contents depend on each doctype. Task changes also move
+# the stored Project counters, and Project Task rows feed the project lists
+INVALIDATES = {
+    "Task": ["Task", "Project"],
+    "Project": ["Project"],
+    "Project Task": ["Project"],
+    "Job Application": ["Job Application"]
+}
+
+LIST_DOCTYPES = ["Task", "Project", "Job Application"]
+
+
+def _redis_key(key):
+    return frappe.cache().make_key(f"custom_app:{key}")
+
+
+def _seed_generation(key):
+    """
+    Start a missing generation counter at the current time in microseconds
+
+    Redis keeps no data across restarts and `bench clear-cache` drops the
+    counters, so restarting them from 0 would hand out ETags that clients
+    cached before and answer 304 with stale rows. A time based start is
+    always past every value the lost counter reached.
+    """
+    frappe.cache().set(key, time.time_ns() // 1000, nx=True)
+
+
+def get_generation(doctype):
+    """Return the current generation counter of a cached list doctype"""
+    key = _redis_key(f"generation:{doctype}")
+    value = frappe.cache().get(key)
+    if value is None:
+        _seed_generation(key)
+        value = frappe.cache().get(key)
+    return int(value)
+
+
+def _incr_generation(doctype):
+    key = _redis_key(f"generation:{doctype}")
+    _seed_generation(key)
+    frappe.cache().incr(key)
+
+
+def bump_generation(doctype):
+    """
+    Invalidate every cached list of a doctype by moving its generation counter
+
+    Cache keys embed the generation, so old entries are never read again and
+    simply expire. The counter is moved again after commit so that a reader
+    racing with the open transaction cannot keep stale rows under the new key.
+    """
+    _incr_generation(doctype)
+    frappe.db.after_commit.add(lambda: _incr_generation(doctype))
+
+
+def invalidate_doctype(doctype):
+    """Invalidate the cached lists that depend on a doctype"""
+    for list_doctype in INVALIDATES.get(doctype, []):
+        bump_generation(list_doctype)
+
+
+def invalidate(doc, method=None):
+    """doc_events hook: invalidate the cached lists that depend on a document"""
+    invalidate_doctype(doc.doctype)
+
+
+def invalidate_assignment(doc, method=None):
+    """
+    doc_events hook of ToDo: invalidate the lists of the assigned document
+
+    Assignments are written to the `_assign` column of the reference with
+    frappe.db.set_value, which fires none of its events, yet that column
+    decides which tasks and projects a Task User sees.
+    """
+    if doc.reference_type:
+        invalidate_doctype(doc.reference_type)
+
+
+def get_permission_scope(doctype):
+    """
+    Identify the permission scope of the session user for cache keys
+
+    Users sharing roles and row level conditions see the same rows, so they
+    share cache entries; the conditions only name the user when they depend on it.
+    """
+    return {
+        "roles": sorted(frappe.get_roles()),
+        "conditions": get_permission_query_conditions(doctype)
+    }
+
+
+def get_cache_key(doctype, params):
+    """Build the cache key of a list response"""
+    key = json.dumps(
+        {
+            "doctype": doctype,
+            "generation": get_generation(doctype),
+            "params": params,
+            "scope": get_permission_scope(doctype)
+        },
+        sort_keys=True,
+        default=str
+    )
+    return f"list:{doctype}:{hashlib.sha1(key.encode()).hexdigest()}"
+
+
+def _record(doctype, outcome):
+    frappe.cache().incr(_redis_key(f"stats:{doctype}:{outcome}"))
+
+
+def get_cached_list(doctype, params, fetch):
+    """
+    Return a list response from the cache, or compute and cache it
+
+    Args:
+        doctype (str): DocType of the list
+        params (dict): Filters, projection and paging parameters of the call
+        fetch (callable): Computes the response on a cache miss
+
+    The `next_cursor` of paginated responses is cached with the rows. The
+    cache is skipped while `frappe.flags.custom_app_bypass_cache` is set, as
+    the benchmarks do.
+    """
+    if frappe.flags.custom_app_bypass_cache:
+        return fetch()
+
+    # get_value and set_value prefix the key with the site themselves
+    key = f"custom_app:{get_cache_key(doctype, params)}"
+    cached = frappe.cache().get_value(key)
+    if cached is not None:
+        _record(doctype, "hits")
+        if "next_cursor" in cached:
+            frappe.local.response["next_cursor"] = cached["next_cursor"]
+        return cached["data"]
+
+    _record(doctype, "misses")
+    data = fetch()
+
+    entry = {"data": data}
+    if "next_cursor" in frappe.local.response:
+        entry["next_cursor"] = frappe.local.response["next_cursor"]
+    frappe.cache().set_value(key, entry, expires_in_sec=CACHE_TTL)
+
+    return data
+
+
+def get_collection_etag(doctype, params):
+    """
+    Build the ETag of a collection response
+
+    The tag changes whenever the generation counter of the doctype moves, so
+    it is as cheap to compute as a cache key and needs no query.
+    """
+    return '"{0}"'.format(get_cache_key(doctype, params).rsplit(":", 1)[-1])
+
+
+def is_not_modified(doctype):
+    """
+    Set the ETag of a GET collection request and check it against If-None-Match
+
+    Returns True when the client already holds the current version, in which
+    case the caller should return without building the rows. The ETag header
+    and the 304 status are applied by middleware.apply_conditional_response.
+    """
+    if not frappe.request or frappe.request.method != "GET":
+        return False
+
+    params = {key: value for key, value in frappe.form_dict.items() if key != "cmd"}
+    etag = get_collection_etag(doctype, params)
+    frappe.flags.custom_app_etag = etag
+
+    if_none_match = frappe.request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+
+    client_tags = [tag.strip() for tag in if_none_match.split(",")]
+    client_tags = [tag[2:] if tag.startswith("W/") else tag for tag in client_tags]
+    # "*" only says that some version exists, which never proves a list is current
+    if etag in client_tags:
+        frappe.flags.custom_app_not_modified = True
+        return True
+
+    return False
+
+
+@frappe.whitelist()
+def get_cache_stats():
+    """
+    Get hit and miss counters of the list response cache per doctype
+    """
+    frappe.only_for("System Manager")
+
+    stats = {}
+    for doctype in LIST_DOCTYPES:
+        hits = int(frappe.cache().get(_redis_key(f"stats:{doctype}:hits")) or 0)
+        misses = int(frappe.cache().get(_redis_key(f"stats:{doctype}:misses")) or 0)
+        total = hits + misses
+        stats[doctype] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": (hits / total) if total else 0,
+            "generation": get_generation(doctype)
+        }
+
+    return stats
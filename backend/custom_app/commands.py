@@ -0,0 +1,211 @@
+import click
+import frappe
+from frappe.commands import get_site, pass_context
+
+
+@click.command("repair-project-counters")
+@click.option("--chunk-size", default=500, help="Number of projects recomputed per chunk")
+@click.option("--verbose", is_flag=True, default=False, help="Print every drifted project")
+@pass_context
+def repair_project_counters(context, chunk_size, verbose):
+    """Recompute stored project task counters and report any drift"""
+    from custom_app.rollups import repair_project_counters as repair
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        result = repair(chunk_size=chunk_size, verbose=verbose)
+        click.echo(f"Checked {result['checked']} projects, repaired {len(result['drifted'])} with drifted counters")
+    finally:
+        frappe.destroy()
+
+
+@click.command("explain-endpoints")
+@click.option("--all", "show_all", is_flag=True, default=False, help="Print every table access, not only full scans")
+@pass_context
+def explain_endpoints(context, show_all):
+    """EXPLAIN the query shapes of the app endpoints and report full table scans"""
+    from custom_app.indexes import explain_query_shapes
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        report = explain_query_shapes()
+        full_scans = [row for row in report if row["full_scan"]]
+        for row in (report if show_all else full_scans):
+            click.echo(
+                "{0}{1}: `{2}` type={3} key={4} rows={5} {6}".format(
+                    "FULL SCAN " if row["full_scan"] else "",
+                    row["shape"], row["table"], row["type"], row["key"], row["rows"], row["extra"] or ""
+                ).rstrip()
+            )
+        click.echo(f"{len(full_scans)} full scans in {len({row['shape'] for row in report})} query shapes")
+    finally:
+        frappe.destroy()
+
+
+@click.command("benchmark-endpoints")
+@click.option("--scale", "scales", multiple=True, type=int, help="Number of tasks, repeatable (default 1000, 10000, 100000)")
+@click.option("--runs", default=20, help="Timed calls per endpoint")
+@click.option("--seed", default=42, help="Seed of the data generator")
+@click.option("--case", "cases", multiple=True, help="Only run this case, repeatable")
+@click.option("--output", help="Write the results to this JSON file")
+@click.option("--compare", "baseline", help="Compare the results with this baseline JSON file")
+@click.option("--tolerance", default=0.2, help="Allowed slowdown over the baseline, as a fraction")
+@click.option("--keep-data", is_flag=True, default=False, help="Keep the generated data of the last scale")
+@pass_context
+def benchmark_endpoints(context, scales, runs, seed, cases, output, baseline, tolerance, keep_data):
+    """Benchmark every endpoint against generated data and compare with a baseline"""
+    from custom_app.benchmarks.runner import SCALES, compare_results, load_results, run_benchmarks, save_results
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        results = run_benchmarks(
+            scales=scales or SCALES, runs=runs, seed=seed, cases=cases, keep_data=keep_data, echo=click.echo
+        )
+        if output:
+            save_results(results, output)
+            click.echo(f"Results written to {output}")
+
+        if baseline:
+            regressions = compare_results(load_results(baseline), results, tolerance)
+            for regression in regressions:
+                click.echo(
+                    "REGRESSION {scale} {case} {metric}: {baseline} -> {current}".format(**regression)
+                )
+            click.echo(f"{len(regressions)} regressions beyond the tolerance")
+            if regressions:
+                raise SystemExit(1)
+    finally:
+        frappe.destroy()
+
+
+@click.command("replay-traffic")
+@click.option("--file", "path", help="Recorded traffic JSONL file (default: the site's traffic log)")
+@click.option("--url", help="Site to drive (default: the site URL)")
+@click.option("--concurrency", default=8, help="Number of calls in flight")
+@click.option("--speedup", default=1.0, help="Replay this many times faster than recorded, 0 for no pacing")
+@click.option("--token", help="Authorization header value, e.g. 'token key:secret'")
+@click.option("--auth-file", help="JSON file mapping recorded roles to Authorization header values")
+@click.option("--limit", type=int, help="Only replay the first calls")
+@click.option("--output", help="Write the report to this JSON file")
+@pass_context
+def replay_traffic(context, path, url, concurrency, speedup, token, auth_file, limit, output):
+    """Replay recorded endpoint traffic against a site and report throughput and tail latency"""
+    import json
+
+    from custom_app.traffic import get_log_path, load_traffic, replay_traffic as replay
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        records = load_traffic(path or get_log_path(), limit=limit)
+        url = url or frappe.utils.get_url()
+    finally:
+        frappe.destroy()
+
+    auth = {}
+    if auth_file:
+        with open(auth_file) as f:
+            auth = json.load(f)
+    if token:
+        auth["default"] = token
+
+    click.echo(f"Replaying {len(records)} calls against {url}")
+    report = replay(records, url, concurrency=concurrency, speedup=speedup, auth=auth)
+    click.echo(
+        "{requests} calls in {duration_s} s, {throughput_rps} calls/s, {errors} errors, max lag {max_lag_ms} ms".format(
+            **report
+        )
+    )
+    click.echo("Latency p50 {p50_ms} ms, p95 {p95_ms} ms, p99 {p99_ms} ms, max {max_ms} ms".format(**report["latency"]))
+    for endpoint, stats in report["endpoints"].items():
+        click.echo(f"  {endpoint}: {stats['requests']} calls, p95 {stats['p95_ms']} ms, p99 {stats['p99_ms']} ms")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=1)
+
+
+@click.command("rebuild-search-index")
+@click.option("--doctype", "doctypes", multiple=True, help="Only rebuild this doctype, repeatable")
+@click.option("--chunk-size", default=1000, help="Number of documents indexed per chunk")
+@click.option("--verbose", is_flag=True, default=False, help="Print progress")
+@pass_context
+def rebuild_search_index(context, doctypes, chunk_size, verbose):
+    """Rebuild the full-text search index of tasks and projects"""
+    from custom_app.search import rebuild_search_index as rebuild
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        counts = rebuild(doctypes=doctypes or None, chunk_size=chunk_size, verbose=verbose)
+        click.echo(", ".join(f"Indexed {count} {doctype} documents" for doctype, count in counts.items()))
+    finally:
+        frappe.destroy()
+
+
+@click.command("rebuild-skill-index")
+@click.option("--chunk-size", default=1000, help="Number of job applications indexed per chunk")
+@click.option("--verbose", is_flag=True, default=False, help="Print progress")
+@pass_context
+def rebuild_skill_index(context, chunk_size, verbose):
+    """Rebuild the skill index of job applications"""
+    from custom_app.skills import rebuild_skill_index as rebuild
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        count = rebuild(chunk_size=chunk_size, verbose=verbose)
+        click.echo(f"Indexed skills of {count} job applications")
+    finally:
+        frappe.destroy()
+
+
+@click.command("find-duplicate-applicants")
+@click.option("--rebuild-index", is_flag=True, default=False, help="Rebuild the email hash and LSH tables first")
+@click.option("--output", help="Write the clusters to this JSON file")
+@click.option("--verbose", is_flag=True, default=False, help="Print progress")
+@pass_context
+def find_duplicate_applicants(context, rebuild_index, output, verbose):
+    """Cluster duplicate and near duplicate job applications for merging"""
+    import json
+
+    from custom_app.duplicates import find_duplicate_clusters, rebuild_duplicate_index
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        if rebuild_index:
+            count = rebuild_duplicate_index(verbose=verbose)
+            click.echo(f"Indexed {count} job applications")
+        report = find_duplicate_clusters(verbose=verbose)
+    finally:
+        frappe.destroy()
+
+    for cluster in report["clusters"]:
+        click.echo(f"{', '.join(cluster['applications'])} ({', '.join(cluster['reasons'])})")
+    click.echo(f"{len(report['clusters'])} clusters of duplicate applications")
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=1)
+        click.echo(f"Clusters written to {output}")
+
+
+commands = [
+    repair_project_counters,
+    explain_endpoints,
+    benchmark_endpoints,
+    replay_traffic,
+    rebuild_search_index,
+    rebuild_skill_index,
+    find_duplicate_applicants,
+]
@@ -0,0 +1,453 @@
+import hashlib
+import random
+import re
+import unicodedata
+from itertools import groupby
+
+import frappe
+from frappe import _
+from frappe.utils import now
+
+from .skills import normalize_skills
+
+# Exact duplicates: applications by normalized email hash
+EMAIL_INDEX_TABLE = "__custom_app_applicant_email"
+
+# Near duplicates: MinHash signatures of the name 3-grams and skill tokens,
+# cut into LSH bands. Two profiles sharing any band bucket are candidates.
+LSH_INDEX_TABLE = "__custom_app_applicant_lsh"
+
+NUM_HASHES = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_HASHES // BANDS
+
+# Jaccard similarity of two profiles above which they are near duplicates.
+# With 16 bands of 4 rows, pairs this similar share a bucket with a
+# probability of about 99%, pairs at 0.3 about one time in eight.
+SIMILARITY_THRESHOLD = 0.7
+
+# The batch scan compares every pair of members of buckets up to this size.
+# Members of larger buckets, e.g. one profile submitted hundreds of times, are
+# only compared with the next BUCKET_WINDOW members in name order, which keeps
+# the pairs linear in the bucket size and still chains identical profiles.
+MAX_BUCKET_SIZE = 100
+BUCKET_WINDOW = 10
+MAX_CANDIDATES = 50
+
+# Providers that ignore dots in the local part of an address
+DOTLESS_EMAIL_DOMAINS = {"gmail.com": "gmail.com", "googlemail.com": "gmail.com"}
+
+CLUSTERS_CACHE_KEY = "custom_app:duplicate_clusters"
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20261017)
+# Fixed coefficients: signatures must stay comparable across processes and releases
+_HASH_COEFFICIENTS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for i in range(NUM_HASHES)
+]
+
+PROFILE_FIELDS = ["name", "applicant_name", "email_id", "skills"]
+
+
+def create_duplicate_index_tables():
+    frappe.db.sql_ddl(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{EMAIL_INDEX_TABLE}` (
+            `email_hash` CHAR(64) NOT NULL,
+            `application` VARCHAR(140) NOT NULL,
+            PRIMARY KEY (`email_hash`, `application`),
+            KEY `application` (`application`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+    frappe.db.sql_ddl(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{LSH_INDEX_TABLE}` (
+            `band` TINYINT UNSIGNED NOT NULL,
+            `bucket` BIGINT UNSIGNED NOT NULL,
+            `application` VARCHAR(140) NOT NULL,
+            PRIMARY KEY (`band`, `bucket`, `application`),
+            KEY `application` (`application`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+
+
+def normalize_email(email):
+    """Lowercase, drop +tags and the dots ignored by the provider"""
+    email = (email or "").strip().lower()
+    if "@" not in email:
+        return email
+    local, domain = email.rsplit("@", 1)
+    local = local.split("+", 1)[0]
+    if domain in DOTLESS_EMAIL_DOMAINS:
+        local = local.replace(".", "")
+        domain = DOTLESS_EMAIL_DOMAINS[domain]
+    return f"{local}@{domain}"
+
+
+def hash_email(email):
+    email = normalize_email(email)
+    return hashlib.sha256(email.encode()).hexdigest() if email else None
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation, sort the words"""
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(char for char in name if not unicodedata.combining(char)).lower()
+    return " ".join(sorted(re.findall(r"[^\W\d_]+", name)))
+
+
+def get_shingles(applicant_name, skills):
+    """Character 3-grams of the name and the normalized skill tokens of a profile"""
+    name = normalize_name(applicant_name)
+    shingles = set()
+    if name:
+        padded = f" {name} "
+        shingles.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    shingles.update(f"skill:{skill}" for skill in normalize_skills(skills))
+    return shingles
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def minhash(shingles):
+    """MinHash signature of a set of shingles"""
+    hashes = [_hash(shingle) for shingle in shingles]
+    return [
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes)
+        for a, b in _HASH_COEFFICIENTS
+    ]
+
+
+def get_band_buckets(shingles):
+    """
+    LSH buckets of a profile
+
+    Returns:
+        list: (band, bucket) pairs, empty for a profile without shingles
+    """
+    if not shingles:
+        return []
+    signature = minhash(shingles)
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        buckets.append((band, _hash(",".join(str(row) for row in rows)) >> 1))
+    return buckets
+
+
+def jaccard(first, second):
+    if not first or not second:
+        return 0
+    return len(first & second) / len(first | second)
+
+
+def _insert(table, columns, values, batch_size=1000):
+    for start in range(0, len(values), batch_size):
+        batch = values[start:start + batch_size]
+        placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        frappe.db.sql(
+            f"""
+            INSERT IGNORE INTO `{table}` ({", ".join(f"`{column}`" for column in columns)})
+            VALUES {", ".join([placeholders] * len(batch))}
+            """,
+            [value for row in batch for value in row]
+        )
+
+
+def index_applications(rows):
+    """
+    Replace the email hash and LSH entries of applications
+
+    Args:
+        rows (list): dicts with name, applicant_name, email_id and skills
+    """
+    if not rows:
+        return
+
+    remove_applications([row["name"] for row in rows])
+    emails, buckets = [], []
+    for row in rows:
+        email_hash = hash_email(row.get("email_id"))
+        if email_hash:
+            emails.append((email_hash, row["name"]))
+        for band, bucket in get_band_buckets(get_shingles(row.get("applicant_name"), row.get("skills"))):
+            buckets.append((band, bucket, row["name"]))
+
+    _insert(EMAIL_INDEX_TABLE, ["email_hash", "application"], emails)
+    _insert(LSH_INDEX_TABLE, ["band", "bucket", "application"], buckets)
+
+
+def remove_applications(names):
+    if names:
+        for table in (EMAIL_INDEX_TABLE, LSH_INDEX_TABLE):
+            frappe.db.sql(f"DELETE FROM `{table}` WHERE `application` IN %s", (tuple(names),))
+
+
+def update_index(doc, method=None):
+    """doc_events hook: reindex a saved Job Application when its profile changed"""
+    if not doc.get_doc_before_save() or any(
+        doc.has_value_changed(field) for field in ("applicant_name", "email_id", "skills")
+    ):
+        index_applications([{field: doc.get(field) for field in PROFILE_FIELDS}])
+
+
+def remove_from_index(doc, method=None):
+    """doc_events hook: drop a deleted Job Application from the index"""
+    remove_applications([doc.name])
+
+
+def find_email_duplicates(emails, exclude=None):
+    """
+    Look up applications by normalized email, in one query
+
+    Returns:
+        dict: normalized email hash -> list of application names
+    """
+    hashes = {hash_email(email) for email in emails if email} - {None}
+    if not hashes:
+        return {}
+    rows = frappe.db.sql(
+        f"SELECT `email_hash`, `application` FROM `{EMAIL_INDEX_TABLE}` WHERE `email_hash` IN %s",
+        (tuple(hashes),)
+    )
+    matches = {}
+    for email_hash, application in rows:
+        if application != exclude:
+            matches.setdefault(email_hash, []).append(application)
+    return matches
+
+
+def check_duplicate_email(doc, method=None):
+    """
+    doc_events hook: refuse a Job Application whose normalized email is
+    already used, whichever way it is inserted
+
+    Set doc.flags.allow_duplicate to insert it anyway. Other users'
+    applications are not named, only that the email is taken.
+    """
+    if doc.email_id and not doc.flags.allow_duplicate and find_email_duplicates([doc.email_id]):
+        frappe.throw(_("An application with this email already exists"), frappe.DuplicateEntryError)
+
+
+def find_duplicates(applicant_name=None, email=None, skills=None, exclude=None, filters=None):
+    """
+    Find the existing applications an applicant duplicates
+
+    The exact check is one lookup of the email hash. The near duplicate check
+    reads the LSH buckets of the profile, so it only compares against the few
+    applications sharing a bucket instead of every row.
+
+    Args:
+        filters (dict, optional): Only report applications matching these,
+            e.g. get_job_application_filters() for the session user
+
+    Returns:
+        dict: {"exact": [names with the same normalized email],
+            "similar": [{"name", "similarity"}] of near duplicate profiles}
+    """
+    exact = find_email_duplicates([email], exclude=exclude).get(hash_email(email), []) if email else []
+    if exact and filters:
+        exact = frappe.get_all(
+            "Job Application", filters=dict(filters, name=["in", exact]), order_by="name asc", pluck="name"
+        )
+
+    shingles = get_shingles(applicant_name, skills)
+    buckets = get_band_buckets(shingles)
+    similar = []
+    if buckets:
+        candidates = frappe.db.sql(
+            f"""
+            SELECT `application`, COUNT(*) AS bands FROM `{LSH_INDEX_TABLE}`
+            WHERE {" OR ".join(["(`band` = %s AND `bucket` = %s)"] * len(buckets))}
+            GROUP BY `application`
+            ORDER BY bands DESC
+            LIMIT %s
+            """,
+            [value for bucket in buckets for value in bucket] + [MAX_CANDIDATES]
+        )
+        names = [application for application, bands in candidates if application != exclude]
+        if names:
+            profiles = frappe.get_all(
+                "Job Application",
+                filters=dict(filters or {}, name=["in", names]),
+                fields=["name", "applicant_name", "skills"]
+            )
+            for profile in profiles:
+                similarity = jaccard(shingles, get_shingles(profile.applicant_name, profile.skills))
+                if similarity >= SIMILARITY_THRESHOLD:
+                    similar.append({"name": profile.name, "similarity": round(similarity, 3)})
+            similar.sort(key=lambda match: match["similarity"], reverse=True)
+
+    return {"exact": exact, "similar": similar}
+
+
+def rebuild_duplicate_index(chunk_size=1000, verbose=False):
+    """
+    Backfill the email hash and LSH tables from every Job Application
+
+    Returns:
+        int: number of applications indexed
+    """
+    create_duplicate_index_tables()
+    if not frappe.db.table_exists("Job Application"):
+        return 0
+
+    count = 0
+    last_name = None
+    while True:
+        filters = {"name": [">", last_name]} if last_name else {}
+        rows = frappe.get_all(
+            "Job Application", filters=filters, fields=PROFILE_FIELDS, order_by="name asc", limit_page_length=chunk_size
+        )
+        if not rows:
+            break
+        index_applications(rows)
+        count += len(rows)
+        last_name = rows[-1].name
+        frappe.db.commit()
+        if verbose:
+            print(f"Indexed {count} job applications")
+
+    for table in (EMAIL_INDEX_TABLE, LSH_INDEX_TABLE):
+        frappe.db.sql(
+            f"""
+            DELETE i FROM `{table}` i
+            LEFT JOIN `tabJob Application` ja ON ja.name = i.application
+            WHERE ja.name IS NULL
+            """
+        )
+    frappe.db.commit()
+    return count
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+
+    def groups(self):
+        groups = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return [sorted(members) for members in groups.values() if len(members) > 1]
+
+
+def _shared_groups(query):
+    """Group (key, application) rows, ordered by key, into lists of applications"""
+    for key, rows in groupby(frappe.db.sql(query), key=lambda row: row[:-1]):
+        yield [row[-1] for row in rows]
+
+
+def find_duplicate_clusters(verbose=False):
+    """
+    Batch job: cluster every application with its duplicates
+
+    Applications sharing a normalized email are joined directly. Applications
+    sharing an LSH bucket are joined when their profiles are similar enough.
+    Clusters are built with union-find, so duplicates of duplicates end up
+    in one cluster. The report is kept in the cache for
+    get_duplicate_clusters.
+
+    Returns:
+        dict: {"generated": timestamp, "clusters": [{"applications", "reasons"}]}
+    """
+    clusters = UnionFind()
+    reasons = {}
+
+    for group in _shared_groups(
+        f"""
+        SELECT e.`email_hash`, e.`application` FROM `{EMAIL_INDEX_TABLE}` e
+        INNER JOIN (
+            SELECT `email_hash` FROM `{EMAIL_INDEX_TABLE}` GROUP BY `email_hash` HAVING COUNT(*) > 1
+        ) shared ON shared.`email_hash` = e.`email_hash`
+        ORDER BY e.`email_hash`
+        """
+    ):
+        for application in group[1:]:
+            clusters.union(group[0], application)
+            reasons[frozenset((group[0], application))] = "email"
+
+    candidate_pairs = set()
+    for group in _shared_groups(
+        f"""
+        SELECT l.`band`, l.`bucket`, l.`application` FROM `{LSH_INDEX_TABLE}` l
+        INNER JOIN (
+            SELECT `band`, `bucket` FROM `{LSH_INDEX_TABLE}`
+            GROUP BY `band`, `bucket` HAVING COUNT(*) > 1
+        ) shared ON shared.`band` = l.`band` AND shared.`bucket` = l.`bucket`
+        ORDER BY l.`band`, l.`bucket`, l.`application`
+        """
+    ):
+        window = len(group) if len(group) <= MAX_BUCKET_SIZE else BUCKET_WINDOW
+        for i, first in enumerate(group):
+            for second in group[i + 1:i + 1 + window]:
+                candidate_pairs.add((min(first, second), max(first, second)))
+
+    # Verify the candidate pairs against the profiles, read in chunks
+    involved = sorted({name for pair in candidate_pairs for name in pair})
+    shingles = {}
+    for start in range(0, len(involved), 1000):
+        for profile in frappe.get_all(
+            "Job Application",
+            filters={"name": ["in", involved[start:start + 1000]]},
+            fields=["name", "applicant_name", "skills"]
+        ):
+            shingles[profile.name] = get_shingles(profile.applicant_name, profile.skills)
+
+    for first, second in candidate_pairs:
+        if jaccard(shingles.get(first), shingles.get(second)) >= SIMILARITY_THRESHOLD:
+            clusters.union(first, second)
+            reasons.setdefault(frozenset((first, second)), "profile")
+
+    # Both applications of a pair are in the same cluster, so either one finds its root
+    cluster_reasons = {}
+    for pair, reason in reasons.items():
+        cluster_reasons.setdefault(clusters.find(next(iter(pair))), set()).add(reason)
+
+    report = {
+        "generated": now(),
+        "clusters": []
+    }
+    for members in clusters.groups():
+        report["clusters"].append({
+            "applications": members,
+            "reasons": sorted(cluster_reasons.get(clusters.find(members[0]), ()))
+        })
+    report["clusters"].sort(key=lambda cluster: (-len(cluster["applications"]), cluster["applications"][0]))
+
+    frappe.cache().set_value(CLUSTERS_CACHE_KEY, report)
+    if verbose:
+        print(f"Found {len(report['clusters'])} clusters of duplicate applications")
+    return report
+
+
+def enqueue_duplicate_scan():
+    frappe.enqueue(
+        "custom_app.duplicates.find_duplicate_clusters",
+        queue="long",
+        job_id="custom_app_duplicate_scan",
+        deduplicate=True,
+        enqueue_after_commit=True,
+        now=frappe.flags.in_test
+    )
+
+
+def get_cached_clusters():
+    return frappe.cache().get_value(CLUSTERS_CACHE_KEY)
@@ -0,0 +1,150 @@
+import csv
+import io
+import json
+
+import frappe
+from frappe import _
+from werkzeug.wrappers import Response
+
+from .listing import format_job_application, get_job_application_db_fields, get_list_fields
+from .permissions import get_job_application_filters
+
+EXPORT_DOCTYPES = ("Task", "Project", "Job Application")
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8"
+}
+
+# Rows written per chunk of the response body
+CHUNK_ROWS = 500
+
+
+def build_export_query(doctype, fields, filters=None):
+    """
+    Build the SELECT of an export without running it
+
+    The query goes through get_list so that role and row level permissions
+    are part of it, like the list endpoints. Job Applications are read
+    without role permissions and restricted by filters, as in
+    get_job_applications.
+
+    Returns:
+        tuple: (query, exposed fields)
+    """
+    filters = dict(filters or {})
+    fields = get_list_fields(doctype, fields)
+    db_fields = fields
+    ignore_permissions = False
+
+    if doctype == "Job Application":
+        filters.update(get_job_application_filters())
+        db_fields = get_job_application_db_fields(fields)
+        ignore_permissions = True
+
+    query = frappe.get_list(
+        doctype,
+        filters=[[field, "=", value] for field, value in filters.items()],
+        fields=db_fields,
+        order_by="modified desc, name desc",
+        limit_page_length=0,
+        ignore_permissions=ignore_permissions,
+        run=0
+    )
+    return query, fields
+
+
+def _format_row(doctype, row, fields):
+    if doctype == "Job Application":
+        return format_job_application(row, fields)
+    return {field: row.get(field) for field in fields}
+
+
+def _serialize(rows, fields, export_format):
+    if export_format == "ndjson":
+        return "".join(json.dumps(row, default=str) + "\n" for row in rows)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row.get(field) is None else row.get(field) for field in fields])
+    return buffer.getvalue()
+
+
+def iter_chunks(doctype, query, fields, export_format, chunk_rows=CHUNK_ROWS):
+    """
+    Yield the rows of an export query serialized in chunks, on the current
+    connection
+
+    Rows are read one at a time from an unbuffered cursor and only one chunk
+    is held in memory. The first row is flushed on its own so the client
+    sees bytes immediately.
+    """
+    chunk = []
+    flushed = False
+    with frappe.db.unbuffered_cursor():
+        for row in frappe.db.sql(query, as_dict=True, as_iterator=True):
+            chunk.append(_format_row(doctype, row, fields))
+            if len(chunk) >= chunk_rows or not flushed:
+                yield _serialize(chunk, fields, export_format).encode()
+                chunk = []
+                flushed = True
+    if chunk:
+        yield _serialize(chunk, fields, export_format).encode()
+
+
+def stream_rows(site, sites_path, user, doctype, query, fields, export_format, chunk_rows=CHUNK_ROWS):
+    """
+    Yield the export body in chunks
+
+    Runs after Frappe has torn down the request, so it opens its own
+    connection for the captured site and user.
+    """
+    if export_format == "csv":
+        yield _serialize([dict(zip(fields, fields))], fields, export_format).encode()
+
+    frappe.init(site=site, sites_path=sites_path)
+    frappe.connect()
+    try:
+        frappe.set_user(user)
+        yield from iter_chunks(doctype, query, fields, export_format, chunk_rows)
+    finally:
+        frappe.destroy()
+
+
+def export_response(doctype, export_format="ndjson", fields=None, filters=None):
+    """
+    Build a streamed export response of a doctype
+
+    Args:
+        doctype (str): Task, Project or Job Application
+        export_format (str): ndjson or csv
+        fields (str or list, optional): Fields to export, under the names the
+            list endpoints use
+        filters (dict, optional): Equality filters
+    """
+    if doctype not in EXPORT_DOCTYPES:
+        frappe.throw(_("Cannot export {0}").format(doctype), frappe.ValidationError)
+    if export_format not in EXPORT_FORMATS:
+        frappe.throw(_("Unsupported export format: {0}").format(export_format), frappe.ValidationError)
+
+    query, fields = build_export_query(doctype, fields, filters)
+
+    body = stream_rows(
+        frappe.local.site,
+        frappe.local.sites_path,
+        frappe.session.user,
+        doctype,
+        query,
+        fields,
+        export_format
+    )
+    extension = "csv" if export_format == "csv" else "ndjson"
+    filename = "{0}.{1}".format(frappe.scrub(doctype), extension)
+
+    response = Response(body, content_type=EXPORT_FORMATS[export_format], direct_passthrough=True)
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response.headers["Cache-Control"] = "no-store"
+    # Ask nginx to pass chunks through instead of buffering the whole body
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -56,7 +56,13 @@ app_include_css = "/assets/css/custom_app.min.css"
 # ------------
 
 # before_install = "custom_app.install.before_install"
-# after_install = "custom_app.install.after_install"
+# Patches are marked as applied on install, create the indexes and tables they add here
+after_install = [
+	"custom_app.indexes.add_composite_indexes",
+	"custom_app.search.create_search_table",
+	"custom_app.skills.create_skill_index_table",
+	"custom_app.duplicates.create_duplicate_index_tables"
+]
 
 # Desk Notifications
 # ------------------
@@ -76,6 +82,18 @@ app_include_css = "/assets/css/custom_app.min.css"
 # 	"Event": "frappe.desk.doctype.event.event.has_permission",
 # }
 
+permission_query_conditions = {
+	"Task": "custom_app.permissions.get_task_permission_query_conditions",
+	"Project": "custom_app.permissions.get_project_permission_query_conditions",
+	"Job Application": "custom_app.permissions.get_job_application_permission_query_conditions",
+}
+
+has_permission = {
+	"Task": "custom_app.permissions.has_task_permission",
+	"Project": "custom_app.permissions.has_project_permission",
+	"Job Application": "custom_app.permissions.has_job_application_permission",
+}
+
 # DocType Class
 # ---------------
 # Override standard doctype classes
@@ -96,6 +114,38 @@ app_include_css = "/assets/css/custom_app.min.css"
 #	}
 # }
 
+doc_events = {
+	"Task": {
+		"on_change": ["custom_app.cache.invalidate", "custom_app.search.update_index"],
+		"after_delete": ["custom_app.cache.invalidate", "custom_app.search.remove_from_index"]
+	},
+	"Project": {
+		"on_change": ["custom_app.cache.invalidate", "custom_app.search.update_index"],
+		"after_delete": ["custom_app.cache.invalidate", "custom_app.search.remove_from_index"]
+	},
+	"ToDo": {
+		"on_change": "custom_app.cache.invalidate_assignment",
+		"on_trash": "custom_app.cache.invalidate_assignment"
+	},
+	"Project Task": {
+		"on_change": "custom_app.cache.invalidate",
+		"after_delete": "custom_app.cache.invalidate"
+	},
+	"Job Application": {
+		"before_insert": "custom_app.duplicates.check_duplicate_email",
+		"on_change": [
+			"custom_app.cache.invalidate",
+			"custom_app.skills.update_index",
+			"custom_app.duplicates.update_index"
+		],
+		"after_delete": [
+			"custom_app.cache.invalidate",
+			"custom_app.skills.remove_from_index",
+			"custom_app.duplicates.remove_from_index"
+		]
+	}
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -169,8 +219,14 @@ user_data_fields = [
 cors_domains = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
 # Add hooks for CORS handling
-before_request = ["custom_app.middleware.setup_cors"]
-after_request = ["custom_app.middleware.add_cors_headers"]
+before_request = ["custom_app.middleware.setup_cors", "custom_app.instrumentation.start_request_instrumentation"]
+after_request = [
+	"custom_app.middleware.add_cors_headers",
+	"custom_app.middleware.apply_conditional_response",
+	"custom_app.metrics.record_request",
+	"custom_app.instrumentation.check_request_queries",
+	"custom_app.traffic.record_traffic",
+]
 
 # Register API routes
 app_include_js = "/assets/js/custom_app.min.js"
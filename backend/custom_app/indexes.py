@@ -0,0 +1,128 @@
+import frappe
+from frappe.utils import now
+
+from .listing import JOB_APPLICATION_FIELD_MAP, LIST_FIELDS
+
+# Composite indexes of the app's access paths, created by a patch on existing
+# sites and after install on new ones. Single column indexes are declared with
+# `search_index` in the doctype JSON instead.
+#   Task (project, status): get_tasks filtered by project and status, and the
+#       per project rollups
+#   Job Application (status, application_date): get_job_applications
+#       filtered by status and the dashboards sorted by application date
+COMPOSITE_INDEXES = {
+    "Task": [("project", "status")],
+    "Job Application": [("status", "application_date")]
+}
+
+# EXPLAIN access types that read every row of the table
+FULL_SCAN_TYPES = ("ALL",)
+
+
+def get_index_name(fields):
+    return "_".join(fields) + "_index"
+
+
+def add_composite_indexes():
+    """Create the composite indexes, skipping doctypes whose table does not exist"""
+    for doctype, indexes in COMPOSITE_INDEXES.items():
+        if not frappe.db.table_exists(doctype):
+            continue
+        for fields in indexes:
+            # add_index is a no-op when the index already exists
+            frappe.db.add_index(doctype, list(fields), get_index_name(fields))
+
+
+def _sample(doctype, field, filters=None):
+    """A real value of a field, so that plans reflect the actual data"""
+    value = frappe.db.get_value(doctype, dict(filters or {}, **{field: ["is", "set"]}), field)
+    return value or ""
+
+
+def _list_query(doctype, filters=None, fields=None, or_filters=None, order_by="modified desc, name desc"):
+    """The statement get_page issues for a filter combination, without running it"""
+    return frappe.get_all(
+        doctype,
+        filters=filters,
+        or_filters=or_filters,
+        fields=fields or LIST_FIELDS[doctype]["default"],
+        order_by=order_by,
+        limit_page_length=101,
+        run=0
+    )
+
+
+def get_query_shapes():
+    """
+    Build the statements the endpoints issue, with sample values
+
+    Returns:
+        list: (shape, query, values) tuples. get_all interpolates the values
+            of list queries itself, so those have none
+    """
+    project = _sample("Task", "project")
+    task = _sample("Task", "name")
+    task_status = _sample("Task", "status") or "Open"
+    modified = frappe.db.get_value("Task", task, "modified") or now()
+
+    shapes = [
+        ("get_tasks(status)", _list_query("Task", {"status": task_status}), None),
+        ("get_tasks(project)", _list_query("Task", {"project": project}), None),
+        ("get_tasks(project, status)", _list_query("Task", {"project": project, "status": task_status}), None),
+        ("get_tasks(cursor)", _list_query(
+            "Task",
+            [["modified", "<=", modified]],
+            or_filters=[["modified", "<", modified], ["name", "<", task]]
+        ), None),
+        ("tasks by end date", _list_query("Task", [["end_date", "is", "set"]], order_by="end_date asc"), None),
+        ("get_projects(status)", _list_query("Project", {"status": _sample("Project", "status") or "Open"}), None),
+        ("project rollups", """
+            SELECT pt.parent, COUNT(pt.name), SUM(CASE WHEN t.status = 'Completed' THEN 1 ELSE 0 END)
+            FROM `tabProject Task` pt
+            LEFT JOIN `tabTask` t ON t.name = pt.task
+            WHERE pt.parenttype = 'Project' AND pt.parentfield = 'tasks' AND pt.parent IN %(projects)s
+            GROUP BY pt.parent
+            """, {"projects": (_sample("Project", "name"),)}),
+        ("project task rows of a task", """
+            SELECT parent FROM `tabProject Task`
+            WHERE parenttype = 'Project' AND task = %(task)s
+            """, {"task": task})
+    ]
+
+    if frappe.db.table_exists("Job Application"):
+        fields = list(dict.fromkeys(
+            JOB_APPLICATION_FIELD_MAP[field] for field in LIST_FIELDS["Job Application"]["default"]
+        ))
+        status = _sample("Job Application", "status") or "Open"
+        shapes += [
+            ("get_job_applications(status)", _list_query("Job Application", {"status": status}, fields), None),
+            ("job applications by date", _list_query(
+                "Job Application", {"status": status}, fields, order_by="application_date desc"
+            ), None)
+        ]
+
+    return shapes
+
+
+def explain_query_shapes():
+    """
+    Run every endpoint query shape through EXPLAIN
+
+    Returns:
+        list: one dict per table access with the shape, table, access type,
+            chosen key, estimated rows and whether it is a full scan
+    """
+    report = []
+    for shape, query, values in get_query_shapes():
+        for row in frappe.db.sql(f"EXPLAIN {query}", values, as_dict=True):
+            report.append({
+                "shape": shape,
+                "table": row.get("table"),
+                "type": row.get("type"),
+                "key": row.get("key"),
+                "rows": row.get("rows"),
+                "extra": row.get("Extra"),
+                "full_scan": row.get("type") in FULL_SCAN_TYPES
+            })
+
+    return report
@@ -0,0 +1,262 @@
+import json
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+
+import frappe
+
+from .slowlog import get_threshold_ms, record_slow_query
+
+# A statement repeated more often than this within one request is reported
+# as a likely N+1 query, unless overridden by `custom_app_n_plus_one_threshold`
+N_PLUS_ONE_THRESHOLD = 5
+
+# Query budget of each endpoint per request. Reads should stay constant in
+# the number of rows they return, so these only leave room for framework
+# lookups (meta, permissions, defaults). Site config can override them with
+# `custom_app_query_budgets`.
+QUERY_BUDGETS = {
+    "custom_app.api.get_tasks": 10,
+    "custom_app.api.get_task": 10,
+    "custom_app.api.get_projects": 10,
+    "custom_app.api.get_project": 10,
+    "custom_app.api.get_job_applications": 10,
+    "custom_app.api.get_job_application": 10,
+    "custom_app.api.export_records": 10,
+    "custom_app.api.search": 10,
+    "custom_app.api.match_candidates": 10,
+    "custom_app.api.find_duplicate_applicants": 10,
+    "custom_app.routes.tasks": 25,
+    "custom_app.routes.projects": 25,
+    "custom_app.routes.project_tasks": 25,
+    "custom_app.api.create_task": 25,
+    "custom_app.api.update_task": 25,
+    "custom_app.api.patch_task": 15,
+    "custom_app.api.patch_project": 10,
+    "custom_app.api.create_tasks": 40,
+    "custom_app.api.update_tasks_bulk": 40,
+    "custom_app.api.add_tasks_to_project": 40,
+    "custom_app.api.set_project_tasks": 40
+}
+
+
+class QueryBudgetExceeded(frappe.ValidationError):
+    pass
+
+
+class NPlusOneQueryDetected(frappe.ValidationError):
+    pass
+
+
+def is_detection_enabled():
+    """N+1 detection and budgets only run in developer mode, tests or when enabled in site config"""
+    return bool(
+        frappe.conf.get("developer_mode")
+        or frappe.flags.in_test
+        or frappe.conf.get("custom_app_detect_n_plus_one")
+    )
+
+
+def fingerprint_query(query):
+    """Normalize a statement so that calls differing only in their values match"""
+    query = str(query)
+    query = re.sub(r"'(?:[^'\\]|\\.)*'", "?", query)
+    query = re.sub(r'"(?:[^"\\]|\\.)*"', "?", query)
+    query = re.sub(r"%\(\w+\)s|%s", "?", query)
+    query = re.sub(r"\b\d+(?:\.\d+)?\b", "?", query)
+    query = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(?)", query)
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+def _get_call_site():
+    """Return the app frames of the current stack, outside this module"""
+    return [
+        f"{frame.filename}:{frame.lineno} in {frame.name}"
+        for frame in traceback.extract_stack()[:-2]
+        if "custom_app" in frame.filename and not frame.filename.endswith("instrumentation.py")
+    ]
+
+
+def instrument_db(db=None):
+    """
+    Wrap frappe.db.sql of a connection to count queries and DB time
+
+    The connection object lives for one request or one test session, so does
+    the wrapper. Returns the stats object of the connection.
+    """
+    db = db or getattr(frappe.local, "db", None)
+    if not db:
+        return None
+    if getattr(db, "_custom_app_instrumented", False):
+        return frappe.local.custom_app_query_stats
+
+    stats = frappe.local.custom_app_query_stats = frappe._dict(
+        started=time.perf_counter(),
+        count=0,
+        db_time=0.0,
+        fingerprints=Counter(),
+        call_sites={}
+    )
+    detect = is_detection_enabled()
+    slow_query_seconds = get_threshold_ms() / 1000
+    original_sql = db.sql
+
+    def sql(query, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_sql(query, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stats.count += 1
+            stats.db_time += elapsed
+            if elapsed >= slow_query_seconds:
+                values = args[0] if args else kwargs.get("values")
+                record_slow_query(query, values, elapsed, original_sql)
+            if detect:
+                fingerprint = fingerprint_query(query)
+                stats.fingerprints[fingerprint] += 1
+                if fingerprint not in stats.call_sites:
+                    stats.call_sites[fingerprint] = _get_call_site()
+
+    db.sql = sql
+    db._custom_app_instrumented = True
+    return stats
+
+
+def start_request_instrumentation():
+    """
+    Instrument frappe.db.sql for the current request, called at the start of
+    each request
+    """
+    instrument_db()
+
+
+def get_request_stats():
+    """Return wall time, query count and DB time of the current request so far"""
+    stats = getattr(frappe.local, "custom_app_query_stats", None)
+    if not stats:
+        return None
+
+    return frappe._dict(
+        wall_time=time.perf_counter() - stats.started,
+        query_count=stats.count,
+        db_time=stats.db_time
+    )
+
+
+def get_request_method(request=None):
+    """Return the whitelisted method of an /api/method/ request, if any"""
+    request = request or frappe.request
+    if not request:
+        return None
+
+    path = request.path or ""
+    if path.startswith("/api/method/"):
+        return path[len("/api/method/"):].strip("/")
+
+    return frappe.form_dict.get("cmd")
+
+
+def is_app_method(method):
+    """
+    Only whitelisted endpoints of this app are instrumented
+
+    The method comes from the request path, so made up names are rejected:
+    they would otherwise become metric labels and Redis keys.
+    """
+    if not method or not method.startswith(("custom_app.api.", "custom_app.routes.")):
+        return False
+    return any(f"{fn.__module__}.{fn.__name__}" == method for fn in frappe.whitelisted)
+
+
+def get_query_budget(method):
+    """Return the query budget of an endpoint, if it declares one"""
+    budgets = dict(QUERY_BUDGETS, **(frappe.conf.get("custom_app_query_budgets") or {}))
+    return budgets.get(method)
+
+
+def find_repeated_queries(fingerprints, call_sites, threshold=None):
+    """
+    Return the statements repeated more often than the threshold
+
+    Returns:
+        list: dicts with the normalized statement, its count and first call site
+    """
+    threshold = threshold or frappe.conf.get("custom_app_n_plus_one_threshold") or N_PLUS_ONE_THRESHOLD
+    return [
+        {"query": fingerprint, "count": count, "call_site": call_sites.get(fingerprint, [])}
+        for fingerprint, count in fingerprints.most_common()
+        if count > threshold
+    ]
+
+
+def check_request_queries(response=None, request=None):
+    """
+    Report N+1 patterns and query budget overruns of app endpoints, called at
+    the end of each request in developer and test mode
+    """
+    if not is_detection_enabled():
+        return
+
+    method = get_request_method(request)
+    stats = getattr(frappe.local, "custom_app_query_stats", None)
+    if not is_app_method(method) or not stats:
+        return
+
+    logger = frappe.logger("custom_app.queries")
+
+    for repeated in find_repeated_queries(stats.fingerprints, stats.call_sites):
+        logger.warning(json.dumps(dict(repeated, method=method, type="n_plus_one")))
+
+    budget = get_query_budget(method)
+    if budget and stats.count > budget:
+        logger.error(json.dumps({
+            "type": "query_budget_exceeded",
+            "method": method,
+            "budget": budget,
+            "count": stats.count
+        }))
+
+
+@contextmanager
+def query_budget(limit=None, method=None, detect_n_plus_one=True):
+    """
+    Fail the wrapped block when it issues more queries than its budget
+
+    For tests: the budget is either given directly or taken from the declared
+    budget of an endpoint.
+
+        with query_budget(method="custom_app.api.get_projects"):
+            get_projects()
+
+    Raises:
+        RuntimeError: There is no database connection to count queries on
+        QueryBudgetExceeded: More queries than the budget were issued
+        NPlusOneQueryDetected: A statement was repeated beyond the N+1 threshold
+    """
+    limit = limit or get_query_budget(method)
+    stats = instrument_db()
+    if stats is None:
+        raise RuntimeError("query_budget needs a database connection, call frappe.connect() first")
+
+    count_before = stats.count
+    fingerprints_before = Counter(stats.fingerprints)
+    yield stats
+
+    count = stats.count - count_before
+    if limit and count > limit:
+        raise QueryBudgetExceeded(
+            f"{method or 'Block'} issued {count} queries, budget is {limit}"
+        )
+
+    if detect_n_plus_one:
+        repeated = find_repeated_queries(stats.fingerprints - fingerprints_before, stats.call_sites)
+        if repeated:
+            worst = repeated[0]
+            raise NPlusOneQueryDetected(
+                "Statement repeated {0} times: {1}\n{2}".format(
+                    worst["count"], worst["query"], "\n".join(worst["call_site"])
+                )
+            )
@@ -0,0 +1,182 @@
+import base64
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+# Upper bound for a single page, whatever the client asks for
+MAX_PAGE_LENGTH = 500
+
+# Fields each list endpoint may return. `default` is the lean projection used
+# when the client does not ask for anything; heavy text columns such as
+# Task.description and Task.details are only returned on request
+LIST_FIELDS = {
+    "Task": {
+        "allowed": ["name", "title", "status", "priority", "project", "start_date", "end_date",
+                    "duration", "estimated_effort", "timeline", "complexity", "progress",
+                    "modified", "description", "details"],
+        "default": ["name", "title", "status", "priority", "start_date", "end_date", "project"]
+    },
+    "Project": {
+        "allowed": ["name", "title", "status", "priority", "start_date", "end_date", "task_count",
+                    "completed_count", "progress", "modified", "description"],
+        "default": ["name", "title", "status", "start_date", "end_date", "task_count", "progress"]
+    },
+    "Job Application": {
+        "allowed": ["name", "title", "applicant_name", "email", "status", "position", "department",
+                    "apply_date", "resume_link", "skills", "experience"],
+        "default": ["name", "title", "applicant_name", "email", "status", "position", "department",
+                    "apply_date", "resume_link", "skills"]
+    }
+}
+
+# Job Application fields are exposed under the names the frontend expects
+JOB_APPLICATION_FIELD_MAP = {
+    "name": "name",
+    "title": "job_title",
+    "applicant_name": "applicant_name",
+    "email": "email_id",
+    "status": "status",
+    "position": "job_title",
+    "department": "department",
+    "apply_date": "application_date",
+    "resume_link": "resume_attachment",
+    "skills": "skills",
+    "experience": "custom_experience"
+}
+
+
+def get_list_fields(doctype, fields=None):
+    """
+    Resolve the projection requested by a list endpoint
+
+    Args:
+        doctype (str): DocType of the list
+        fields (str or list, optional): JSON list or comma separated field names
+
+    Returns:
+        list: The requested fields, or the lean default when none are given
+    """
+    config = LIST_FIELDS[doctype]
+    if not fields:
+        return list(config["default"])
+
+    if isinstance(fields, str):
+        fields = fields.strip()
+        if fields.startswith("["):
+            fields = frappe.parse_json(fields)
+        else:
+            fields = fields.split(",")
+
+    fields = [field.strip() for field in fields if field and field.strip()]
+
+    invalid = [field for field in fields if field not in config["allowed"]]
+    if invalid:
+        frappe.throw(
+            _("Fields not allowed for {0}: {1}").format(doctype, ", ".join(invalid)),
+            frappe.ValidationError
+        )
+
+    # name is always returned so rows can be addressed
+    if "name" not in fields:
+        fields.insert(0, "name")
+
+    # Drop duplicates while keeping the requested order
+    return list(dict.fromkeys(fields))
+
+
+def get_job_application_db_fields(fields):
+    """Map the exposed Job Application fields to the underlying columns"""
+    return list(dict.fromkeys(JOB_APPLICATION_FIELD_MAP[field] for field in fields))
+
+
+def format_job_application(row, fields):
+    """Format a Job Application row under the names the frontend expects"""
+    formatted = {field: row.get(JOB_APPLICATION_FIELD_MAP[field]) for field in fields}
+    if "skills" in formatted:
+        formatted["skills"] = formatted["skills"] or ""
+    return formatted
+
+
+def encode_cursor(row):
+    """Build an opaque cursor from the (modified, name) of the last row of a page"""
+    payload = json.dumps([str(row.modified), row.name])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return the (modified, name) pair stored in a cursor"""
+    try:
+        modified, name = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        frappe.throw(_("Invalid cursor"), frappe.ValidationError)
+    return modified, name
+
+
+def get_page(doctype, filters=None, fields=None, limit=None, cursor=None, ignore_permissions=False):
+    """
+    Get one page of a doctype ordered by (modified, name), newest first
+
+    Keyset pagination: the next page starts strictly after the last row of
+    the previous one, so deep pages cost the same as the first page. When a
+    limit is given the cursor of the following page is returned to the client
+    as `next_cursor` next to `message`, or None on the last page. Without a
+    limit and cursor all matching rows are returned, as before.
+
+    Args:
+        doctype (str): DocType to read
+        filters (dict, optional): Equality filters
+        fields (list): Fields to select
+        limit (int, optional): Page size, capped at MAX_PAGE_LENGTH
+        cursor (str, optional): `next_cursor` of the previous page
+        ignore_permissions (bool, optional): Skip role and row level permission
+            conditions, which are otherwise applied in the query
+    """
+    filters = [[field, "=", value] for field, value in (filters or {}).items()]
+    fields = list(fields or ["name"])
+    or_filters = None
+
+    if not limit and not cursor:
+        return frappe.get_list(
+            doctype,
+            filters=filters,
+            fields=fields,
+            limit_page_length=0,
+            ignore_permissions=ignore_permissions
+        )
+
+    limit = max(1, min(cint(limit) or MAX_PAGE_LENGTH, MAX_PAGE_LENGTH))
+
+    if cursor:
+        # (modified, name) < (cursor_modified, cursor_name), written so the
+        # database can still walk the modified index
+        modified, name = decode_cursor(cursor)
+        filters.append(["modified", "<=", modified])
+        or_filters = [["modified", "<", modified], ["name", "<", name]]
+
+    # The cursor is built from modified and name, fetch them even if the
+    # caller did not ask for them
+    extra_fields = [field for field in ("modified", "name") if field not in fields]
+
+    rows = frappe.get_list(
+        doctype,
+        filters=filters,
+        or_filters=or_filters,
+        fields=fields + extra_fields,
+        order_by="modified desc, name desc",
+        limit_page_length=limit + 1,
+        ignore_permissions=ignore_permissions
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+
+    for row in rows:
+        for field in extra_fields:
+            row.pop(field, None)
+
+    frappe.local.response["next_cursor"] = next_cursor
+    return rows
@@ -0,0 +1,153 @@
+import frappe
+from werkzeug.wrappers import Response
+
+from .instrumentation import get_request_method, get_request_stats, is_app_method
+
+# Histogram bucket upper bounds of each recorded metric
+METRICS = {
+    "request_duration_seconds": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    "db_queries": (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+    "db_duration_seconds": (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+    "response_bytes": (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+}
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+METHODS_KEY = "custom_app:metrics:methods"
+
+
+def _metric_key(metric, method):
+    return frappe.cache().make_key(f"custom_app:metrics:{metric}:{method}")
+
+
+def _bucket_for(value, bounds):
+    for bound in bounds:
+        if value <= bound:
+            return str(bound)
+    return "+Inf"
+
+
+def record_request(response=None, request=None):
+    """
+    Record latency, query count, DB time and response size of app endpoints
+    into Redis histograms, called at the end of each request
+    """
+    if frappe.conf.get("custom_app_disable_metrics"):
+        return
+
+    method = get_request_method(request)
+    stats = get_request_stats()
+    if not is_app_method(method) or not stats:
+        return
+
+    response_bytes = 0
+    if response is not None and not response.is_streamed:
+        response_bytes = response.calculate_content_length() or 0
+
+    values = {
+        "request_duration_seconds": stats.wall_time,
+        "db_queries": stats.query_count,
+        "db_duration_seconds": stats.db_time,
+        "response_bytes": response_bytes
+    }
+
+    # RedisWrapper pickles hash values, write the counters through a raw pipeline
+    pipeline = frappe.cache().pipeline()
+    pipeline.sadd(frappe.cache().make_key(METHODS_KEY), method)
+    for metric, value in values.items():
+        key = _metric_key(metric, method)
+        pipeline.hincrby(key, _bucket_for(value, METRICS[metric]), 1)
+        pipeline.hincrbyfloat(key, "sum", value)
+        pipeline.hincrby(key, "count", 1)
+    pipeline.execute()
+
+
+def get_histograms():
+    """
+    Read every recorded histogram
+
+    Returns:
+        dict: method -> metric -> {"buckets": [(bound, count)], "sum": float, "count": int}
+    """
+    methods = sorted(
+        method.decode() if isinstance(method, bytes) else method
+        for method in frappe.cache().pipeline().smembers(frappe.cache().make_key(METHODS_KEY)).execute()[0]
+    )
+
+    pipeline = frappe.cache().pipeline()
+    for method in methods:
+        for metric in METRICS:
+            pipeline.hgetall(_metric_key(metric, method))
+    results = iter(pipeline.execute())
+
+    histograms = {}
+    for method in methods:
+        histograms[method] = {}
+        for metric, bounds in METRICS.items():
+            raw = {
+                (key.decode() if isinstance(key, bytes) else key): float(value)
+                for key, value in next(results).items()
+            }
+            histograms[method][metric] = {
+                "buckets": [(bound, int(raw.get(str(bound), 0))) for bound in bounds]
+                + [("+Inf", int(raw.get("+Inf", 0)))],
+                "sum": raw.get("sum", 0.0),
+                "count": int(raw.get("count", 0))
+            }
+
+    return histograms
+
+
+def estimate_quantile(histogram, quantile):
+    """Estimate a quantile from bucket counts by interpolating inside the bucket"""
+    total = histogram["count"]
+    if not total:
+        return 0
+
+    rank = quantile * total
+    seen = 0
+    lower = 0
+    for bound, count in histogram["buckets"]:
+        if count and seen + count >= rank:
+            if bound == "+Inf":
+                return lower
+            return lower + (bound - lower) * ((rank - seen) / count)
+        seen += count
+        if bound != "+Inf":
+            lower = bound
+
+    return lower
+
+
+def _format_labels(labels):
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+@frappe.whitelist()
+def scrape():
+    """
+    Expose endpoint metrics in the Prometheus text format
+    """
+    frappe.only_for("System Manager")
+
+    lines = []
+    histograms = get_histograms()
+    for metric in METRICS:
+        name = f"custom_app_{metric}"
+        lines.append(f"# TYPE {name} histogram")
+        for method, metrics in histograms.items():
+            histogram = metrics[metric]
+            cumulative = 0
+            for bound, count in histogram["buckets"]:
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels({'method': method, 'le': bound})} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels({'method': method})} {histogram['sum']}")
+            lines.append(f"{name}_count{_format_labels({'method': method})} {histogram['count']}")
+
+        lines.append(f"# TYPE {name}_quantile gauge")
+        for method, metrics in histograms.items():
+            for quantile in QUANTILES:
+                value = estimate_quantile(metrics[metric], quantile)
+                lines.append(f"{name}_quantile{_format_labels({'method': method, 'quantile': quantile})} {value}")
+
+    return Response("\n".join(lines) + "\n", content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -62,4 +62,22 @@ def add_cors_headers():
         frappe.local.response.headers["Access-Control-Allow-Origin"] = origin
         frappe.local.response.headers["Access-Control-Allow-Credentials"] = "true"
         frappe.local.response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS, PATCH"
-        frappe.local.response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, X-Requested-With, Accept, Origin, If-None-Match" 
\ No newline at end of file
+        frappe.local.response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, X-Requested-With, Accept, Origin, If-None-Match"
+
+def apply_conditional_response(response=None, request=None):
+    """
+    Add the ETag of collection responses and turn fresh ones into 304s,
+    called at the end of each request
+    """
+    etag = frappe.flags.get("custom_app_etag")
+    if not etag or response is None:
+        return
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Access-Control-Expose-Headers"] = "ETag"
+
+    if frappe.flags.get("custom_app_not_modified"):
+        # No rows were built for this request, drop the placeholder body
+        response.status_code = 304
+        response.set_data(b"")
@@ -0,0 +1,6 @@
+from custom_app.indexes import add_composite_indexes
+
+
+def execute():
+    """Create the composite indexes of the app's access paths"""
+    add_composite_indexes()
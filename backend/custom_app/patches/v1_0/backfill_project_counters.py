@@ -0,0 +1,6 @@
+from custom_app.rollups import repair_project_counters
+
+
+def execute():
+    """Populate the stored task counters of existing projects"""
+    repair_project_counters()
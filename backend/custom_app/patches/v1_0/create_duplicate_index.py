@@ -0,0 +1,6 @@
+from custom_app.duplicates import rebuild_duplicate_index
+
+
+def execute():
+    """Create the duplicate detection tables and index existing job applications"""
+    rebuild_duplicate_index()
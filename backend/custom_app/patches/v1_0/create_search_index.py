@@ -0,0 +1,6 @@
+from custom_app.search import rebuild_search_index
+
+
+def execute():
+    """Create the full-text search table and index existing tasks and projects"""
+    rebuild_search_index()
@@ -0,0 +1,6 @@
+from custom_app.skills import rebuild_skill_index
+
+
+def execute():
+    """Create the skill index table and index existing job applications"""
+    rebuild_skill_index()
@@ -0,0 +1,9 @@
+from custom_app.duplicates import rebuild_duplicate_index
+from custom_app.skills import rebuild_skill_index
+
+
+def execute():
+    """Reindex skills after slashed skills, .NET and versions got their own tokens"""
+    rebuild_skill_index()
+    # Duplicate detection signatures include the normalized skills
+    rebuild_duplicate_index()
@@ -0,0 +1,151 @@
+import frappe
+
+# Roles that see every Task and Project
+TASK_FULL_ACCESS_ROLES = {"Administrator", "System Manager", "Task Manager"}
+
+# Roles that see every Job Application
+JOB_APPLICATION_FULL_ACCESS_ROLES = {"Administrator", "System Manager", "HR Manager", "HR User"}
+
+
+def _get_roles(user=None):
+    return set(frappe.get_roles(user or frappe.session.user))
+
+
+def _memoized(key, compute):
+    """Memoize a permission decision for the rest of the request"""
+    cache = getattr(frappe.local, "custom_app_permissions", None)
+    if cache is None:
+        cache = frappe.local.custom_app_permissions = {}
+    if key not in cache:
+        cache[key] = compute()
+    return cache[key]
+
+
+def has_permission(doctype, ptype="read", name=None, user=None):
+    """
+    frappe.has_permission, memoized per user and role set for the request
+
+    Endpoints check the same doctype level permission several times per
+    request, and bulk endpoints once per row.
+    """
+    user = user or frappe.session.user
+    key = ("has_permission", user, tuple(sorted(_get_roles(user))), doctype, ptype, name)
+    return _memoized(key, lambda: frappe.has_permission(doctype, ptype, name, user=user))
+
+
+def _task_condition(user):
+    escaped_user = frappe.db.escape(user)
+    assigned = frappe.db.escape(f'%"{user}"%')
+    return f"(`tabTask`.owner = {escaped_user} OR `tabTask`._assign LIKE {assigned})"
+
+
+def get_task_permission_query_conditions(user=None):
+    """Task Users only see tasks they own or are assigned to"""
+    user = user or frappe.session.user
+    key = ("conditions", "Task", user, tuple(sorted(_get_roles(user))))
+
+    def compute():
+        if _get_roles(user) & TASK_FULL_ACCESS_ROLES:
+            return ""
+        return _task_condition(user)
+
+    return _memoized(key, compute)
+
+
+def get_project_permission_query_conditions(user=None):
+    """Task Users only see projects they own or that contain a task they can see"""
+    user = user or frappe.session.user
+    key = ("conditions", "Project", user, tuple(sorted(_get_roles(user))))
+
+    def compute():
+        if _get_roles(user) & TASK_FULL_ACCESS_ROLES:
+            return ""
+        return f"""(`tabProject`.owner = {frappe.db.escape(user)} OR EXISTS (
+            SELECT 1 FROM `tabProject Task`
+            INNER JOIN `tabTask` ON `tabTask`.name = `tabProject Task`.task
+            WHERE `tabProject Task`.parent = `tabProject`.name
+                AND `tabProject Task`.parenttype = 'Project'
+                AND {_task_condition(user)}
+        ))"""
+
+    return _memoized(key, compute)
+
+
+def get_job_application_permission_query_conditions(user=None):
+    """Users without an HR role only see the applications they created"""
+    user = user or frappe.session.user
+    key = ("conditions", "Job Application", user, tuple(sorted(_get_roles(user))))
+
+    def compute():
+        if _get_roles(user) & JOB_APPLICATION_FULL_ACCESS_ROLES:
+            return ""
+        return f"(`tabJob Application`.owner = {frappe.db.escape(user)})"
+
+    return _memoized(key, compute)
+
+
+def get_job_application_filters(user=None):
+    """
+    Filters equivalent to the Job Application conditions
+
+    The job application endpoints read with ignore_permissions, so the row
+    restriction is applied as a plain filter.
+    """
+    user = user or frappe.session.user
+    if _get_roles(user) & JOB_APPLICATION_FULL_ACCESS_ROLES:
+        return {}
+    return {"owner": user}
+
+
+PERMISSION_QUERY_CONDITIONS = {
+    "Task": get_task_permission_query_conditions,
+    "Project": get_project_permission_query_conditions,
+    "Job Application": get_job_application_permission_query_conditions
+}
+
+
+def get_permission_query_conditions(doctype, user=None):
+    """Return the row level SQL condition of a doctype for a user"""
+    return PERMISSION_QUERY_CONDITIONS[doctype](user)
+
+
+def has_task_permission(doc, ptype=None, user=None):
+    """has_permission hook: row level check matching get_task_permission_query_conditions"""
+    user = user or frappe.session.user
+    if _get_roles(user) & TASK_FULL_ACCESS_ROLES:
+        return True
+
+    key = ("doc", "Task", user, doc.name)
+    return _memoized(key, lambda: doc.owner == user or user in frappe.parse_json(doc.get("_assign") or "[]"))
+
+
+def has_project_permission(doc, ptype=None, user=None):
+    """has_permission hook: row level check matching get_project_permission_query_conditions"""
+    user = user or frappe.session.user
+    if _get_roles(user) & TASK_FULL_ACCESS_ROLES:
+        return True
+
+    def compute():
+        if doc.owner == user:
+            return True
+        return bool(frappe.db.sql(
+            f"""
+            SELECT 1 FROM `tabProject Task`
+            INNER JOIN `tabTask` ON `tabTask`.name = `tabProject Task`.task
+            WHERE `tabProject Task`.parent = %s
+                AND `tabProject Task`.parenttype = 'Project'
+                AND {_task_condition(user)}
+            LIMIT 1
+            """,
+            doc.name
+        ))
+
+    return _memoized(("doc", "Project", user, doc.name), compute)
+
+
+def has_job_application_permission(doc, ptype=None, user=None):
+    """has_permission hook: row level check matching get_job_application_permission_query_conditions"""
+    user = user or frappe.session.user
+    if _get_roles(user) & JOB_APPLICATION_FULL_ACCESS_ROLES:
+        return True
+    return doc.owner == user
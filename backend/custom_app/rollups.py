@@ -0,0 +1,509 @@
+import time
+from datetime import datetime, timedelta
+
+import frappe
+from frappe.utils import getdate, now
+
+from .cache import bump_generation
+
+
+# Task fields copied onto the Project Task rows, keyed by their child column
+PROJECT_TASK_FIELDS = {
+    "task_title": "title",
+    "status": "status",
+    "priority": "priority",
+    "start_date": "start_date",
+    "end_date": "end_date"
+}
+
+
+def get_task_rollups(projects):
+    """
+    Get task count and completed count for a list of projects in one query
+
+    Args:
+        projects (list): Project names to aggregate
+
+    Returns:
+        dict: project name -> {"task_count": int, "completed_count": int}
+    """
+    if not projects:
+        return {}
+
+    rows = frappe.db.sql(
+        """
+        SELECT
+            pt.parent AS project,
+            COUNT(pt.name) AS task_count,
+            SUM(CASE WHEN t.status = 'Completed' THEN 1 ELSE 0 END) AS completed_count
+        FROM `tabProject Task` pt
+        LEFT JOIN `tabTask` t ON t.name = pt.task
+        WHERE pt.parenttype = 'Project'
+            AND pt.parentfield = 'tasks'
+            AND pt.parent IN %(projects)s
+        GROUP BY pt.parent
+        """,
+        {"projects": tuple(projects)},
+        as_dict=True,
+    )
+
+    return {
+        row.project: {
+            "task_count": int(row.task_count or 0),
+            "completed_count": int(row.completed_count or 0),
+        }
+        for row in rows
+    }
+
+
+def get_project_status(status, task_count, completed_count):
+    """
+    The status of a project given its task counters, as Project.validate sets it
+
+    Every task completed makes it Completed, any completed task Active. Other
+    projects keep the given status.
+    """
+    if task_count and completed_count == task_count:
+        return "Completed"
+    if completed_count:
+        return "Active"
+    return status
+
+
+def calculate_progress(task_count, completed_count):
+    """Return the completion percentage for a project"""
+    if not task_count:
+        return 0
+    return (completed_count / task_count) * 100
+
+
+def apply_task_delta(project, task_delta=0, completed_delta=0):
+    """
+    Adjust the stored task counters of a project by a delta in a single UPDATE
+
+    Progress and the completion based status are derived from the new counter
+    values in the same statement, mirroring Project.update_project_status.
+
+    Args:
+        project (str): Project name
+        task_delta (int): Change in the number of linked tasks
+        completed_delta (int): Change in the number of completed linked tasks
+    """
+    if not project or (not task_delta and not completed_delta):
+        return
+
+    # MariaDB evaluates single-table UPDATE assignments left to right, so
+    # progress and status see the already adjusted counters
+    frappe.db.sql(
+        """
+        UPDATE `tabProject`
+        SET
+            task_count = GREATEST(task_count + %(task_delta)s, 0),
+            completed_count = LEAST(GREATEST(completed_count + %(completed_delta)s, 0), task_count),
+            progress = IF(task_count > 0, completed_count * 100 / task_count, 0),
+            status = CASE
+                WHEN task_count > 0 AND completed_count = task_count THEN 'Completed'
+                WHEN completed_count > 0 THEN 'Active'
+                ELSE status
+            END
+        WHERE name = %(project)s
+        """,
+        {"project": project, "task_delta": task_delta, "completed_delta": completed_delta},
+    )
+    bump_generation("Project")
+
+
+def repair_project_counters(chunk_size=500, verbose=False):
+    """
+    Recompute the stored task counters of every project in chunks
+
+    Projects are walked in name order so each chunk costs one aggregate query,
+    whatever the size of the table. Any project whose stored counters differ
+    from the recomputed values is corrected and reported.
+
+    Args:
+        chunk_size (int): Number of projects per chunk
+        verbose (bool): Print each drifted project as it is repaired
+
+    Returns:
+        dict: {"checked": int, "drifted": list of dicts}
+    """
+    chunk_size = int(chunk_size)
+    checked = 0
+    drifted = []
+    last_name = ""
+
+    while True:
+        projects = frappe.get_all(
+            "Project",
+            filters={"name": [">", last_name]},
+            fields=["name", "task_count", "completed_count", "progress"],
+            order_by="name asc",
+            limit_page_length=chunk_size
+        )
+        if not projects:
+            break
+
+        rollups = get_task_rollups([project.name for project in projects])
+        for project in projects:
+            rollup = rollups.get(project.name, {"task_count": 0, "completed_count": 0})
+            expected_progress = calculate_progress(rollup["task_count"], rollup["completed_count"])
+
+            if (
+                (project.task_count or 0) != rollup["task_count"]
+                or (project.completed_count or 0) != rollup["completed_count"]
+                or abs((project.progress or 0) - expected_progress) > 0.01
+            ):
+                drift = {
+                    "project": project.name,
+                    "stored": {
+                        "task_count": project.task_count or 0,
+                        "completed_count": project.completed_count or 0,
+                        "progress": project.progress or 0
+                    },
+                    "expected": {
+                        "task_count": rollup["task_count"],
+                        "completed_count": rollup["completed_count"],
+                        "progress": expected_progress
+                    }
+                }
+                drifted.append(drift)
+                if verbose:
+                    print(f"Drift in {project.name}: {drift['stored']} -> {drift['expected']}")
+
+                frappe.db.set_value(
+                    "Project",
+                    project.name,
+                    drift["expected"],
+                    update_modified=False
+                )
+                bump_generation("Project")
+
+        checked += len(projects)
+        last_name = projects[-1].name
+        frappe.db.commit()
+
+    return {"checked": checked, "drifted": drifted}
+
+
+def append_project_tasks(project, tasks):
+    """
+    Link already saved tasks to a project without loading or saving it
+
+    Inserts the Project Task rows in one statement, then moves the stored
+    counters, status and dates of the project by the appended tasks.
+
+    Args:
+        project (str): Project name
+        tasks (list): Dicts with name, title, status, priority, start_date and end_date
+    """
+    if not tasks:
+        return
+
+    last_idx = frappe.db.sql(
+        """
+        SELECT MAX(idx) FROM `tabProject Task`
+        WHERE parent = %s AND parenttype = 'Project' AND parentfield = 'tasks'
+        """,
+        project,
+    )[0][0] or 0
+
+    timestamp = now()
+    user = frappe.session.user
+    values = []
+    for offset, task in enumerate(tasks, start=1):
+        values.append((
+            frappe.generate_hash(length=10), timestamp, timestamp, user, user, 0,
+            project, "Project", "tasks", last_idx + offset,
+            task["name"], task.get("title"), task.get("status"), task.get("priority"),
+            task.get("start_date"), task.get("end_date")
+        ))
+
+    frappe.db.bulk_insert(
+        "Project Task",
+        fields=["name", "creation", "modified", "owner", "modified_by", "docstatus",
+                "parent", "parenttype", "parentfield", "idx",
+                "task", "task_title", "status", "priority", "start_date", "end_date"],
+        values=values
+    )
+
+    completed = sum(1 for task in tasks if task.get("status") == "Completed")
+    apply_task_delta(project, task_delta=len(tasks), completed_delta=completed)
+
+    start_dates = [getdate(task["start_date"]) for task in tasks if task.get("start_date")]
+    end_dates = [getdate(task["end_date"]) for task in tasks if task.get("end_date")]
+    extend_project_dates(
+        project,
+        min(start_dates) if start_dates else None,
+        max(end_dates) if end_dates else None
+    )
+
+
+def extend_project_dates(project, earliest_start=None, latest_end=None):
+    """Widen the project dates to cover the given task dates, like Project.update_project_dates"""
+    if not earliest_start and not latest_end:
+        return
+
+    frappe.db.sql(
+        """
+        UPDATE `tabProject`
+        SET
+            start_date = CASE
+                WHEN %(start)s IS NOT NULL AND (start_date IS NULL OR start_date > %(start)s) THEN %(start)s
+                ELSE start_date
+            END,
+            end_date = CASE
+                WHEN %(end)s IS NOT NULL AND (end_date IS NULL OR end_date < %(end)s) THEN %(end)s
+                ELSE end_date
+            END
+        WHERE name = %(project)s
+        """,
+        {"project": project, "start": earliest_start, "end": latest_end},
+    )
+    bump_generation("Project")
+
+
+def recompute_project_rollups(project):
+    """
+    Recompute counters, status and dates of a project with set-based queries
+
+    Applies the same rules as Project.validate without loading the project
+    and its task rows.
+    """
+    rollup = frappe.db.sql(
+        """
+        SELECT
+            COUNT(pt.name) AS task_count,
+            SUM(CASE WHEN t.status = 'Completed' THEN 1 ELSE 0 END) AS completed_count,
+            MIN(t.start_date) AS earliest_start,
+            MAX(t.end_date) AS latest_end
+        FROM `tabProject Task` pt
+        LEFT JOIN `tabTask` t ON t.name = pt.task
+        WHERE pt.parenttype = 'Project'
+            AND pt.parentfield = 'tasks'
+            AND pt.parent = %s
+        """,
+        project,
+        as_dict=True,
+    )[0]
+
+    current = frappe.db.get_value("Project", project, ["status", "start_date", "end_date"], as_dict=True)
+    if not current:
+        return
+
+    task_count = int(rollup.task_count or 0)
+    completed_count = int(rollup.completed_count or 0)
+    values = {
+        "task_count": task_count,
+        "completed_count": completed_count,
+        "progress": calculate_progress(task_count, completed_count)
+    }
+
+    status = get_project_status(current.status, task_count, completed_count)
+    if status != current.status:
+        values["status"] = status
+
+    if rollup.earliest_start and (not current.start_date or current.start_date > rollup.earliest_start):
+        values["start_date"] = rollup.earliest_start
+    if rollup.latest_end and (not current.end_date or current.end_date < rollup.latest_end):
+        values["end_date"] = rollup.latest_end
+
+    frappe.db.set_value("Project", project, values, update_modified=False)
+    bump_generation("Project")
+
+
+# Edits to one project within this window are folded into a single recompute
+ROLLUP_DEBOUNCE_SECONDS = 2
+
+# A pending marker older than this belongs to a lost job and is replaced
+ROLLUP_PENDING_TTL = 300
+
+ROLLUP_QUEUE = "short"
+
+
+# Redis hash of project -> time its pending rollup job was scheduled
+PENDING_ROLLUPS_KEY = "custom_app:pending_project_rollups"
+
+# Redis hash of project -> time of its last committed edit
+LAST_EDITS_KEY = "custom_app:project_rollup_edits"
+
+
+def _schedule_project_rollup(project):
+    """Queue the rollup job of a project to run once the debounce window has passed"""
+    from frappe.utils.background_jobs import execute_job, get_queue
+
+    frappe.cache().hset(PENDING_ROLLUPS_KEY, project, time.time())
+    # Delayed jobs wait in the RQ scheduled registry instead of holding a worker
+    get_queue(ROLLUP_QUEUE).enqueue_in(
+        timedelta(seconds=ROLLUP_DEBOUNCE_SECONDS),
+        execute_job,
+        kwargs={
+            "site": frappe.local.site,
+            "user": frappe.session.user,
+            "method": "custom_app.rollups.run_project_rollup",
+            "event": None,
+            "job_name": "custom_app.rollups.run_project_rollup",
+            "is_async": True,
+            "kwargs": {"project": project}
+        }
+    )
+
+
+def _mark_project_edited(project):
+    """
+    After commit: record the edit, and schedule a rollup job unless one is
+    already pending
+
+    The edit is recorded before the marker is read, and the job drops the
+    marker before it compares the edit time, so every edit is either seen by
+    the job or schedules a new one.
+    """
+    cache = frappe.cache()
+    cache.hset(LAST_EDITS_KEY, project, time.time())
+
+    pending_since = cache.hget(PENDING_ROLLUPS_KEY, project)
+    if pending_since and time.time() - pending_since < ROLLUP_PENDING_TTL:
+        return
+    _schedule_project_rollup(project)
+
+
+def enqueue_project_rollup(project):
+    """
+    Schedule a background recompute of a project's rollups
+
+    Nothing happens until the transaction commits, so a rolled back edit
+    neither queues a job nor leaves a marker behind. Only the first committed
+    edit of a project queues a job; later edits are covered by it.
+    """
+    if not project:
+        return
+
+    if frappe.flags.in_test:
+        frappe.enqueue("custom_app.rollups.run_project_rollup", project=project, now=True)
+        return
+
+    frappe.db.after_commit.add(lambda: _mark_project_edited(project))
+
+
+def run_project_rollup(project):
+    """
+    Background job: recompute a project's rollups
+
+    An edit committed while the job ran may not be part of what it read; the
+    job then queues itself again.
+    """
+    cache = frappe.cache()
+    edited_at = cache.hget(LAST_EDITS_KEY, project)
+
+    recompute_project_rollups(project)
+    frappe.db.commit()
+
+    # Edits from here on queue a new job
+    cache.hdel(PENDING_ROLLUPS_KEY, project)
+    last_edited_at = cache.hget(LAST_EDITS_KEY, project)
+    if last_edited_at != edited_at:
+        _schedule_project_rollup(project)
+    else:
+        cache.hdel(LAST_EDITS_KEY, project)
+
+
+@frappe.whitelist()
+def get_rollup_queue_stats():
+    """
+    Get the depth and lag of the background rollup queue
+    """
+    frappe.only_for("System Manager")
+
+    from frappe.utils.background_jobs import get_queue
+
+    queue = get_queue(ROLLUP_QUEUE)
+    oldest_job_age = 0
+    job_ids = queue.get_job_ids(0, 1)
+    if job_ids:
+        job = queue.fetch_job(job_ids[0])
+        if job and job.enqueued_at:
+            oldest_job_age = (datetime.utcnow() - job.enqueued_at).total_seconds()
+
+    pending = frappe.cache().hgetall(PENDING_ROLLUPS_KEY) or {}
+    oldest_pending_age = 0
+    if pending:
+        oldest_pending_age = time.time() - min(pending.values())
+
+    return {
+        "queue": ROLLUP_QUEUE,
+        "depth": queue.count,
+        "scheduled": queue.scheduled_job_registry.count,
+        "lag_seconds": oldest_job_age,
+        "pending_projects": len(pending),
+        "oldest_pending_seconds": oldest_pending_age
+    }
+
+
+def sync_project_task_rows(task):
+    """Refresh the denormalized copies on Project Task rows without saving the projects"""
+    assignments = ", ".join(f"`{column}` = %({column})s" for column in PROJECT_TASK_FIELDS)
+    values = {column: task.get(field) for column, field in PROJECT_TASK_FIELDS.items()}
+    values["task"] = task.get("name")
+
+    frappe.db.sql(
+        f"""
+        UPDATE `tabProject Task`
+        SET {assignments}
+        WHERE parenttype = 'Project' AND task = %(task)s
+        """,
+        values
+    )
+    bump_generation("Project")
+
+
+def propagate_task_update(task, before=None):
+    """
+    Bring Project Task rows and project rollups in line with a saved task
+
+    Used by Task.on_update and by the column level PATCH path, so neither has
+    to load or save the linked project.
+
+    Args:
+        task: The saved task, a Task document or a dict of its values
+        before: The values before the save, None for a new task
+    """
+    def changed(field):
+        return not before or before.get(field) != task.get(field)
+
+    # Refresh the copies on every Project Task row of the task
+    if before and any(changed(field) for field in PROJECT_TASK_FIELDS.values()):
+        sync_project_task_rows(task)
+
+    project = task.get("project")
+    if not project:
+        return
+
+    # Check if task is already linked to project without loading it
+    task_exists = frappe.db.exists("Project Task", {
+        "parenttype": "Project",
+        "parent": project,
+        "task": task.get("name")
+    })
+
+    # If task not linked, add it to project
+    if not task_exists:
+        append_project_tasks(project, [{
+            "name": task.get("name"),
+            "title": task.get("title"),
+            "status": task.get("status"),
+            "priority": task.get("priority"),
+            "start_date": task.get("start_date"),
+            "end_date": task.get("end_date")
+        }])
+        return
+
+    # Status changes only move the stored counters by one
+    if changed("status"):
+        was_completed = bool(before) and before.get("status") == "Completed"
+        is_completed = task.get("status") == "Completed"
+        if was_completed != is_completed:
+            apply_task_delta(project, completed_delta=1 if is_completed else -1)
+
+    # Date rollups need every linked task, recompute them in the background
+    if changed("start_date") or changed("end_date"):
+        enqueue_project_rollup(project)
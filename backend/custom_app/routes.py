@@ -1,5 +1,8 @@
 import frappe
+from frappe import _
 from . import api
+from .cache import is_not_modified
+from .permissions import has_permission
 
 def register_api_routes():
     """
@@ -19,8 +22,21 @@ def projects():
     
     # If it's GET, return all projects or filtered by status
     if method == "GET":
+        # Guests reach this dispatcher, check access before answering 304
+        if not has_permission("Project", "read"):
+            frappe.throw(_("Not permitted to view projects"), frappe.PermissionError)
+        
+        # Nothing changed since the client's copy, answer 304 without rows
+        if is_not_modified("Project"):
+            return
+        
         status = frappe.form_dict.get('status')
-        return api.get_projects(status=status)
+        return api.get_projects(
+            status=status,
+            limit=frappe.form_dict.get('limit'),
+            cursor=frappe.form_dict.get('cursor'),
+            fields=frappe.form_dict.get('fields')
+        )
     
     # If it's POST, create a new project
     elif method == "POST":
@@ -46,6 +62,12 @@ def projects():
             end_date=data.get('end_date')
         )
     
+    # If it's PATCH, update only the given fields of a project
+    elif method == "PATCH":
+        data = frappe.request.get_json()
+        patch = {key: value for key, value in data.items() if key not in ('name', 'modified')}
+        return api.patch_project(name=data.get('name'), patch=patch, modified=data.get('modified'))
+    
     # If it's DELETE, delete a project
     elif method == "DELETE":
         data = frappe.request.get_json()
@@ -65,13 +87,29 @@ def tasks():
     
     # If it's GET, return all tasks or filtered
     if method == "GET":
+        # Guests reach this dispatcher, check access before answering 304
+        if not has_permission("Task", "read"):
+            frappe.throw(_("Not permitted to view tasks"), frappe.PermissionError)
+        
+        # Nothing changed since the client's copy, answer 304 without rows
+        if is_not_modified("Task"):
+            return
+        
         status = frappe.form_dict.get('status')
         project = frappe.form_dict.get('project')
-        return api.get_tasks(status=status, project=project)
+        return api.get_tasks(
+            status=status,
+            project=project,
+            limit=frappe.form_dict.get('limit'),
+            cursor=frappe.form_dict.get('cursor'),
+            fields=frappe.form_dict.get('fields')
+        )
     
-    # If it's POST, create a new task
+    # If it's POST, create a new task, or many at once from a list
     elif method == "POST":
         data = frappe.request.get_json()
+        if isinstance(data, list):
+            return api.create_tasks(tasks=data)
         return api.create_task(
             title=data.get('title'),
             description=data.get('description'),
@@ -98,6 +136,12 @@ def tasks():
             project=data.get('project')
         )
     
+    # If it's PATCH, update only the given fields of a task
+    elif method == "PATCH":
+        data = frappe.request.get_json()
+        patch = {key: value for key, value in data.items() if key not in ('name', 'modified')}
+        return api.patch_task(name=data.get('name'), patch=patch, modified=data.get('modified'))
+    
     # If it's DELETE, delete a task
     elif method == "DELETE":
         data = frappe.request.get_json()
@@ -117,7 +161,15 @@ def project_tasks(project_id=None):
     
     # If it's GET, return tasks for project
     if method == "GET":
-        return api.get_tasks(project=project_id)
+        # Guests reach this dispatcher, check access before answering 304
+        if not has_permission("Task", "read"):
+            frappe.throw(_("Not permitted to view tasks"), frappe.PermissionError)
+        
+        # Nothing changed since the client's copy, answer 304 without rows
+        if is_not_modified("Task"):
+            return
+        
+        return api.get_tasks(project=project_id, fields=frappe.form_dict.get('fields'))
     
     # If it's POST, handle task addition or removal
     elif method == "POST":
@@ -126,6 +178,12 @@ def project_tasks(project_id=None):
         task_id = data.get('task')
         action = data.get('action', 'add')  # Default to add
         
+        # A list of tasks is attached, or replaces the project's tasks, in one save
+        if data.get('tasks') is not None:
+            if action == 'set':
+                return api.set_project_tasks(project=project_id, tasks=data.get('tasks'))
+            return api.add_tasks_to_project(project=project_id, tasks=data.get('tasks'))
+        
         if action == 'remove':
             return api.remove_task_from_project(project=project_id, task=task_id)
         else:
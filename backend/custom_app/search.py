@@ -0,0 +1,212 @@
+import html
+import re
+
+import frappe
+from frappe.utils import cint, strip_html_tags
+
+from .permissions import get_permission_query_conditions
+
+# Full-text index of tasks and projects. Only the searchable text is stored;
+# status and project are filtered by joining the document table, so changes
+# to them never touch the index.
+SEARCH_TABLE = "__custom_app_search"
+
+# doctype -> (title field, other text fields, fields holding HTML)
+SEARCH_FIELDS = {
+    "Task": ("title", ("description", "details"), ("description",)),
+    "Project": ("title", ("description",), ("description",))
+}
+
+# Fields whose change requires reindexing a document
+INDEXED_FIELDS = {
+    doctype: (title_field,) + text_fields
+    for doctype, (title_field, text_fields, html_fields) in SEARCH_FIELDS.items()
+}
+
+# Title matches weigh this much more than matches in the body
+TITLE_WEIGHT = 2
+
+MAX_RESULTS = 100
+INDEX_BATCH_SIZE = 500
+
+# InnoDB ignores shorter words unless innodb_ft_min_token_size is lowered
+MIN_TERM_LENGTH = 3
+
+
+def create_search_table():
+    frappe.db.sql_ddl(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{SEARCH_TABLE}` (
+            `doctype` VARCHAR(140) NOT NULL,
+            `name` VARCHAR(140) NOT NULL,
+            `title` VARCHAR(255),
+            `content` LONGTEXT,
+            PRIMARY KEY (`doctype`, `name`),
+            FULLTEXT KEY `title` (`title`),
+            FULLTEXT KEY `title_content` (`title`, `content`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+
+
+def get_search_text(doctype, row):
+    """Return the (title, content) indexed for a document, HTML reduced to text"""
+    title_field, text_fields, html_fields = SEARCH_FIELDS[doctype]
+    parts = []
+    for field in text_fields:
+        value = row.get(field)
+        if not value:
+            continue
+        if field in html_fields:
+            value = html.unescape(strip_html_tags(value))
+        parts.append(value)
+    return (row.get(title_field) or "")[:255], re.sub(r"\s+", " ", " ".join(parts)).strip()
+
+
+def index_rows(doctype, rows):
+    """Insert or refresh the index entries of rows holding the name and text fields"""
+    for start in range(0, len(rows), INDEX_BATCH_SIZE):
+        batch = rows[start:start + INDEX_BATCH_SIZE]
+        values = []
+        for row in batch:
+            values.extend((doctype, row.get("name")) + get_search_text(doctype, row))
+        frappe.db.sql(
+            f"""
+            INSERT INTO `{SEARCH_TABLE}` (`doctype`, `name`, `title`, `content`)
+            VALUES {", ".join(["(%s, %s, %s, %s)"] * len(batch))}
+            ON DUPLICATE KEY UPDATE `title` = VALUES(`title`), `content` = VALUES(`content`)
+            """,
+            values
+        )
+
+
+def index_documents(doctype, names):
+    """Refresh the index entries of documents from the database"""
+    if not names:
+        return
+    rows = frappe.get_all(
+        doctype,
+        filters={"name": ["in", list(names)]},
+        fields=["name"] + list(INDEXED_FIELDS[doctype])
+    )
+    index_rows(doctype, rows)
+
+
+def remove_documents(doctype, names):
+    if names:
+        frappe.db.sql(
+            f"DELETE FROM `{SEARCH_TABLE}` WHERE `doctype` = %s AND `name` IN %s",
+            (doctype, tuple(names))
+        )
+
+
+def update_index(doc, method=None):
+    """doc_events hook: reindex a saved Task or Project when its text changed"""
+    if not doc.get_doc_before_save() or any(doc.has_value_changed(field) for field in INDEXED_FIELDS[doc.doctype]):
+        index_rows(doc.doctype, [doc.as_dict()])
+
+
+def remove_from_index(doc, method=None):
+    """doc_events hook: drop a deleted Task or Project from the index"""
+    remove_documents(doc.doctype, [doc.name])
+
+
+def rebuild_search_index(doctypes=None, chunk_size=1000, verbose=False):
+    """
+    Rebuild the index from the documents, committing per chunk
+
+    Entries of documents that no longer exist are removed.
+
+    Returns:
+        dict: doctype -> number of indexed documents
+    """
+    create_search_table()
+    counts = {}
+    for doctype in doctypes or SEARCH_FIELDS:
+        fields = ["name"] + list(INDEXED_FIELDS[doctype])
+        last_name = None
+        counts[doctype] = 0
+        while True:
+            filters = {"name": [">", last_name]} if last_name else {}
+            rows = frappe.get_all(doctype, filters=filters, fields=fields, order_by="name asc", limit_page_length=chunk_size)
+            if not rows:
+                break
+            index_rows(doctype, rows)
+            counts[doctype] += len(rows)
+            last_name = rows[-1].name
+            frappe.db.commit()
+            if verbose:
+                print(f"Indexed {counts[doctype]} {doctype} documents")
+
+        frappe.db.sql(
+            f"""
+            DELETE s FROM `{SEARCH_TABLE}` s
+            LEFT JOIN `tab{doctype}` d ON d.name = s.name
+            WHERE s.doctype = %s AND d.name IS NULL
+            """,
+            doctype
+        )
+        frappe.db.commit()
+
+    return counts
+
+
+def build_boolean_query(text):
+    """
+    Turn user input into a boolean mode query where every word is required
+    and matched as a prefix
+
+    Returns:
+        str: the query, empty when no word is long enough to be indexed
+    """
+    words = re.findall(r"\w+", text or "", flags=re.UNICODE)
+    return " ".join(f"+{word}*" for word in words if len(word) >= MIN_TERM_LENGTH)
+
+
+def search(text, doctype="Task", status=None, project=None, limit=20):
+    """
+    Rank the documents of a doctype matching a text
+
+    Row level permissions of the session user and the status and project
+    filters are applied through a join on the document table.
+
+    Returns:
+        list: dicts with doctype, name, title, status, (project for tasks) and score
+    """
+    query = build_boolean_query(text)
+    if not query:
+        return []
+
+    table = f"tab{doctype}"
+    conditions = ["s.`doctype` = %(doctype)s", "MATCH (s.`title`, s.`content`) AGAINST (%(query)s IN BOOLEAN MODE)"]
+    if status:
+        conditions.append(f"`{table}`.`status` = %(status)s")
+    if project and doctype == "Task":
+        conditions.append(f"`{table}`.`project` = %(project)s")
+    permission_conditions = get_permission_query_conditions(doctype)
+    if permission_conditions:
+        # Literal % of LIKE patterns must survive parameter substitution
+        conditions.append(permission_conditions.replace("%", "%%"))
+
+    extra_fields = ", `tabTask`.`project`" if doctype == "Task" else ""
+    return frappe.db.sql(
+        f"""
+        SELECT
+            s.`doctype`, s.`name`, s.`title`, `{table}`.`status`{extra_fields},
+            {TITLE_WEIGHT} * MATCH (s.`title`) AGAINST (%(query)s IN BOOLEAN MODE)
+                + MATCH (s.`title`, s.`content`) AGAINST (%(query)s IN BOOLEAN MODE) AS score
+        FROM `{SEARCH_TABLE}` s
+        INNER JOIN `{table}` ON `{table}`.name = s.`name`
+        WHERE {" AND ".join(conditions)}
+        ORDER BY score DESC, s.`name` ASC
+        LIMIT %(limit)s
+        """,
+        {
+            "doctype": doctype,
+            "query": query,
+            "status": status,
+            "project": project,
+            "limit": max(1, min(cint(limit) or 20, MAX_RESULTS))
+        },
+        as_dict=True
+    )
@@ -0,0 +1,319 @@
+import math
+import re
+from functools import lru_cache
+
+import frappe
+from frappe.utils import cint
+
+# Inverted index of Job Application skills: one row per (skill, application)
+SKILL_INDEX_TABLE = "__custom_app_skill_index"
+
+# Spellings of the same skill, mapped to one canonical token. Sites can add
+# their own with `custom_app_skill_synonyms` in site config.
+SKILL_SYNONYMS = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "golang": "go",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mysql db": "mysql",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "csharp": "c#",
+    "c sharp": "c#",
+    "cpp": "c++",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    ".net": ".net",
+    "dotnet": ".net",
+    "dot net": ".net",
+    "office 365": "office 365",
+    "microsoft 365": "office 365",
+    # Skills written with a slash, kept whole instead of split on it
+    "ci/cd": "ci/cd",
+    "tcp/ip": "tcp/ip",
+    "pl/sql": "pl/sql",
+    "ui/ux": "ui/ux",
+    "ux/ui": "ui/ux",
+    "a/b testing": "a/b testing"
+}
+
+# Separators between skills in the free-text field. Spaces are kept, as in
+# "machine learning". Slashes inside a synonym, as in "CI/CD", do not split.
+SKILL_SEPARATORS = re.compile(r"[,;|/\n\r\t]+")
+
+# Stands in for the slash of a protected skill while the text is split
+PROTECTED_SLASH = "\x00"
+
+# A version after the skill, as in "Python 3" or "Java 17"
+VERSION_SUFFIX = re.compile(r"\s+v?\d+(?:\.\d+)*$")
+
+MAX_SKILL_LENGTH = 140
+INDEX_BATCH_SIZE = 1000
+MAX_RESULTS = 100
+
+# Size of the collection used by IDF weights, recounted at most this often
+COLLECTION_SIZE_TTL = 300
+
+
+def create_skill_index_table():
+    frappe.db.sql_ddl(
+        f"""
+        CREATE TABLE IF NOT EXISTS `{SKILL_INDEX_TABLE}` (
+            `skill` VARCHAR(140) NOT NULL,
+            `application` VARCHAR(140) NOT NULL,
+            PRIMARY KEY (`skill`, `application`),
+            KEY `application` (`application`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+
+
+def get_synonyms():
+    return dict(SKILL_SYNONYMS, **(frappe.conf.get("custom_app_skill_synonyms") or {}))
+
+
+@lru_cache(maxsize=8)
+def _get_slashed_skills_pattern(skills):
+    if not skills:
+        return None
+    alternatives = "|".join(re.escape(skill) for skill in sorted(skills, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)", re.IGNORECASE)
+
+
+def split_skills(text, synonyms):
+    """Split free text into skills, keeping synonyms that contain a slash whole"""
+    pattern = _get_slashed_skills_pattern(tuple(sorted(skill for skill in synonyms if "/" in skill)))
+    if pattern:
+        text = pattern.sub(lambda match: match.group().replace("/", PROTECTED_SLASH), text)
+    return [skill.replace(PROTECTED_SLASH, "/") for skill in SKILL_SEPARATORS.split(text)]
+
+
+def normalize_skill(skill, synonyms):
+    """Canonical token of one skill, empty when nothing is left of it"""
+    # Keep the symbols of c++, c#, node.js, .net and ci/cd, drop other punctuation
+    token = re.sub(r"\s+", " ", re.sub(r"[^\w\s+#./-]", " ", str(skill).lower())).strip()
+    if token in synonyms:
+        return synonyms[token][:MAX_SKILL_LENGTH]
+
+    token = token.strip(" .-/")
+    if token not in synonyms:
+        # "python 3" is python, unless the versioned name is a synonym itself
+        unversioned = VERSION_SUFFIX.sub("", token)
+        if unversioned:
+            token = unversioned
+    return synonyms.get(token, token)[:MAX_SKILL_LENGTH]
+
+
+def normalize_skills(skills, synonyms=None):
+    """
+    Normalize free-text skills into a sorted set of canonical tokens
+
+    Args:
+        skills (str or list): "Python 3, Django / JS, CI/CD" or a list of skills
+
+    Returns:
+        list: e.g. ["ci/cd", "django", "javascript", "python"]
+    """
+    if not skills:
+        return []
+
+    synonyms = synonyms if synonyms is not None else get_synonyms()
+    if isinstance(skills, str):
+        skills = split_skills(skills, synonyms)
+
+    tokens = set()
+    for skill in skills:
+        token = normalize_skill(skill, synonyms)
+        if token:
+            tokens.add(token)
+
+    return sorted(tokens)
+
+
+def index_applications(rows):
+    """
+    Replace the index entries of applications
+
+    Args:
+        rows (list): (application name, skills text) pairs
+    """
+    if not rows:
+        return
+
+    synonyms = get_synonyms()
+    remove_applications([name for name, skills in rows])
+    values = [
+        (skill, name)
+        for name, skills in rows
+        for skill in normalize_skills(skills, synonyms)
+    ]
+    for start in range(0, len(values), INDEX_BATCH_SIZE):
+        batch = values[start:start + INDEX_BATCH_SIZE]
+        frappe.db.sql(
+            f"""
+            INSERT IGNORE INTO `{SKILL_INDEX_TABLE}` (`skill`, `application`)
+            VALUES {", ".join(["(%s, %s)"] * len(batch))}
+            """,
+            [value for row in batch for value in row]
+        )
+
+
+def remove_applications(names):
+    if names:
+        frappe.db.sql(f"DELETE FROM `{SKILL_INDEX_TABLE}` WHERE `application` IN %s", (tuple(names),))
+
+
+def update_index(doc, method=None):
+    """doc_events hook: reindex the skills of a saved Job Application when they changed"""
+    if not doc.get_doc_before_save() or doc.has_value_changed("skills"):
+        index_applications([(doc.name, doc.get("skills"))])
+
+
+def remove_from_index(doc, method=None):
+    """doc_events hook: drop a deleted Job Application from the index"""
+    remove_applications([doc.name])
+
+
+def rebuild_skill_index(chunk_size=1000, verbose=False):
+    """
+    Backfill the index from every Job Application, committing per chunk
+
+    Returns:
+        int: number of applications indexed
+    """
+    create_skill_index_table()
+    if not frappe.db.table_exists("Job Application"):
+        return 0
+
+    count = 0
+    last_name = None
+    while True:
+        filters = {"name": [">", last_name]} if last_name else {}
+        rows = frappe.get_all(
+            "Job Application",
+            filters=filters,
+            fields=["name", "skills"],
+            order_by="name asc",
+            limit_page_length=chunk_size
+        )
+        if not rows:
+            break
+        index_applications([(row.name, row.skills) for row in rows])
+        count += len(rows)
+        last_name = rows[-1].name
+        frappe.db.commit()
+        if verbose:
+            print(f"Indexed skills of {count} job applications")
+
+    frappe.db.sql(
+        f"""
+        DELETE i FROM `{SKILL_INDEX_TABLE}` i
+        LEFT JOIN `tabJob Application` ja ON ja.name = i.application
+        WHERE ja.name IS NULL
+        """
+    )
+    frappe.db.commit()
+    return count
+
+
+def _get_collection_size():
+    """Number of indexed applications, cached for the IDF weights"""
+    key = "custom_app:skill_index_size"
+    size = frappe.cache().get_value(key)
+    if size is None:
+        size = frappe.db.sql(f"SELECT COUNT(DISTINCT `application`) FROM `{SKILL_INDEX_TABLE}`")[0][0] or 0
+        frappe.cache().set_value(key, size, expires_in_sec=COLLECTION_SIZE_TTL)
+    return size
+
+
+def get_skill_weights(skills):
+    """
+    IDF weight of each skill: rare skills count more than common ones
+
+    Returns:
+        dict: skill -> weight, skills nobody has are left out
+    """
+    frequencies = dict(frappe.db.sql(
+        f"""
+        SELECT `skill`, COUNT(*) FROM `{SKILL_INDEX_TABLE}`
+        WHERE `skill` IN %s
+        GROUP BY `skill`
+        """,
+        (tuple(skills),)
+    ))
+    size = max(_get_collection_size(), max(frequencies.values(), default=0))
+    return {
+        skill: round(math.log(1 + size / frequency), 6)
+        for skill, frequency in frequencies.items()
+    }
+
+
+def match_candidates(skills, filters=None, require_all=False, limit=20):
+    """
+    Rank applications by the IDF weighted overlap of their skills with the
+    requested ones, reading only the index entries of those skills
+
+    Args:
+        skills (str or list): Requested skills, normalized like the index
+        filters (dict, optional): Equality filters on Job Application columns
+        require_all (bool, optional): Only applications having every skill
+        limit (int, optional): Maximum number of results
+
+    Returns:
+        list: dicts with the application name, score and matched skills, best first
+    """
+    skills = normalize_skills(skills)
+    if not skills:
+        return []
+
+    weights = get_skill_weights(skills)
+    if not weights or (require_all and len(weights) < len(skills)):
+        return []
+
+    cases = " ".join("WHEN %s THEN %s" for skill in weights)
+    case_values = [value for skill, weight in weights.items() for value in (skill, weight)]
+
+    conditions = ["i.`skill` IN %s"]
+    values = [tuple(weights)]
+    for field, value in (filters or {}).items():
+        conditions.append(f"ja.`{field}` = %s")
+        values.append(value)
+
+    having = "HAVING COUNT(*) = %s" if require_all else ""
+    having_values = [len(skills)] if require_all else []
+
+    rows = frappe.db.sql(
+        f"""
+        SELECT
+            i.`application` AS name,
+            SUM(CASE i.`skill` {cases} ELSE 0 END) AS score,
+            GROUP_CONCAT(i.`skill` ORDER BY i.`skill` SEPARATOR ',') AS matched_skills
+        FROM `{SKILL_INDEX_TABLE}` i
+        INNER JOIN `tabJob Application` ja ON ja.name = i.`application`
+        WHERE {" AND ".join(conditions)}
+        GROUP BY i.`application`
+        {having}
+        ORDER BY score DESC, MAX(ja.application_date) DESC, i.`application` ASC
+        LIMIT %s
+        """,
+        case_values + values + having_values + [max(1, min(cint(limit) or 20, MAX_RESULTS))],
+        as_dict=True
+    )
+
+    for row in rows:
+        row.matched_skills = row.matched_skills.split(",") if row.matched_skills else []
+        row.score = float(row.score or 0)
+    return rows
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import random
+import traceback
+from logging.handlers import RotatingFileHandler
+
+import frappe
+from frappe.utils import cint, now
+
+# Statements slower than this are recorded, unless overridden by
+# `custom_app_slow_query_ms` in site config
+SLOW_QUERY_THRESHOLD_MS = 200
+
+# Share of slow SELECTs whose plan is captured with EXPLAIN, overridable with
+# `custom_app_slow_query_explain_rate`
+EXPLAIN_SAMPLE_RATE = 0.1
+
+SLOW_QUERY_LOG_FILE = "custom_app_slow_queries.jsonl"
+SLOW_QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 5
+
+# Longest statement kept per record
+MAX_QUERY_LENGTH = 5000
+
+_loggers = {}
+
+
+def get_threshold_ms():
+    return frappe.conf.get("custom_app_slow_query_ms") or SLOW_QUERY_THRESHOLD_MS
+
+
+def get_log_path():
+    return os.path.abspath(frappe.get_site_path("logs", SLOW_QUERY_LOG_FILE))
+
+
+def get_rotating_logger(name, path, max_bytes, backups):
+    """One rotating JSONL logger per site and file, shared with the traffic recorder"""
+    if path not in _loggers:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        logger = logging.getLogger(f"custom_app.{name}.{frappe.local.site}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        _loggers[path] = logger
+    return _loggers[path]
+
+
+def _get_logger():
+    return get_rotating_logger("slow_queries", get_log_path(), SLOW_QUERY_LOG_MAX_BYTES, SLOW_QUERY_LOG_BACKUPS)
+
+
+def get_caller():
+    """
+    Attribute a statement to the app code that issued it
+
+    Returns:
+        tuple: (the custom_app.api/routes function on the stack or None,
+            the app frames of the stack), or (None, []) outside app code
+    """
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if "custom_app" in frame.filename
+        and not frame.filename.endswith(("instrumentation.py", "slowlog.py"))
+    ]
+    caller = None
+    for frame in frames:
+        module = os.path.splitext(os.path.basename(frame.filename))[0]
+        if module in ("api", "routes") and os.path.basename(os.path.dirname(frame.filename)) == "custom_app":
+            caller = f"custom_app.{module}.{frame.name}"
+    return caller, [f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in frames]
+
+
+def _explain(query, values, run_sql):
+    """Capture the plan of a SELECT without going through the instrumented sql"""
+    try:
+        return run_sql(f"EXPLAIN {query}", values, as_dict=True)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def record_slow_query(query, values, duration, run_sql):
+    """
+    Append a slow statement issued by app code to the slow query log
+
+    Only the fingerprint of the statement is written, with literals and bound
+    values replaced by `?`: they hold applicant emails and names. The values
+    are only used to run EXPLAIN.
+
+    Args:
+        query (str): The statement
+        values: Its bound values
+        duration (float): Execution time in seconds
+        run_sql (callable): The uninstrumented frappe.db.sql, used for EXPLAIN
+    """
+    from .instrumentation import fingerprint_query
+
+    caller, call_site = get_caller()
+    if not call_site:
+        return
+
+    query = str(query)
+    explain = None
+    explain_rate = frappe.conf.get("custom_app_slow_query_explain_rate")
+    if explain_rate is None:
+        explain_rate = EXPLAIN_SAMPLE_RATE
+    if query.lstrip().lower().startswith("select") and random.random() < explain_rate:
+        explain = _explain(query, values, run_sql)
+
+    record = {
+        "timestamp": now(),
+        "site": frappe.local.site,
+        "duration_ms": round(duration * 1000, 3),
+        "caller": caller,
+        "endpoint": frappe.form_dict.get("cmd") or (frappe.request.path if frappe.request else None),
+        "user": frappe.session.user if getattr(frappe.local, "session", None) else None,
+        "query": fingerprint_query(query)[:MAX_QUERY_LENGTH],
+        "call_site": call_site,
+        "explain": explain
+    }
+
+    try:
+        _get_logger().info(json.dumps(record, default=str))
+    except Exception:
+        # The slow query log must never break the request it observes
+        pass
+
+
+def _tail(path, limit):
+    """Read the last lines of a file without loading all of it"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= limit:
+            step = min(65536, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    return data.decode(errors="replace").splitlines()[-limit:]
+
+
+@frappe.whitelist()
+def get_slow_queries(limit=100):
+    """
+    Get the most recent slow queries recorded for this site
+    """
+    frappe.only_for("System Manager")
+
+    path = get_log_path()
+    if not os.path.exists(path):
+        return []
+
+    records = []
+    for line in reversed(_tail(path, max(1, min(cint(limit) or 100, 1000)))):
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+
+    return records
@@ -0,0 +1,8 @@
+import frappe
+from frappe.model.document import Document
+
+class JobApplicationImport(Document):
+    def validate(self):
+        """Guess the file format from the extension when it was not chosen"""
+        if self.import_file and self.import_file.lower().endswith((".ndjson", ".jsonl")):
+            self.file_format = "NDJSON"
@@ -1,53 +1,90 @@
 import frappe
 from frappe.model.document import Document
 
+from custom_app.rollups import calculate_progress, get_project_status
+
 class Project(Document):
     def validate(self):
-        self.update_project_status()
-        self.update_project_dates()
-    
-    def update_project_status(self):
+        linked_tasks = self.get_linked_task_values()
+        self.update_project_status(linked_tasks)
+        self.update_project_dates(linked_tasks)
+        self.update_task_counters(linked_tasks)
+
+    def get_linked_task_values(self):
+        """Fetch status and dates of all linked tasks in a single query"""
+        task_names = list({task_link.task for task_link in self.tasks if task_link.task})
+        if not task_names:
+            return {}
+
+        tasks = frappe.get_all(
+            "Task",
+            filters={"name": ["in", task_names]},
+            fields=["name", "status", "start_date", "end_date"]
+        )
+        return {task.name: task for task in tasks}
+
+    def update_project_status(self, linked_tasks=None):
         """Update project status based on tasks"""
         if not self.tasks:
             return
-        
+
+        if linked_tasks is None:
+            linked_tasks = self.get_linked_task_values()
+
         completed_tasks = 0
         total_tasks = len(self.tasks)
-        
+
         for task_link in self.tasks:
-            task = frappe.get_doc("Task", task_link.task)
-            if task.status == "Completed":
+            task = linked_tasks.get(task_link.task)
+            if task and task.status == "Completed":
                 completed_tasks += 1
-        
+
         # Auto-update project status based on task completion
-        if total_tasks == completed_tasks and total_tasks > 0:
-            self.status = "Completed"
-        elif completed_tasks > 0:
-            self.status = "Active"
-    
-    def update_project_dates(self):
+        self.status = get_project_status(self.status, total_tasks, completed_tasks)
+
+    def update_project_dates(self, linked_tasks=None):
         """Update project start and end dates based on tasks"""
         if not self.tasks:
             return
-        
+
+        if linked_tasks is None:
+            linked_tasks = self.get_linked_task_values()
+
         # Initialize with None to find min/max dates
         earliest_start = None
         latest_end = None
-        
+
         for task_link in self.tasks:
-            task = frappe.get_doc("Task", task_link.task)
-            
+            task = linked_tasks.get(task_link.task)
+            if not task:
+                continue
+
             if task.start_date:
                 if not earliest_start or task.start_date < earliest_start:
                     earliest_start = task.start_date
-            
+
             if task.end_date:
                 if not latest_end or task.end_date > latest_end:
                     latest_end = task.end_date
-        
+
         # Update project dates if found
         if earliest_start and (not self.start_date or self.start_date > earliest_start):
             self.start_date = earliest_start
-            
+
         if latest_end and (not self.end_date or self.end_date < latest_end):
-            self.end_date = latest_end 
\ No newline at end of file
+            self.end_date = latest_end
+
+    def update_task_counters(self, linked_tasks=None):
+        """Store task count, completed count and progress from the linked tasks"""
+        if linked_tasks is None:
+            linked_tasks = self.get_linked_task_values()
+
+        completed_tasks = 0
+        for task_link in self.tasks:
+            task = linked_tasks.get(task_link.task)
+            if task and task.status == "Completed":
+                completed_tasks += 1
+
+        self.task_count = len(self.tasks)
+        self.completed_count = completed_tasks
+        self.progress = calculate_progress(self.task_count, self.completed_count)
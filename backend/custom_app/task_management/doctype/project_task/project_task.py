@@ -12,7 +12,14 @@ class ProjectTask(Document):
     def on_update(self):
         """Refresh task data when project task is updated"""
         if self.task:
-            task = frappe.get_doc("Task", self.task)
+            task = frappe.db.get_value(
+                "Task",
+                self.task,
+                ["title", "status", "priority", "start_date", "end_date"],
+                as_dict=True
+            )
+            if not task:
+                return
             
             # Update fields from task
             self.task_title = task.title
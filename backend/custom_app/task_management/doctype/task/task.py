@@ -1,6 +1,8 @@
 import frappe
 from frappe.model.document import Document
 
+from custom_app.rollups import apply_task_delta, propagate_task_update
+
 class Task(Document):
     def validate(self):
         self.validate_dates()
@@ -23,33 +25,25 @@ class Task(Document):
         if old_status == "Completed" and new_status in ["Open", "In Progress"]:
             frappe.msgprint("Note: You are reopening a completed task.")
     
-    def update_project_if_linked(self):
-        """Update project if task is linked to one"""
-        if self.project:
-            project = frappe.get_doc("Project", self.project)
-            
-            # Check if task is already linked to project
-            task_exists = False
-            for task in project.tasks:
-                if task.task == self.name:
-                    task_exists = True
-                    break
-                    
-            # If task not linked, add it to project
-            if not task_exists:
-                project.append("tasks", {
-                    "task": self.name,
-                    "task_title": self.title,
-                    "status": self.status,
-                    "priority": self.priority,
-                    "start_date": self.start_date,
-                    "end_date": self.end_date
-                })
-                project.save(ignore_permissions=True)
-            
-            # If task is linked and status has changed, update project
-            elif self.has_value_changed("status") or self.has_value_changed("start_date") or self.has_value_changed("end_date"):
-                project.save(ignore_permissions=True)
+    def remove_from_projects(self):
+        """Drop the project rows of a deleted task and decrement the project counters"""
+        task_links = frappe.get_all(
+            "Project Task",
+            filters={"task": self.name, "parenttype": "Project"},
+            fields=["parent"]
+        )
+        if not task_links:
+            return
+
+        frappe.db.delete("Project Task", {"task": self.name, "parenttype": "Project"})
+
+        is_completed = self.status == "Completed"
+        for task_link in task_links:
+            apply_task_delta(task_link.parent, task_delta=-1, completed_delta=-1 if is_completed else 0)
     
     def on_update(self):
-        self.update_project_if_linked() 
\ No newline at end of file
+        # Keep Project Task rows and project rollups in step with this task
+        propagate_task_update(self, self.get_doc_before_save())
+    
+    def on_trash(self):
+        self.remove_from_projects() 
\ No newline at end of file
@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now, nowdate
+
+from custom_app.applicant_import import ValidationContext, insert_rows, iter_records, validate_rows
+from custom_app.export import _format_row, _serialize, build_export_query
+
+# Exported and imported rows are told apart from other applications by owner
+OWNER = "test-import@example.com"
+
+APPLICATIONS = {
+    "TEST-IMPORT-1": ("Ada Lovelace", "ada.roundtrip@example.com", "Python, SQL"),
+    "TEST-IMPORT-2": ("Alan Turing", "alan.roundtrip@example.com", "Java")
+}
+
+
+class TestExportImportRoundTrip(FrappeTestCase):
+    """A CSV exported by export_records imports again as it is"""
+
+    def setUp(self):
+        frappe.set_user("Administrator")
+        timestamp = now()
+        frappe.db.bulk_insert(
+            "Job Application",
+            fields=["name", "creation", "modified", "owner", "modified_by", "docstatus",
+                    "applicant_name", "email_id", "status", "application_date", "skills"],
+            values=[
+                (name, timestamp, timestamp, OWNER, OWNER, 0, applicant_name, email, "Open", nowdate(), skills)
+                for name, (applicant_name, email, skills) in APPLICATIONS.items()
+            ]
+        )
+
+    def tearDown(self):
+        frappe.db.rollback()
+
+    def export_csv(self):
+        """The body export_records streams, built without the streaming connection"""
+        query, fields = build_export_query("Job Application", None, {"owner": OWNER})
+        rows = [_format_row("Job Application", row, fields) for row in frappe.db.sql(query, as_dict=True)]
+        return _serialize([dict(zip(fields, fields))], fields, "csv") + _serialize(rows, fields, "csv")
+
+    def test_round_trip(self):
+        body = self.export_csv()
+        self.assertTrue(body.startswith("name,"))
+
+        # The exported applications are gone, so their emails are free again
+        frappe.db.delete("Job Application", {"owner": OWNER})
+
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as f:
+            f.write(body)
+        context = ValidationContext()
+        try:
+            valid, errors = validate_rows(list(iter_records(f.name, "CSV")), context)
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(valid), len(APPLICATIONS))
+        for row_number, row in valid:
+            self.assertNotIn("name", row)
+
+        names = insert_rows(valid, context)
+        imported = frappe.get_all(
+            "Job Application",
+            filters={"name": ["in", names]},
+            fields=["applicant_name", "email_id", "skills"],
+            order_by="applicant_name asc"
+        )
+        self.assertEqual(
+            [(row.applicant_name, row.email_id, row.skills) for row in imported],
+            sorted(APPLICATIONS.values())
+        )
@@ -0,0 +1,45 @@
+import frappe
+from frappe.desk.form import assign_to
+from frappe.tests.utils import FrappeTestCase
+
+from custom_app import api
+
+ASSIGNEE = "test-assignee@example.com"
+
+
+class TestAssignmentCache(FrappeTestCase):
+    """Assigning a task invalidates the cached lists of the assignee, which only show assigned tasks"""
+
+    def setUp(self):
+        frappe.set_user("Administrator")
+        if not frappe.db.exists("User", ASSIGNEE):
+            user = frappe.new_doc("User")
+            user.email = ASSIGNEE
+            user.first_name = "Test Assignee"
+            user.send_welcome_email = 0
+            user.user_type = "System User"
+            user.append("roles", {"role": "Task User"})
+            user.insert(ignore_permissions=True)
+
+        self.task = frappe.get_doc({"doctype": "Task", "title": "Assignment cache test"}).insert()
+
+    def tearDown(self):
+        frappe.set_user("Administrator")
+        frappe.db.rollback()
+
+    def get_task_names(self):
+        frappe.set_user(ASSIGNEE)
+        try:
+            return [task["name"] for task in api.get_tasks()]
+        finally:
+            frappe.set_user("Administrator")
+
+    def test_assigned_task_is_listed(self):
+        # Caches the list of the assignee without the task
+        self.assertNotIn(self.task.name, self.get_task_names())
+
+        assign_to.add({"assign_to": [ASSIGNEE], "doctype": "Task", "name": self.task.name})
+        self.assertIn(self.task.name, self.get_task_names())
+
+        assign_to.remove("Task", self.task.name, ASSIGNEE)
+        self.assertNotIn(self.task.name, self.get_task_names())
@@ -0,0 +1,50 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from custom_app import api
+from custom_app.benchmarks.data import NAME_PREFIX, clear_benchmark_data, generate_benchmark_data
+from custom_app.instrumentation import query_budget
+
+TASKS_PER_PROJECT = 5
+
+
+class TestGetProjects(FrappeTestCase):
+    """get_projects reads the task rollups of any number of projects in a constant number of queries"""
+
+    def setUp(self):
+        frappe.set_user("Administrator")
+        # Every call must reach the database
+        frappe.flags.custom_app_bypass_cache = True
+
+    def tearDown(self):
+        frappe.flags.custom_app_bypass_cache = False
+        clear_benchmark_data()
+
+    def get_projects(self, projects):
+        """Return the query count of one get_projects call over a data set of this many projects"""
+        generate_benchmark_data(projects=projects, tasks_per_project=TASKS_PER_PROJECT, job_applications=0)
+        # Warm the meta and permission caches, which are not per project
+        api.get_projects()
+
+        with query_budget(method="custom_app.api.get_projects") as stats:
+            count_before = stats.count
+            rows = api.get_projects()
+            count = stats.count - count_before
+
+        return count, [row for row in rows if row["name"].startswith(NAME_PREFIX)]
+
+    def test_query_count_does_not_grow_with_projects(self):
+        few_queries, few = self.get_projects(2)
+        many_queries, many = self.get_projects(50)
+
+        self.assertEqual(len(few), 2)
+        self.assertEqual(len(many), 50)
+        self.assertEqual(few_queries, many_queries)
+
+    def test_task_rollups(self):
+        count, rows = self.get_projects(3)
+
+        for row in rows:
+            self.assertEqual(row["task_count"], TASKS_PER_PROJECT)
+            self.assertGreaterEqual(row["progress"], 0)
+            self.assertLessEqual(row["progress"], 100)
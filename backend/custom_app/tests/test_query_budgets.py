@@ -0,0 +1,77 @@
+from contextlib import nullcontext
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from custom_app.benchmarks.data import benchmark_name, clear_benchmark_data, generate_benchmark_data
+from custom_app.benchmarks.runner import get_cases, request_context, rolled_back
+from custom_app.instrumentation import QUERY_BUDGETS, query_budget
+
+
+def get_budgeted_cases():
+    return [case for case in get_cases() if case.endpoint in QUERY_BUDGETS]
+
+
+class TestQueryBudgets(FrappeTestCase):
+    """Every endpoint with a declared budget stays within it, without N+1 statements"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        frappe.set_user("Administrator")
+        generate_benchmark_data(projects=20, tasks_per_project=10, job_applications=200)
+
+    @classmethod
+    def tearDownClass(cls):
+        clear_benchmark_data()
+        super().tearDownClass()
+
+    def setUp(self):
+        frappe.set_user("Administrator")
+        # Every call must reach the database
+        frappe.flags.custom_app_bypass_cache = True
+
+    def tearDown(self):
+        frappe.flags.custom_app_bypass_cache = False
+
+    def run_case(self, case, budget=True):
+        with request_context(case), (rolled_back() if case.write else nullcontext()):
+            with query_budget(method=case.endpoint) if budget else nullcontext():
+                result = case.call()
+        self.assert_succeeded(result)
+
+    def assert_succeeded(self, result):
+        """Endpoints return the errors they catch, and a failed call would pass any budget"""
+        if not isinstance(result, dict):
+            return
+        self.assertFalse(result.get("error"), result)
+        self.assertNotEqual(result.get("status"), "error", result)
+        for row in result.get("results") or []:
+            self.assertNotEqual(row.get("status"), "error", row)
+
+    def test_every_budget_is_checked(self):
+        checked = {case.endpoint for case in get_budgeted_cases()}
+        self.assertEqual(set(QUERY_BUDGETS) - checked, set())
+
+    def test_endpoints_stay_within_budget(self):
+        for case in get_budgeted_cases():
+            with self.subTest(case=case.name):
+                # Meta and permission lookups are cached after the first call
+                self.run_case(case, budget=False)
+                self.run_case(case)
+
+    def test_budget_is_enforced(self):
+        from custom_app.instrumentation import QueryBudgetExceeded
+
+        with self.assertRaises(QueryBudgetExceeded):
+            with query_budget(limit=1, detect_n_plus_one=False):
+                frappe.db.sql("SELECT 1")
+                frappe.db.sql("SELECT 2")
+
+    def test_n_plus_one_is_detected(self):
+        from custom_app.instrumentation import NPlusOneQueryDetected
+
+        with self.assertRaises(NPlusOneQueryDetected):
+            with query_budget():
+                for number in range(10):
+                    frappe.db.get_value("Task", benchmark_name("TASK", number + 1), "status")
@@ -0,0 +1,77 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import now, nowdate
+
+from custom_app.skills import SKILL_SYNONYMS, index_applications, match_candidates, normalize_skills
+
+APPLICATIONS = {
+    "TEST-SKILLS-1": "Python 3, Django, Kubernetes",
+    "TEST-SKILLS-2": "python",
+    "TEST-SKILLS-3": "Java 17, CI/CD",
+    "TEST-SKILLS-4": ".NET, TCP/IP"
+}
+
+# Matches are filtered on this owner so other applications of the site never rank in between
+OWNER = "test-skills@example.com"
+
+
+class TestNormalizeSkills(FrappeTestCase):
+    def normalize(self, skills):
+        return normalize_skills(skills, SKILL_SYNONYMS)
+
+    def test_separators_and_synonyms(self):
+        self.assertEqual(self.normalize("Python, Django / JS; k8s"), ["django", "javascript", "kubernetes", "python"])
+        self.assertEqual(self.normalize("Machine Learning | ML"), ["machine learning"])
+        self.assertEqual(self.normalize(["C++", "c#", "Node.js"]), ["c#", "c++", "node.js"])
+
+    def test_slashed_skills_are_kept_whole(self):
+        self.assertEqual(self.normalize("CI/CD, TCP/IP"), ["ci/cd", "tcp/ip"])
+        self.assertEqual(self.normalize("UX/UI"), ["ui/ux"])
+        self.assertEqual(self.normalize("Python/Django"), ["django", "python"])
+
+    def test_dotnet_and_versions(self):
+        self.assertEqual(self.normalize(".NET, dotnet"), [".net"])
+        self.assertEqual(self.normalize("Python 3, python3, Python 3.11"), ["python"])
+        self.assertEqual(self.normalize("Java 17, HTML5"), ["html5", "java"])
+        self.assertEqual(self.normalize("Office 365"), ["office 365"])
+
+    def test_empty(self):
+        self.assertEqual(self.normalize(None), [])
+        self.assertEqual(self.normalize(" , / ; "), [])
+
+
+class TestMatchCandidates(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        timestamp = now()
+        frappe.db.bulk_insert(
+            "Job Application",
+            fields=["name", "creation", "modified", "owner", "modified_by", "docstatus",
+                    "applicant_name", "email_id", "status", "application_date", "skills"],
+            values=[
+                (name, timestamp, timestamp, OWNER, OWNER, 0,
+                 f"Applicant {name}", f"{name.lower()}@example.com", "Open", nowdate(), skills)
+                for name, skills in APPLICATIONS.items()
+            ]
+        )
+        index_applications(list(APPLICATIONS.items()))
+
+    def tearDown(self):
+        frappe.db.rollback()
+
+    def get_matches(self, skills, **kwargs):
+        return [row.name for row in match_candidates(skills, filters={"owner": OWNER}, **kwargs)]
+
+    def test_ranking(self):
+        # Both skills beat one, applications without either are left out
+        self.assertEqual(self.get_matches("Python, Kubernetes"), ["TEST-SKILLS-1", "TEST-SKILLS-2"])
+
+    def test_require_all(self):
+        self.assertEqual(self.get_matches("python, k8s", require_all=True), ["TEST-SKILLS-1"])
+
+    def test_normalized_like_the_index(self):
+        self.assertEqual(self.get_matches("CI/CD"), ["TEST-SKILLS-3"])
+        self.assertEqual(self.get_matches("java"), ["TEST-SKILLS-3"])
+        self.assertEqual(self.get_matches("dotnet, tcp/ip", require_all=True), ["TEST-SKILLS-4"])
+        # "CI/CD" is not split into "ci" and "cd"
+        self.assertEqual(self.get_matches("cd"), [])
@@ -0,0 +1,279 @@
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+import requests
+from frappe.utils import now
+
+from .instrumentation import get_request_method, get_request_stats, is_app_method
+from .slowlog import get_rotating_logger
+from .utils import percentile
+
+# Recording is off unless `custom_app_record_traffic` is set in site config;
+# `custom_app_traffic_sample_rate` records only a share of the calls
+TRAFFIC_LOG_FILE = "custom_app_traffic.jsonl"
+TRAFFIC_LOG_MAX_BYTES = 50 * 1024 * 1024
+TRAFFIC_LOG_BACKUPS = 5
+
+# Largest request body kept per record, larger bodies are dropped
+MAX_BODY_BYTES = 64 * 1024
+
+# Roles a replayed call is authenticated as, most privileged first. Recorded
+# calls keep the first role the user has instead of the user itself.
+RECORDED_ROLES = ("Administrator", "System Manager", "Task Manager", "HR Manager", "HR User", "Task User")
+
+# Keys whose values identify a person. Emails and names are replaced with
+# stable pseudonyms so replayed writes stay valid, the rest is dropped.
+PSEUDONYMIZED_KEYS = {"email", "email_id", "applicant_name", "owner", "user", "usr"}
+REDACTED_KEYS = {"password", "pwd", "new_password", "api_key", "api_secret", "token", "sid",
+                 "phone", "phone_no", "mobile_no", "resume_link", "resume_attachment"}
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_PATTERN = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+
+REDACTED = "<redacted>"
+
+
+def get_log_path():
+    return os.path.abspath(frappe.get_site_path("logs", TRAFFIC_LOG_FILE))
+
+
+def is_recording_enabled():
+    return bool(frappe.conf.get("custom_app_record_traffic"))
+
+
+def _pseudonym(value):
+    """A stable stand-in for a personal value, keyed by the site's encryption key"""
+    secret = frappe.conf.get("encryption_key") or frappe.local.site
+    return hashlib.sha256(f"{secret}:{value}".encode()).hexdigest()[:12]
+
+
+def scrub(value, key=None):
+    """
+    Remove personal data from a recorded value
+
+    Emails and names are replaced with pseudonyms, secrets and contact
+    details are redacted, and emails or phone numbers inside free text are
+    masked.
+    """
+    if isinstance(value, dict):
+        return {k: scrub(v, k) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [scrub(v, key) for v in value]
+
+    normalized_key = (key or "").lower()
+    if normalized_key in REDACTED_KEYS:
+        return REDACTED if value else value
+    if isinstance(value, str):
+        if normalized_key in PSEUDONYMIZED_KEYS and value:
+            if "@" in value:
+                return f"user-{_pseudonym(value)}@example.com"
+            return f"Person {_pseudonym(value)}"
+        value = EMAIL_PATTERN.sub(lambda match: f"user-{_pseudonym(match.group())}@example.com", value)
+        return PHONE_PATTERN.sub(REDACTED, value)
+
+    return value
+
+
+def _get_role(user):
+    roles = set(frappe.get_roles(user))
+    for role in RECORDED_ROLES:
+        if role in roles:
+            return role
+    return "Guest" if user == "Guest" else "User"
+
+
+def _get_body(request):
+    """
+    Return the body of a request and its format, form or json
+
+    Form posts are parsed into request.form before this runs, which leaves
+    get_data() empty, so the form is read first.
+    """
+    if (request.content_length or 0) > MAX_BODY_BYTES:
+        return None, None
+    if request.form:
+        return {key: value for key, value in request.form.items()}, "form"
+
+    data = request.get_data(cache=True)
+    if not data:
+        return None, None
+    try:
+        return json.loads(data), "json"
+    except ValueError:
+        return None, None
+
+
+def record_traffic(response=None, request=None):
+    """
+    Append calls to app endpoints to the traffic log, called at the end of
+    each request when recording is enabled in site config
+    """
+    if not is_recording_enabled():
+        return
+
+    request = request or frappe.request
+    method = get_request_method(request)
+    if not request or not is_app_method(method):
+        return
+
+    sample_rate = frappe.conf.get("custom_app_traffic_sample_rate")
+    if sample_rate is not None and random.random() >= sample_rate:
+        return
+
+    try:
+        stats = get_request_stats()
+        body, body_format = _get_body(request) if request.method not in ("GET", "HEAD") else (None, None)
+        record = {
+            "timestamp": now(),
+            "time": time.time(),
+            "http_method": request.method,
+            "path": request.path,
+            "endpoint": method,
+            "params": scrub(request.args.to_dict()),
+            "body": scrub(body),
+            "body_format": body_format,
+            "status": response.status_code if response is not None else None,
+            "latency_ms": round(stats.wall_time * 1000, 3) if stats else None,
+            "role": _get_role(frappe.session.user)
+        }
+        get_rotating_logger("traffic", get_log_path(), TRAFFIC_LOG_MAX_BYTES, TRAFFIC_LOG_BACKUPS).info(
+            json.dumps(record, default=str)
+        )
+    except Exception:
+        # Recording must never break the request it observes
+        pass
+
+
+def load_traffic(path, limit=None):
+    """Read recorded calls in the order they were made"""
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    records.sort(key=lambda record: record.get("time") or 0)
+    return records[:limit] if limit else records
+
+
+def _send(session, base_url, record, headers):
+    url = base_url.rstrip("/") + record["path"]
+    body = record.get("body")
+    # Form posts are replayed as forms, everything else as JSON
+    is_form = record.get("body_format") == "form"
+    start = time.perf_counter()
+    try:
+        response = session.request(
+            record["http_method"],
+            url,
+            params=record.get("params") or None,
+            data=body if is_form else None,
+            json=body if body is not None and not is_form else None,
+            headers=headers,
+            timeout=60
+        )
+        status = response.status_code
+    except requests.RequestException:
+        status = None
+    return status, time.perf_counter() - start
+
+
+def replay_traffic(records, base_url, concurrency=8, speedup=1.0, auth=None):
+    """
+    Replay recorded calls against a site, keeping their relative timing
+
+    Calls are sent at their recorded offsets divided by the speed-up factor,
+    by at most `concurrency` calls in flight; when all workers are busy
+    calls start late, which is reported as lag.
+
+    Args:
+        records (list): Recorded calls, oldest first
+        base_url (str): Site to drive, e.g. http://localhost:8000
+        concurrency (int): Number of concurrent workers
+        speedup (float): Replay this many times faster than recorded; 0 sends
+            every call as soon as a worker is free
+        auth (dict, optional): role -> Authorization header value, the
+            "default" entry is used for roles without their own
+
+    Returns:
+        dict: overall and per endpoint throughput, latency percentiles,
+            status counts and scheduling lag
+    """
+    auth = auth or {}
+    local = threading.local()
+    results = []
+    lock = threading.Lock()
+
+    def session():
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    origin = (records[0].get("time") or 0) if records else 0
+    started = time.perf_counter()
+
+    def worker(record):
+        offset = ((record.get("time") or origin) - origin) / speedup if speedup else 0
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        lag = max(0.0, time.perf_counter() - started - offset)
+
+        token = auth.get(record.get("role")) or auth.get("default")
+        headers = {"Authorization": token} if token else {}
+        status, latency = _send(session(), base_url, record, headers)
+        with lock:
+            results.append((record.get("endpoint"), status, latency, lag))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for record in records:
+            executor.submit(worker, record)
+
+    duration = time.perf_counter() - started
+    return _summarize(results, duration)
+
+
+def _latency_summary(latencies):
+    latencies = [latency * 1000 for latency in latencies]
+    return {
+        "p50_ms": round(percentile(latencies, 0.5), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "max_ms": round(max(latencies), 3) if latencies else 0
+    }
+
+
+def _summarize(results, duration):
+    by_endpoint = defaultdict(list)
+    for endpoint, status, latency, lag in results:
+        by_endpoint[endpoint].append((status, latency))
+
+    def errors(rows):
+        return sum(1 for status, _ in rows if status is None or status >= 500)
+
+    return {
+        "requests": len(results),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(results) / duration, 3) if duration else 0,
+        "errors": errors([(status, latency) for _, status, latency, _ in results]),
+        "status": dict(Counter(str(status) for _, status, _, _ in results)),
+        "latency": _latency_summary([latency for _, _, latency, _ in results]),
+        "max_lag_ms": round(max((lag for *_, lag in results), default=0) * 1000, 3),
+        "endpoints": {
+            endpoint: dict(
+                requests=len(rows),
+                errors=errors(rows),
+                **_latency_summary([latency for _, latency in rows])
+            )
+            for endpoint, rows in sorted(by_endpoint.items(), key=lambda item: str(item[0]))
+        }
+    }
@@ -0,0 +1,10 @@
+import math
+
+
+def percentile(values, fraction):
+    """Nearest rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    rank = min(len(ordered), max(1, math.ceil(fraction * len(ordered))))
+    return ordered[rank - 1]
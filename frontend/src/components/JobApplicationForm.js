@@ -102,10 +102,20 @@ const JobApplicationForm = () => {
         apiData.name = id;
       }
       
-      const response = isEditMode
+      let response = isEditMode
         ? await updateJobApplication(apiData)
         : await createJobApplication(apiData);
-      
+
+      // The email is already used by another application
+      if (response.duplicate) {
+        if (!window.confirm(`${response.message}. Create this application anyway?`)) {
+          setSuccess('');
+          setError(response.message);
+          return;
+        }
+        response = await createJobApplication({ ...apiData, allow_duplicate: 1 });
+      }
+
       if (response.success) {
         setError(''); // Clear any previous errors
         setSuccess(
@@ -62,6 +62,13 @@ api.interceptors.response.use(
   }
 );
 
+// Fields the list views read. The list endpoints return a lean default
+// projection without descriptions, so ask for them explicitly
+const TASK_LIST_FIELDS = ['name', 'title', 'status', 'priority', 'start_date', 'end_date', 'project', 'description'];
+const PROJECT_LIST_FIELDS = [
+  'name', 'title', 'status', 'priority', 'start_date', 'end_date', 'task_count', 'progress', 'description'
+];
+
 // Helper function to check if server is available or if we should use demo mode
 const checkServerAndFallback = async (apiCall, fallbackData, pageType = '') => {
   try {
@@ -650,7 +657,7 @@ export const getTasks = async (status = null, project = null) => {
 
   // Api call function
   const apiCall = async () => {
-    const params = {};
+    const params = { fields: TASK_LIST_FIELDS.join(',') };
     if (status) params.status = status;
     if (project) params.project = project;
     
@@ -874,9 +881,9 @@ export const getProjects = async (status = null) => {
   // Api call function using fetch instead of axios to better handle CORS
   const apiCall = async () => {
     try {
-      let url = 'http://localhost:8000/api/method/custom_app.routes.projects';
+      let url = `http://localhost:8000/api/method/custom_app.routes.projects?fields=${PROJECT_LIST_FIELDS.join(',')}`;
       if (status) {
-        url += `?status=${encodeURIComponent(status)}`;
+        url += `&status=${encodeURIComponent(status)}`;
       }
       
       const response = await fetch(url, {
@@ -1305,6 +1312,16 @@ export const getJobApplications = async (status = null) => {
   return checkServerAndFallback(apiCall, fallbackData, 'jobApplications');
 };
 
+// A Job Application refused because its email is already used (HTTP 409)
+const getDuplicateResult = async (response) => {
+  const data = await response.json();
+  const serverMessages = JSON.parse(data._server_messages || '[]');
+  const message = serverMessages.length
+    ? JSON.parse(serverMessages[0]).message
+    : 'An application with this email already exists';
+  return { success: false, duplicate: true, message };
+};
+
 export const createJobApplication = async (applicationData) => {
   try {
     // First try our custom endpoint
@@ -1320,6 +1337,11 @@ export const createJobApplication = async (applicationData) => {
       mode: 'cors'
     });
     
+    // The email is already used, the standard API would refuse it as well
+    if (response.status === 409) {
+      return getDuplicateResult(response);
+    }
+    
     // If custom endpoint fails, try Frappe's standard API
     if (!response.ok) {
       // Convert our data format to Frappe's format
@@ -1346,11 +1368,18 @@ export const createJobApplication = async (applicationData) => {
         credentials: 'include',
         mode: 'cors'
       });
+      
+      if (response.status === 409) {
+        return getDuplicateResult(response);
+      }
     }
 
     if (response.ok) {
       const data = await response.json();
       console.log("Create Response:", data);
+      if (data.message && data.message.error) {
+        return { success: false, message: data.message.error };
+      }
       return { success: true, data: data.message || data.data };
     }
     